@@ -0,0 +1,26 @@
+"""08 added partial index on active task runs per task
+
+Revision ID: 5c1d7e2a9b40
+Revises: 09558449b3cc
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1d7e2a9b40'
+down_revision = '09558449b3cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_task_run_task_id_active', 'task_run', ['task_id'], unique=False,
+                    postgresql_where=sa.text("status IN ('WAITING', 'QUEUED', 'EXECUTION', 'INTERRUPTED', 'TEMP_ERROR')"))
+
+
+def downgrade():
+    op.drop_index('ix_task_run_task_id_active', table_name='task_run',
+                  postgresql_where=sa.text("status IN ('WAITING', 'QUEUED', 'EXECUTION', 'INTERRUPTED', 'TEMP_ERROR')"))
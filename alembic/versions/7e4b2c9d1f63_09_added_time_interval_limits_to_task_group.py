@@ -0,0 +1,26 @@
+"""09 added time interval min period and max runs per tick to task group
+
+Revision ID: 7e4b2c9d1f63
+Revises: 5c1d7e2a9b40
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4b2c9d1f63'
+down_revision = '5c1d7e2a9b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_group', sa.Column('time_interval_min_period', sa.FLOAT(), nullable=True))
+    op.add_column('task_group', sa.Column('time_interval_max_runs_per_tick', sa.INTEGER(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_group', 'time_interval_max_runs_per_tick')
+    op.drop_column('task_group', 'time_interval_min_period')
@@ -0,0 +1,24 @@
+"""10 added is_retro to task run
+
+Revision ID: 9a3f6d8e2b17
+Revises: 7e4b2c9d1f63
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3f6d8e2b17'
+down_revision = '7e4b2c9d1f63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_run', sa.Column('is_retro', sa.Boolean(), server_default='false', nullable=False))
+
+
+def downgrade():
+    op.drop_column('task_run', 'is_retro')
@@ -0,0 +1,24 @@
+"""16 added command envelope size
+
+Revision ID: a2c4e6f8b0d1
+Revises: f1b3d5e7a9c2
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2c4e6f8b0d1'
+down_revision = 'f1b3d5e7a9c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_group', sa.Column('command_envelope_size', sa.INTEGER(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_group', 'command_envelope_size')
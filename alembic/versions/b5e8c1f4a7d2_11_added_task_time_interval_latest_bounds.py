@@ -0,0 +1,39 @@
+"""11 added task time interval latest bounds
+
+Revision ID: b5e8c1f4a7d2
+Revises: 9a3f6d8e2b17
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e8c1f4a7d2'
+down_revision = '9a3f6d8e2b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_time_interval_latest_bounds',
+    sa.Column('task_id', sa.BIGINT(), nullable=False),
+    sa.Column('task_run_id', sa.BIGINT(), nullable=False),
+    sa.Column('right_bound_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('left_bound_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('loaded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], name=op.f('fk_task_time_interval_latest_bounds_task_id_task')),
+    sa.PrimaryKeyConstraint('task_id', name=op.f('pk_task_time_interval_latest_bounds'))
+    )
+    op.execute("""
+        INSERT INTO task_time_interval_latest_bounds (task_id, task_run_id, right_bound_at, left_bound_at)
+        SELECT DISTINCT ON (task_id) task_id, task_run_id, right_bound_at, left_bound_at
+        FROM task_run_time_interval_execution_bounds
+        WHERE right_bound_at IS NOT NULL
+        ORDER BY task_id, right_bound_at DESC
+    """)
+
+
+def downgrade():
+    op.drop_table('task_time_interval_latest_bounds')
@@ -0,0 +1,24 @@
+"""17 added last reported at to task run
+
+Revision ID: b7d9f1a3c5e2
+Revises: a2c4e6f8b0d1
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d9f1a3c5e2'
+down_revision = 'a2c4e6f8b0d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_run', sa.Column('last_reported_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_run', 'last_reported_at')
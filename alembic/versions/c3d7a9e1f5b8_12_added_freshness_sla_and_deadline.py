@@ -0,0 +1,26 @@
+"""12 added freshness sla and deadline
+
+Revision ID: c3d7a9e1f5b8
+Revises: b5e8c1f4a7d2
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d7a9e1f5b8'
+down_revision = 'b5e8c1f4a7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_group', sa.Column('time_interval_freshness_sla', sa.FLOAT(), nullable=True))
+    op.add_column('task_run', sa.Column('deadline_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_run', 'deadline_at')
+    op.drop_column('task_group', 'time_interval_freshness_sla')
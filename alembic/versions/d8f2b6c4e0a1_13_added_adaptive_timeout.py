@@ -0,0 +1,28 @@
+"""13 added adaptive timeout
+
+Revision ID: d8f2b6c4e0a1
+Revises: c3d7a9e1f5b8
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f2b6c4e0a1'
+down_revision = 'c3d7a9e1f5b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('periodic_monitoring_algorithm', sa.Column('adaptive_timeout_min', sa.FLOAT(), nullable=True))
+    op.add_column('periodic_monitoring_algorithm', sa.Column('adaptive_timeout_max', sa.FLOAT(), nullable=True))
+    op.add_column('task', sa.Column('adaptive_timeout', sa.FLOAT(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task', 'adaptive_timeout')
+    op.drop_column('periodic_monitoring_algorithm', 'adaptive_timeout_max')
+    op.drop_column('periodic_monitoring_algorithm', 'adaptive_timeout_min')
@@ -0,0 +1,26 @@
+"""14 added paused task status
+
+Revision ID: e4a9c7d3b2f6
+Revises: d8f2b6c4e0a1
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c7d3b2f6'
+down_revision = 'd8f2b6c4e0a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TYPE taskstatus ADD VALUE IF NOT EXISTS 'PAUSED'")
+
+
+def downgrade():
+    # Postgres не умеет удалять значения из перечисления: возвращаем приостановленные задачи в отмененные
+    op.execute("UPDATE task SET status = 'CANCELLED' WHERE status = 'PAUSED'")
+    op.execute("UPDATE task_status_log SET status = 'CANCELLED' WHERE status = 'PAUSED'")
@@ -0,0 +1,26 @@
+"""15 added execution lease
+
+Revision ID: f1b3d5e7a9c2
+Revises: e4a9c7d3b2f6
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b3d5e7a9c2'
+down_revision = 'e4a9c7d3b2f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_group', sa.Column('execution_lease_s', sa.FLOAT(), nullable=True))
+    op.add_column('task_run', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_run', 'lease_expires_at')
+    op.drop_column('task_group', 'execution_lease_s')
@@ -0,0 +1,69 @@
+"""
+Микробенчмарк кодеков сообщений брокера.
+
+Для одиночной команды и пакета команд, полных и сокращенных (SlimCommand), сравнивает размер тела
+и время кодирования и декодирования кодеками JSON, быстрым JSON и msgpack, без сжатия и со сжатием
+zstd и lz4. Кодеки и компрессоры, библиотеки которых не установлены, пропускаются. Запуск:
+
+    python -m benchmarks.message_codec
+"""
+import timeit
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from benchmarks.command_envelope import make_commands
+from service.domain.schemas.command import CommandEnvelope, SlimCommand
+from service.ports.common.codec import MessageEncoder, MessageDecoder, CODEC_BY_NAME, COMPRESSOR_BY_NAME, \
+    Codec, Compressor
+
+ENVELOPE_SIZE = 50
+REPEATS = 200
+
+
+def available_codecs() -> List[Tuple[str, Codec]]:
+    codecs = []
+    for name, codec_class in CODEC_BY_NAME.items():
+        try:
+            codecs.append((name, codec_class()))
+        except ImportError:
+            print(f"skip codec {name}: not installed")
+    return codecs
+
+
+def available_compressors() -> List[Tuple[str, Optional[Compressor]]]:
+    compressors = [('-', None)]
+    for name, compressor_class in COMPRESSOR_BY_NAME.items():
+        try:
+            compressors.append((name, compressor_class()))
+        except ImportError:
+            print(f"skip compression {name}: not installed")
+    return compressors
+
+
+def main():
+    commands = make_commands(ENVELOPE_SIZE)
+    slim_commands = [SlimCommand.from_task_run(command.task_run) for command in commands]
+    messages: List[Tuple[str, BaseModel]] = [('command', commands[0]),
+                                             ('slim', slim_commands[0]),
+                                             (f'envelope {ENVELOPE_SIZE}', CommandEnvelope(commands=commands)),
+                                             (f'slim env {ENVELOPE_SIZE}', CommandEnvelope(commands=slim_commands))]
+    codecs, compressors = available_codecs(), available_compressors()
+    print(f"{'message':>12} {'codec':>10} {'compress':>9} {'bytes':>8} {'encode, us':>11} {'decode, us':>11}")
+    for message_name, message in messages:
+        for codec_name, codec in codecs:
+            for compressor_name, compressor in compressors:
+                encoder = MessageEncoder(codec, compressor, compression_threshold_bytes=0)
+                decoder = MessageDecoder([codec], [compressor] if compressor else [])
+                encoded = encoder.encode(message)
+                encode_s = timeit.timeit(lambda: encoder.encode(message), number=REPEATS)
+                decode_s = timeit.timeit(lambda: decoder.decode(encoded.body,
+                                                                encoded.content_type,
+                                                                encoded.content_encoding),
+                                         number=REPEATS)
+                print(f"{message_name:>12} {codec_name:>10} {compressor_name:>9} {len(encoded.body):>8} "
+                      f"{encode_s / REPEATS * 1e6:>11.1f} {decode_s / REPEATS * 1e6:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Бенчмарк локального журнала статусов FileSpool.
+
+Для разного числа одновременных записей и задержки группового fsync измеряет, сколько статусов
+в секунду журнал сохраняет на диск. Каталог журнала создается во временной директории. Запуск:
+
+    python -m benchmarks.status_spool
+"""
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from service.adapters.outbound.spool import FileSpool
+from service.domain.schemas.command import CommandResponse
+from service.domain.schemas.enums import TaskRunStatus
+
+CONCURRENCY = (1, 100, 1000)
+FSYNC_DELAYS_S = (0, 0.005)
+RECORDS_COUNT = 5_000
+
+
+async def measure(concurrency: int, fsync_delay_s: float) -> float:
+    record = CommandResponse(task_run_id=1, status=TaskRunStatus.SUCCEED,
+                             created_at=datetime.now(timezone.utc)).model_dump_json().encode('utf-8')
+    with tempfile.TemporaryDirectory() as directory:
+        spool = FileSpool(directory, fsync_delay_s=fsync_delay_s)
+        await spool.start()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def append():
+            async with semaphore:
+                await spool.append(record)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(append() for _ in range(RECORDS_COUNT)))
+        elapsed_s = time.perf_counter() - started_at
+        await spool.stop()
+    return RECORDS_COUNT / elapsed_s
+
+
+def main():
+    print(f"{'concurrency':>12} {'fsync delay, ms':>16} {'records/s':>12}")
+    for concurrency in CONCURRENCY:
+        for fsync_delay_s in FSYNC_DELAYS_S:
+            records_per_s = asyncio.run(measure(concurrency, fsync_delay_s))
+            print(f"{concurrency:>12} {fsync_delay_s * 1000:>16.1f} {records_per_s:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
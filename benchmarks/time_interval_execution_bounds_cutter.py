@@ -0,0 +1,66 @@
+"""
+Асимптотический бенчмарк TimeIntervalExecutionBoundsCutter.
+
+Сравнивает бинарный поиск в cut с эталонным линейным проходом по интервалам
+при росте истории прогресса задачи. Отдельно измеряется построение резчика: оно линейно-логарифмическое
+по истории и выполняется на каждый вызов ActualTimeIntervalExecutionBoundsProvider.provide, поэтому
+на большой истории стоимость задачи определяет построение, а не cut. Запуск:
+
+    python -m benchmarks.time_interval_execution_bounds_cutter
+"""
+import timeit
+from datetime import datetime, timezone, timedelta
+from typing import List
+
+from service.domain.schemas.execution_bounds import TimeIntervalBounds
+from service.domain.schemas.task_progress import TimeIntervalTaskProgress
+from service.domain.services.task_progress_provider import TimeIntervalExecutionBoundsCutter, TimeInterval
+
+HISTORY_SIZES = (100, 1_000, 10_000, 100_000)
+CUTS_PER_MEASURE = 1_000
+
+
+def make_progresses(history_size: int) -> List[TimeIntervalTaskProgress]:
+    """ История сбора с минутной гранулярностью и разрывами, чтобы интервалы не объединялись """
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [TimeIntervalTaskProgress(task_id=1,
+                                     left_bound_at=start + timedelta(minutes=2 * i),
+                                     right_bound_at=start + timedelta(minutes=2 * i + 1),
+                                     collected_data_amount=1,
+                                     saved_data_amount=1)
+            for i in range(history_size)]
+
+
+def linear_cut(intervals: List[TimeInterval], execution_bounds: TimeIntervalBounds) -> TimeIntervalBounds:
+    for interval in intervals:
+        if interval.has_interval(execution_bounds.left_bound_at, execution_bounds.right_bound_at):
+            execution_bounds.left_bound_at = execution_bounds.right_bound_at
+            return execution_bounds
+        if interval.is_interval_lower(execution_bounds.left_bound_at, execution_bounds.right_bound_at):
+            continue
+        execution_bounds.right_bound_at = interval.left_bound_at
+        return execution_bounds
+    return execution_bounds
+
+
+def main():
+    print(f"{'history':>10} {'build, ms':>12} {'bisect cut, us':>16} {'linear cut, us':>16}")
+    for history_size in HISTORY_SIZES:
+        progresses = make_progresses(history_size)
+        build_s = timeit.timeit(lambda: TimeIntervalExecutionBoundsCutter(list(progresses)), number=1)
+        cutter = TimeIntervalExecutionBoundsCutter(progresses)
+        # Худший случай для линейного прохода: границы в самом начале истории
+        first = min(progresses, key=lambda progress: progress.left_bound_at)
+
+        def make_bounds():
+            return TimeIntervalBounds(left_bound_at=first.left_bound_at - timedelta(minutes=10),
+                                      right_bound_at=first.left_bound_at + timedelta(seconds=30))
+
+        bisect_s = timeit.timeit(lambda: cutter.cut(make_bounds()), number=CUTS_PER_MEASURE)
+        linear_s = timeit.timeit(lambda: linear_cut(cutter.intervals, make_bounds()), number=CUTS_PER_MEASURE)
+        print(f"{history_size:>10} {build_s * 1e3:>12.2f} "
+              f"{bisect_s / CUTS_PER_MEASURE * 1e6:>16.2f} {linear_s / CUTS_PER_MEASURE * 1e6:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,12 @@
 import asyncio
-from typing import Callable, Awaitable, Dict, Any
+from typing import Callable, Awaitable, Dict, Any, Optional
 
 from aio_pika import connect_robust
 from aio_pika.abc import AbstractConnection, AbstractChannel, AbstractIncomingMessage, AbstractQueue, AbstractExchange
 
 from service.adapters.inbound.consumer.settings import RMQConsumerConnectionSettings, RMQConsumerSettings
+from service.ports.common.codec import MessageDecoder
+from service.ports.common.exceptions import PoisonMessageError
 from service.ports.common.input_converter import InputConverterI
 from service.ports.common.interfaces import Startable
 from service.ports.common.logs import logger
@@ -51,9 +53,23 @@ class AioPikaRMQConsumerConnection(Startable):
 
 
 class AioPikaRMQConsumer(Startable):
-    def __init__(self, connection: AioPikaRMQConsumerConnection, prefetch_count: int):
+    """
+    Потребитель очередей RabbitMQ.
+
+    Без message_decoder тело сообщения передается конвертеру строкой UTF-8; с message_decoder —
+    объектом, декодированным по свойствам сообщения content_type и content_encoding.
+
+    По умолчанию сообщение подтверждается до обработки. С ack_after_processing подтверждение
+    отправляется после успешной обработки, а при ошибке сообщение возвращается в очередь;
+    каждое сообщение обрабатывается в своей задаче, поэтому число ожидающих подтверждения
+    ограничено prefetch_count.
+    """
+
+    def __init__(self, connection: AioPikaRMQConsumerConnection, prefetch_count: int,
+                 message_decoder: Optional[MessageDecoder] = None):
         self._connection = connection
         self._prefetch_count = prefetch_count
+        self._message_decoder = message_decoder
 
         self._exchanges: Dict[tuple[str, str], AbstractExchange] = {}
         self._queues: Dict[str, AbstractQueue] = {}
@@ -61,8 +77,9 @@ class AioPikaRMQConsumer(Startable):
         self._channel: AbstractChannel = None
 
     @classmethod
-    def from_settings(cls, settings: RMQConsumerSettings, connection: AioPikaRMQConsumerConnection):
-        return cls(connection=connection, prefetch_count=settings.prefetch_count)
+    def from_settings(cls, settings: RMQConsumerSettings, connection: AioPikaRMQConsumerConnection,
+                      message_decoder: Optional[MessageDecoder] = None):
+        return cls(connection=connection, prefetch_count=settings.prefetch_count, message_decoder=message_decoder)
 
     async def start(self):
         self._channel = await self._connection.connection.channel()
@@ -75,13 +92,21 @@ class AioPikaRMQConsumer(Startable):
         await self._channel.close()
         logger.info(f'RabbitMQ consumer {self._connection.uri.safe_info} stopped')
 
+    def _convert(self, message: AbstractIncomingMessage, message_converter: InputConverterI) -> Any:
+        if self._message_decoder:
+            message_decoded = self._message_decoder.decode(message.body,
+                                                           message.content_type,
+                                                           message.content_encoding)
+        else:
+            message_decoded = message.body.decode('utf-8')
+        return message_converter.convert(message_decoded)
+
     def _processing_callback_bridge(self, processing_callback: Callable[[dict], Awaitable],
                                     message_converter: InputConverterI):
 
         async def inner(message: AbstractIncomingMessage):
             async with message.process():
-                message_str = message.body.decode('utf-8')
-                message_converted = message_converter.convert(message_str)
+                message_converted = self._convert(message, message_converter)
             logger.debug(f'{self} got message')
             try:
                 await processing_callback(message_converted)
@@ -93,15 +118,45 @@ class AioPikaRMQConsumer(Startable):
 
         return inner
 
+    def _acking_after_processing_callback_bridge(self, processing_callback: Callable[[dict], Awaitable],
+                                                 message_converter: InputConverterI):
+
+        async def inner(message: AbstractIncomingMessage):
+            try:
+                message_converted = self._convert(message, message_converter)
+            except BaseException as e:
+                # Сообщение, которое не удается разобрать, не будет разобрано и при повторной доставке
+                logger.error(f'{self} failed to convert message: {e.__class__.__name__}: {e}')
+                await message.reject(requeue=False)
+                return
+            try:
+                await processing_callback(message_converted)
+            except PoisonMessageError as e:
+                # Без возврата в очередь: брокер передаст сообщение в dead-letter exchange очереди, если он задан
+                logger.error(f'{self} rejected poison message: {e}')
+                await message.reject(requeue=False)
+            except BaseException as e:
+                logger.error(f'{self} failed to process message, returned to queue: {e.__class__.__name__}: {e}')
+                await message.nack(requeue=True)
+            else:
+                await message.ack()
+
+        return inner
+
     def is_queue_consumed(self, queue_name) -> bool:
         return queue_name in self._queues
 
     async def consume_queue(self,
                             queue_name: str,
                             processing_callback: Callable[[Any], Awaitable],
-                            message_converter: InputConverterI, **queue_kwargs):
+                            message_converter: InputConverterI,
+                            ack_after_processing: bool = False, **queue_kwargs):
         queue = await self._channel.declare_queue(queue_name, **queue_kwargs)
-        consumer_tag = await queue.consume(self._processing_callback_bridge(processing_callback, message_converter))
+        if ack_after_processing:
+            callback = self._acking_after_processing_callback_bridge(processing_callback, message_converter)
+        else:
+            callback = self._processing_callback_bridge(processing_callback, message_converter)
+        consumer_tag = await queue.consume(callback)
         self._queues[queue_name] = queue
         self._consumer_tag_by_queue_name[queue_name] = consumer_tag
 
@@ -143,17 +198,20 @@ class RMQQueueConsumer(Startable):
                  queue_name: str,
                  processing_callback: Callable[[Any], Awaitable],
                  message_converter: InputConverterI,
+                 ack_after_processing: bool = False,
                  **queue_kwargs):
         self.consumer = consumer
         self.queue_name = queue_name
         self.processing_callback = processing_callback
         self.message_converter = message_converter
+        self.ack_after_processing = ack_after_processing
         self.queue_kwargs = queue_kwargs
 
     async def start(self):
         await self.consumer.consume_queue(self.queue_name,
                                           self.processing_callback,
                                           self.message_converter,
+                                          self.ack_after_processing,
                                           **self.queue_kwargs)
 
     async def stop(self):
@@ -162,6 +162,27 @@ async def dashboard(request: Request):
         'INTERRUPTED': '#f97316', 'CANCELLED': '#94a3b8',
     }
 
+    CIRCUIT_BREAKER_COLORS = {'CLOSED': '#16a34a', 'HALF_OPEN': '#f59e0b', 'OPEN': '#dc2626'}
+    # Предохранитель живет в процессе, отправляющем запуски на выполнение
+    circuit_breaker = getattr(request.app.state, 'circuit_breaker', None)
+    circuit_breaker_states = [
+        {"group_name": group_name, "state": group_state.state.value,
+         "color": CIRCUIT_BREAKER_COLORS[group_state.state.value],
+         "failure_rate": round(group_state.failure_rate * 100, 1),
+         "changed_at": group_state.changed_at}
+        for group_name, group_state in sorted(circuit_breaker.state_by_group.items())
+    ] if circuit_breaker else []
+    payload_provider = getattr(request.app.state, 'payload_provider', None)
+    payload_cache_metrics = payload_provider.metrics if payload_provider else None
+    # Накопитель статусов живет в процессе, принимающем статусы от исполнителей
+    receive_status_uc = getattr(request.app.state, 'receive_task_run_execution_status_uc', None)
+    status_intake_metrics = receive_status_uc.metrics if receive_status_uc else None
+    deadline_metrics_provider = getattr(request.app.state, 'task_run_deadline_metrics_provider', None)
+    deadline_metrics = sorted(
+        (await deadline_metrics_provider.provide_deadline_metrics_by_period(86400)
+         ).grouped_deadline_metrics_by_name.values(),
+        key=lambda m: m.group_name) if deadline_metrics_provider else []
+
     # Матрица тепловой карты 7×24 (пн=0)
     matrix = [[0]*24 for _ in range(7)]
     for item in heatmap:
@@ -182,6 +203,10 @@ async def dashboard(request: Request):
                              "value": t.completed_count} for t in trends],
         "trend_duration":  [{"label": t.period.strftime("%H:%M"),
                              "value": int(t.avg_duration_seconds or 0)} for t in trends],
+        "circuit_breaker_states": circuit_breaker_states,
+        "payload_cache_metrics": payload_cache_metrics,
+        "status_intake_metrics": status_intake_metrics,
+        "deadline_metrics": deadline_metrics,
     })
 
 
@@ -6,7 +6,7 @@ from pydantic import BaseModel
 
 from service.di import get_use_case_facade
 from service.domain.schemas.enums import PriorityType, TaskType, SimplifiedMonitoringPeriod, TaskStatus
-from service.domain.schemas.task import TaskConfiguration
+from service.domain.schemas.task import TaskConfiguration, TasksFilter
 from service.domain.use_cases.external.cancel_tasks import CancelTasksUCRq
 from service.domain.use_cases.external.create_payload import CreatePayloadUCRq
 from service.domain.use_cases.external.create_tasks import CreateTasksUCRq
@@ -16,6 +16,7 @@ from service.domain.use_cases.external.get_task_detailed import GetTaskDetailedU
 from service.domain.use_cases.external.get_tasks_detailed import GetTasksDetailedUCRq
 from service.domain.use_cases.external.monitoring_algorithm import FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUCRq
 from service.domain.use_cases.external.resume_tasks import ResumeTasksUCRq
+from service.domain.use_cases.external.tasks_by_filter import TasksByFilterUCRq
 from service.domain.use_cases.external.update_payload import UpdatePayloadUCRq
 from service.ports.outbound.repo.fields import PaginationQuery, FilterFieldsDNF, ConditionOperation
 
@@ -197,6 +198,60 @@ async def get_task(
     return rs.task_detailed
 
 
+@router.post(
+    "/tasks/cancel",
+    summary="Отменить мониторинг задач по фильтру",
+    description=(
+        "Переводит в статус CANCELLED все задачи, подходящие под фильтр, одним запросом. "
+        "Незавершенные запуски этих задач также отменяются. Возвращает количество затронутых задач и запусков."
+    ),
+)
+async def cancel_tasks_by_filter(
+    body: TasksFilter,
+):
+    facade = get_use_case_facade()
+    rs = await facade.cancel_tasks_by_filter(TasksByFilterUCRq(tasks_filter=body))
+    if not rs.success:
+        raise HTTPException(status_code=400, detail=rs.error or "Failed to cancel tasks")
+    return rs
+
+
+@router.post(
+    "/tasks/pause",
+    summary="Приостановить мониторинг задач по фильтру",
+    description=(
+        "Переводит в статус PAUSED все задачи, подходящие под фильтр, одним запросом. "
+        "Еще не отправленные запуски отменяются, отправленные выполняются до конца."
+    ),
+)
+async def pause_tasks_by_filter(
+    body: TasksFilter,
+):
+    facade = get_use_case_facade()
+    rs = await facade.pause_tasks_by_filter(TasksByFilterUCRq(tasks_filter=body))
+    if not rs.success:
+        raise HTTPException(status_code=400, detail=rs.error or "Failed to pause tasks")
+    return rs
+
+
+@router.post(
+    "/tasks/resume",
+    summary="Возобновить мониторинг задач по фильтру",
+    description=(
+        "Возобновляет отмененные и приостановленные задачи, подходящие под фильтр, одним запросом. "
+        "Их отмененные запуски снова ожидают отправки."
+    ),
+)
+async def resume_tasks_by_filter(
+    body: TasksFilter,
+):
+    facade = get_use_case_facade()
+    rs = await facade.resume_tasks_by_filter(TasksByFilterUCRq(tasks_filter=body))
+    if not rs.success:
+        raise HTTPException(status_code=400, detail=rs.error or "Failed to resume tasks")
+    return rs
+
+
 @router.post(
     "/tasks/{task_id}/cancel",
     summary="Отменить мониторинг",
@@ -1,5 +1,6 @@
 import asyncio
-from typing import Type, Optional, Dict
+from contextlib import asynccontextmanager
+from typing import Type, Optional, Dict, List, AsyncIterator
 
 import aio_pika
 from aio_pika import connect_robust, Message
@@ -8,7 +9,7 @@ from pydantic import BaseModel
 
 from service.adapters.outbound.producer.annotations import ExchangeType
 from service.adapters.outbound.producer.settings import RMQProducerConnectionSettings, RMQProducerSettings
-from service.ports.common.convert_utils import to_bytes
+from service.ports.common.codec import MessageEncoder, JSONCodec
 from service.ports.common.interfaces import Startable
 from service.ports.common.logs import logger
 from service.ports.outbound.dto import RabbitMQURI
@@ -55,6 +56,13 @@ class AioPikaRMQProducerConnection(Startable):
 
 
 class AioPikaRMQProducer(DataProducerI, Startable):
+    """
+    Отправляет сообщения в обменник RabbitMQ через канал в режиме подтверждений (publisher confirms).
+
+    produce_many публикует пачку конкурентно, держа в ожидании подтверждения не более max_in_flight
+    сообщений; повторно отправляются только сообщения, не получившие подтверждения.
+    Тела кодируются message_encoder, формат передается свойствами content_type и content_encoding.
+    """
 
     def __init__(self,
                  connection: AioPikaRMQProducerConnection,
@@ -63,7 +71,9 @@ class AioPikaRMQProducer(DataProducerI, Startable):
                  exchange_params: Optional[Dict],
                  routing_key: str,
                  max_retries: int,
-                 retry_timeout: float, ):
+                 retry_timeout: float,
+                 max_in_flight: int = 256,
+                 message_encoder: Optional[MessageEncoder] = None, ):
         self._connection = connection
         self._exchange_name = exchange_name
         self._exchange_type = exchange_type
@@ -71,6 +81,8 @@ class AioPikaRMQProducer(DataProducerI, Startable):
         self._routing_key = routing_key
         self._max_retries = max_retries
         self._retry_timeout = retry_timeout
+        self._max_in_flight = max_in_flight
+        self._message_encoder = message_encoder or MessageEncoder(JSONCodec())
 
         self._channel: AbstractChannel = None
         self._exchange: AbstractExchange = None
@@ -90,10 +102,14 @@ class AioPikaRMQProducer(DataProducerI, Startable):
                    exchange_params=settings.exchange_params,
                    routing_key=settings.routing_key,
                    max_retries=settings.max_retries,
-                   retry_timeout=settings.retry_timeout)
+                   retry_timeout=settings.retry_timeout,
+                   max_in_flight=settings.max_in_flight,
+                   message_encoder=MessageEncoder.from_names(settings.codec,
+                                                             settings.compression,
+                                                             settings.compression_threshold_bytes))
 
     async def start(self):
-        self._channel = await self._connection.connection.channel()
+        self._channel = await self._connection.connection.channel(publisher_confirms=True)
         if not self._exchange_name:
             self._exchange = self._channel.default_exchange
         else:
@@ -109,9 +125,8 @@ class AioPikaRMQProducer(DataProducerI, Startable):
 
     async def produce(self, item: bytes | dict | str | Type[BaseModel], to: str, headers: dict = None,
                       item_params: dict = None) -> bool:
-        prepared_body = to_bytes(item)
         expiration = item_params.get('expiration') if item_params else None
-        message = Message(body=prepared_body, headers=headers, expiration=expiration)
+        message = self._make_message(item, headers, expiration)
         routing_key = to if to else self._routing_key
         exception = None
         for retry in range(self._max_retries):
@@ -127,37 +142,117 @@ class AioPikaRMQProducer(DataProducerI, Startable):
         logger.error(f'failed to produce message after {self._max_retries} retries: {exception}')
         return False
 
+    async def produce_many(self, items: List[bytes | dict | str | Type[BaseModel]], to: List[Optional[str]],
+                           headers: dict = None, item_params: dict = None) -> List[bool]:
+        expiration = item_params.get('expiration') if item_params else None
+        messages = [self._make_message(item, headers, expiration) for item in items]
+        routing_keys = [item_to if item_to else self._routing_key for item_to in to]
+        is_produced = [False] * len(messages)
+        in_flight = asyncio.Semaphore(self._max_in_flight)
+
+        pending_indexes = list(range(len(messages)))
+        exception = None
+        for retry in range(self._max_retries):
+            results = await asyncio.gather(*(self._publish_confirmed(messages[index], routing_keys[index], in_flight)
+                                             for index in pending_indexes),
+                                           return_exceptions=True)
+            failed_indexes = []
+            for index, result in zip(pending_indexes, results):
+                if isinstance(result, BaseException):
+                    failed_indexes.append(index)
+                    exception = result
+                else:
+                    is_produced[index] = True
+            pending_indexes = failed_indexes
+            if not pending_indexes:
+                break
+            logger.warning(f"[{retry:2}|{self._max_retries}] failed to produce {len(pending_indexes)} of "
+                           f"{len(messages)} message(s): {exception}; retry after: {self._retry_timeout} s")
+            if retry + 1 < self._max_retries:
+                await asyncio.sleep(self._retry_timeout)
+        if pending_indexes:
+            logger.error(f'failed to produce {len(pending_indexes)} message(s) after {self._max_retries} retries:'
+                         f' {exception}')
+        return is_produced
+
+    def _make_message(self, item: bytes | dict | str | BaseModel, headers: Optional[dict],
+                      expiration: Optional[float]) -> Message:
+        encoded = self._message_encoder.encode(item)
+        return Message(body=encoded.body, headers=headers, expiration=expiration,
+                       content_type=encoded.content_type, content_encoding=encoded.content_encoding)
+
+    async def _publish_confirmed(self, message: Message, routing_key: str, in_flight: asyncio.Semaphore):
+        # В режиме подтверждений publish завершается после ack брокера, а при nack или возврате бросает исключение
+        async with in_flight:
+            return await self._exchange.publish(message, routing_key=routing_key)
+
+
+class AioPikaRMQChannelPool(Startable):
+    """
+    Пул переиспользуемых каналов соединения с RabbitMQ.
+
+    Канал, закрытый брокером (например, после ошибки объявления очереди), в пул не возвращается.
+    """
+
+    def __init__(self, connection: AioPikaRMQProducerConnection, max_size: int = 8):
+        self._connection = connection
+        self._max_size = max_size
+        self._idle_channels: List[AbstractChannel] = []
+        self._semaphore = asyncio.Semaphore(max_size)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AbstractChannel]:
+        async with self._semaphore:
+            channel = None
+            while self._idle_channels and channel is None:
+                idle_channel = self._idle_channels.pop()
+                if not idle_channel.is_closed:
+                    channel = idle_channel
+            if channel is None:
+                channel = await self._connection.connection.channel()
+            try:
+                yield channel
+            finally:
+                if not channel.is_closed:
+                    self._idle_channels.append(channel)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        idle_channels = self._idle_channels
+        self._idle_channels = []
+        for channel in idle_channels:
+            if not channel.is_closed:
+                await channel.close()
+
 
 class AioPikaRMQQueueBoundToExchangeCreator(QueueCreator):
 
     def __init__(self,
                  producer: AioPikaRMQProducer,
-                 connection: AioPikaRMQProducerConnection):
+                 channel_pool: AioPikaRMQChannelPool):
         self._producer = producer
-        self._connection = connection
+        self._channel_pool = channel_pool
 
         self._existing_queues = set()
 
     async def is_queue_exists(self, name: str) -> bool:
         if name in self._existing_queues:
             return True
-        channel = await self._connection.connection.channel()
-        try:
-            await channel.declare_queue(name, durable=True)
-            self._existing_queues.add(name)
-            return True
-        except aio_pika.exceptions.ChannelClosed as e:
-            return False
-        finally:
-            await channel.close()
+        async with self._channel_pool.acquire() as channel:
+            try:
+                await channel.declare_queue(name, durable=True)
+                self._existing_queues.add(name)
+                return True
+            except aio_pika.exceptions.ChannelClosed as e:
+                return False
 
     async def create_queue(self, name: str) -> bool:
-        channel = await self._connection.connection.channel()
-        try:
-            queue = await channel.declare_queue(name, )
-            await queue.bind(self._producer.exchange, name)
-            return True
-        except BaseException:
-            return False
-        finally:
-            await channel.close()
+        async with self._channel_pool.acquire() as channel:
+            try:
+                queue = await channel.declare_queue(name, )
+                await queue.bind(self._producer.exchange, name)
+                return True
+            except BaseException:
+                return False
@@ -1,4 +1,4 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, Literal
 
 from pydantic_settings import BaseSettings
 
@@ -20,6 +20,7 @@ class KafkaProducerSettings(BaseSettings):
 class RMQProducerConnectionSettings(BaseSettings):
     uri: str
     retry_timeout: float = 5
+    channel_pool_size: int = 8
 
 
 class RMQProducerSettings(BaseSettings):
@@ -29,3 +30,7 @@ class RMQProducerSettings(BaseSettings):
     routing_key: Optional[str] = None
     max_retries: int = 3
     retry_timeout: float = 2
+    max_in_flight: int = 256  # Максимум сообщений пачки, ожидающих подтверждения брокера одновременно
+    codec: Literal['json', 'fast_json', 'msgpack'] = 'json'
+    compression: Optional[Literal['zstd', 'lz4']] = None
+    compression_threshold_bytes: int = 4096  # Тела меньше порога не сжимаются
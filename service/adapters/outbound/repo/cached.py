@@ -0,0 +1,156 @@
+import copy
+from typing import List, Dict, Optional, Set, Any, Awaitable, Callable, Hashable, Iterable, TypeVar
+
+from cachetools import TTLCache
+
+from service.ports.common.logs import logger
+from service.ports.outbound.cache import CacheInvalidator, ReferenceCacheName, Cache
+from service.ports.outbound.repo.abstract import Repo, TDomain, TModel, TPK
+from service.ports.outbound.repo.fields import PaginationQuery, FilterFieldsDNF, UpdateFields
+from service.ports.outbound.repo.transaction import Transaction
+
+_MISSING = object()
+
+TCache = TypeVar('TCache', bound=Cache)
+
+
+class CachedRepo(Repo[TDomain, TModel, TPK], Cache):
+    """
+    Кэш справочных данных поверх репозитория.
+
+    Кэшируются результаты чтений вне транзакций. Каждая запись через репозиторий и каждый
+    сброс увеличивают версию кэша: результат чтения, начатого до смены версии, в кэш не попадает,
+    поэтому конкурентное чтение не может вернуть в кэш данные, устаревшие на момент сброса.
+    TTL — страховка на случай потерянного сигнала о сбросе из другого процесса.
+    """
+
+    def __init__(self,
+                 repo: Repo[TDomain, TModel, TPK],
+                 ttl_s: float = 300,
+                 maxsize: int = 1024, ):
+        self._repo = repo
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl_s)
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def invalidate(self):
+        self._version += 1
+        self._cache.clear()
+
+    def to_model(self, obj: TDomain) -> TModel:
+        return self._repo.to_model(obj)
+
+    def to_domain(self, obj: TModel) -> TDomain:
+        return self._repo.to_domain(obj)
+
+    async def create(self, obj: TDomain, transaction: Optional[Transaction] = None) -> Optional[TDomain]:
+        return await self._write(self._repo.create(obj, transaction))
+
+    async def create_all(self, objs: List[TDomain] | Set[TDomain],
+                         transaction: Optional[Transaction] = None) -> List[TDomain]:
+        return await self._write(self._repo.create_all(objs, transaction))
+
+    async def update(self, obj_pk: TPK, fields: UpdateFields,
+                     transaction: Optional[Transaction] = None) -> Optional[TDomain]:
+        return await self._write(self._repo.update(obj_pk, fields, transaction))
+
+    async def update_all(self, fields_by_obj_pk: Dict[TPK, UpdateFields],
+                         transaction: Optional[Transaction] = None) -> None:
+        return await self._write(self._repo.update_all(fields_by_obj_pk, transaction))
+
+    async def delete_by_condition(self, filter_fields_dnf: FilterFieldsDNF,
+                                  transaction: Optional[Transaction] = None):
+        return await self._write(self._repo.delete_by_condition(filter_fields_dnf, transaction))
+
+    async def delete(self, obj_pk: TPK, transaction: Optional[Transaction] = None) -> Optional[TDomain]:
+        return await self._write(self._repo.delete(obj_pk, transaction))
+
+    async def get(self, obj_pk: TPK, transaction: Optional[Transaction] = None) -> Optional[TDomain]:
+        return await self._read(('get', self._key(obj_pk)), lambda: self._repo.get(obj_pk, transaction),
+                                transaction)
+
+    async def get_all(self, transaction: Optional[Transaction] = None) -> List[TDomain]:
+        return await self._read(('get_all',), lambda: self._repo.get_all(transaction), transaction)
+
+    async def paginated(self, pagination_query: PaginationQuery,
+                        transaction: Optional[Transaction] = None) -> List[TDomain]:
+        return await self._read(('paginated', self._key(pagination_query)),
+                                lambda: self._repo.paginated(pagination_query, transaction), transaction)
+
+    async def filter(self, filter_fields_dnf: FilterFieldsDNF,
+                     transaction: Optional[Transaction] = None) -> List[TDomain]:
+        return await self._read(('filter', self._key(filter_fields_dnf)),
+                                lambda: self._repo.filter(filter_fields_dnf, transaction), transaction)
+
+    async def count_by_fields(self, filter_fields_dnf: FilterFieldsDNF,
+                              transaction: Optional[Transaction] = None) -> int:
+        return await self._read(('count_by_fields', self._key(filter_fields_dnf)),
+                                lambda: self._repo.count_by_fields(filter_fields_dnf, transaction), transaction)
+
+    async def _write(self, write: Awaitable[Any]) -> Any:
+        try:
+            return await write
+        finally:
+            # Запись в транзакции еще не видна другим сессиям: повторный сброс после коммита
+            # выполняет use case через CacheInvalidator
+            self.invalidate()
+
+    async def _read(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                    transaction: Optional[Transaction]) -> Any:
+        if transaction is not None:
+            return await fetch()
+        result = self._cache.get(key, _MISSING)
+        if result is not _MISSING:
+            self._hits += 1
+            return copy.deepcopy(result)
+        self._misses += 1
+        version = self._version
+        result = await fetch()
+        if version == self._version:
+            self._cache[key] = result
+        return copy.deepcopy(result)
+
+    @staticmethod
+    def _key(obj: Any) -> Hashable:
+        if hasattr(obj, 'model_dump_json'):
+            return obj.model_dump_json()
+        return repr(obj)
+
+
+class LocalCacheInvalidator(CacheInvalidator):
+    """Сбрасывает кэши справочных данных текущего процесса"""
+
+    def __init__(self, caches_by_name: Dict[ReferenceCacheName, Iterable[Cache]] = None):
+        self._caches_by_name: Dict[ReferenceCacheName, List[Cache]] = {
+            name: list(caches) for name, caches in (caches_by_name or {}).items()
+        }
+
+    def register(self, cache_name: ReferenceCacheName, cache: TCache) -> TCache:
+        self._caches_by_name.setdefault(cache_name, []).append(cache)
+        return cache
+
+    async def invalidate(self, cache_name: ReferenceCacheName):
+        self.invalidate_local(cache_name)
+
+    def invalidate_local(self, cache_name: ReferenceCacheName):
+        caches = self._caches_by_name.get(cache_name, [])
+        for cache in caches:
+            cache.invalidate()
+        logger.debug(f"invalidated {len(caches)} caches of {cache_name.value}")
+
+    def invalidate_all(self):
+        for cache_name in self._caches_by_name:
+            self.invalidate_local(cache_name)
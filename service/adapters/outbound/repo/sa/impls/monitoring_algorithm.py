@@ -1,12 +1,14 @@
 import random
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Type
 
-from sqlalchemy import select, text, DateTime, func
+from sqlalchemy import select, DateTime, func, Numeric, Float, case, exists, text
 from sqlalchemy.sql.operators import eq, lt, and_
 
 from service.adapters.outbound.repo.sa import models
 from service.adapters.outbound.repo.sa.abstract import AbstractSARepo
+from service.adapters.outbound.repo.sa.database import Database
+from service.adapters.outbound.repo.sa.base import Base
 from service.adapters.outbound.repo.sa.impls.task_mapper import TaskMapper
 from service.domain.schemas.enums import MonitoringAlgorithmType, TaskStatus
 from service.domain.schemas.monitoring_algorithm import MonitoringAlgorithmPK, MonitoringAlgorithm, \
@@ -16,6 +18,22 @@ from service.ports.outbound.repo.monitoring_algorithm import MonitoringAlgorithm
 
 MAX_DATETIME = datetime.max.replace(tzinfo=timezone.utc)
 
+# Мультипликативный хеш Кнута: равномерно и детерминированно распределяет идентификаторы задач по [0, 1)
+JITTER_HASH_MULTIPLIER = 2654435761
+JITTER_HASH_MODULUS = 2 ** 32
+
+
+def calculate_periodic_jitter_s(task_id: int, timeout_noize: float) -> float:
+    """ Детерминированное смещение времени запуска задачи в пределах ±timeout_noize """
+    fraction = (task_id * JITTER_HASH_MULTIPLIER % JITTER_HASH_MODULUS) / JITTER_HASH_MODULUS
+    return (2 * fraction - 1) * timeout_noize
+
+
+def has_no_active_task_run():
+    """ Условие отсутствия у задачи незавершенного запуска (использует частичный индекс ix_task_run_task_id_active) """
+    return ~exists().where(models.TaskRun.task_id == models.Task.id,
+                           text(f"task_run.status IN ({models.ACTIVE_TASK_RUN_STATUSES_SQL})"))
+
 
 class SAMonitoringAlgorithmRepo(AbstractSARepo):
     def to_model(self, obj: MonitoringAlgorithm) -> models.MonitoringAlgorithm:
@@ -32,24 +50,44 @@ class SAPeriodicMonitoringAlgorithmRepo(AbstractSARepo, MonitoringAlgorithmRepo)
     def to_model(self, obj: PeriodicMonitoringAlgorithm) -> models.PeriodicMonitoringAlgorithm:
         return models.PeriodicMonitoringAlgorithm(id=obj.id,
                                                   timeout=obj.timeout,
-                                                  timeout_noize=obj.timeout_noize)
+                                                  timeout_noize=obj.timeout_noize,
+                                                  adaptive_timeout_min=obj.adaptive_timeout_min,
+                                                  adaptive_timeout_max=obj.adaptive_timeout_max, )
 
     def to_domain(self, obj: models.PeriodicMonitoringAlgorithm) -> PeriodicMonitoringAlgorithm:
         return PeriodicMonitoringAlgorithm(id=obj.id,
                                            type=MonitoringAlgorithmType.PERIODIC,
                                            timeout=obj.timeout,
-                                           timeout_noize=obj.timeout_noize)
+                                           timeout_noize=obj.timeout_noize,
+                                           adaptive_timeout_min=obj.adaptive_timeout_min,
+                                           adaptive_timeout_max=obj.adaptive_timeout_max, )
 
     def pk_to_model_pk(self, pk: MonitoringAlgorithmPK) -> Dict:
         return {'id': pk.id}
 
+    def __init__(self, database: Database, model_class: Type[Base], chunk_size: int = 5000,
+                 max_tasks_per_tick: Optional[int] = None, ):
+        """
+        :param max_tasks_per_tick: режим сглаживания — если задано, за один вызов возвращается не более
+        указанного числа задач в порядке наступления времени запуска, остальные переносятся на следующие вызовы
+        """
+        super().__init__(database, model_class, chunk_size)
+        self._max_tasks_per_tick = max_tasks_per_tick
+
     async def provide_tasks_to_execute(self) -> List[Task]:
         async with self._database.session as session:
             current_datetime = datetime.now(timezone.utc)
-            ready_to_execute_by_timeout = lt(func.cast(text("task.status_updated_at + "
-                                                            " (interval '1' second * periodic_monitoring_algorithm.timeout)"),
-                                                       DateTime(timezone=True)),
-                                             current_datetime)
+            jitter_fraction = func.mod(func.cast(models.Task.id, Numeric) * JITTER_HASH_MULTIPLIER,
+                                       JITTER_HASH_MODULUS) / JITTER_HASH_MODULUS
+            jitter_s = func.cast((jitter_fraction * 2 - 1), Float) * self._model_class.timeout_noize
+            # Период, подобранный адаптивным режимом, заменяет период алгоритма, только пока алгоритм адаптивный
+            timeout = case((self._model_class.adaptive_timeout_min.is_not(None),
+                            func.coalesce(models.Task.adaptive_timeout, self._model_class.timeout)),
+                           else_=self._model_class.timeout)
+            execute_at = func.cast(models.Task.status_updated_at
+                                   + func.make_interval(0, 0, 0, 0, 0, 0, timeout + jitter_s),
+                                   DateTime(timezone=True))
+            ready_to_execute_by_timeout = lt(execute_at, current_datetime)
             query = (
                 select(models.Task)
                 .join(self._model_class,
@@ -64,8 +102,14 @@ class SAPeriodicMonitoringAlgorithmRepo(AbstractSARepo, MonitoringAlgorithmRepo)
                              ready_to_execute_by_timeout) |
                         and_(models.Task.status == TaskStatus.SUCCEED,
                              ready_to_execute_by_timeout)
-                ), models.TaskGroup.is_active))
+                ), models.TaskGroup.is_active), has_no_active_task_run())
             )
+            if self._max_tasks_per_tick:
+                query = (query
+                         .order_by(case((models.Task.status == TaskStatus.NEW, models.Task.status_updated_at),
+                                        else_=execute_at),
+                                   models.Task.id)
+                         .limit(self._max_tasks_per_tick))
             result = await session.scalars(query, )
             tasks = result.all()
             return [TaskMapper.to_domain(task) for task in tasks]
@@ -108,7 +152,7 @@ class SASingleMonitoringAlgorithmRepo(AbstractSARepo, MonitoringAlgorithmRepo):
                     self._model_class,
                     onclause=eq(models.Task.monitoring_algorithm_id, self._model_class.id),
                 )
-                .where(models.TaskGroup.is_active)
+                .where(models.TaskGroup.is_active, has_no_active_task_run())
             )
             result = await session.execute(query)
             rows = result.all()
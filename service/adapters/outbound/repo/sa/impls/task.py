@@ -1,4 +1,6 @@
-from typing import Dict
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Any
 
 from sqlalchemy import text
 
@@ -6,9 +8,11 @@ from service.adapters.outbound.repo.sa import models
 from service.adapters.outbound.repo.sa.abstract import AbstractSARepo
 from service.adapters.outbound.repo.sa.database import Database
 from service.adapters.outbound.repo.sa.impls.task_mapper import TaskMapper
-from service.domain.schemas.task import TaskPK, Task
+from service.adapters.outbound.repo.sa.transaction import SATransaction
+from service.domain.schemas.enums import TaskStatus, TaskRunStatus
+from service.domain.schemas.task import TaskPK, Task, TasksFilter
 from service.ports.outbound.repo.task import TaskProvider, TasksToTransitStatus, TaskStatisticsProvider, \
-    TaskGroupsStatistics
+    TaskGroupsStatistics, TaskStatusBulkUpdater, TasksStatusBulkUpdate
 
 
 class SATaskRepo(AbstractSARepo):
@@ -101,3 +105,94 @@ class SATaskStatisticsProvider(TaskStatisticsProvider):
                 total_tasks_count=total_tasks_count,
                 tasks_count_by_group_name=tasks_count_by_group_name,
             )
+
+
+class SATaskStatusBulkUpdater(TaskStatusBulkUpdater):
+    """
+    Массовая смена статусов задач без загрузки строк в приложение: UPDATE задач, вставка в историю их статусов
+    и UPDATE их запусков выполняются одним запросом через изменяющие данные CTE
+    """
+
+    def __init__(self, database: Database, ):
+        self._database = database
+
+    async def update_by_filter(self,
+                               tasks_filter: TasksFilter,
+                               from_statuses: List[TaskStatus],
+                               to_status: TaskStatus,
+                               task_run_from_statuses: List[TaskRunStatus],
+                               task_run_to_status: TaskRunStatus,
+                               status_updated_at: datetime,
+                               transaction: Optional[SATransaction] = None, ) -> TasksStatusBulkUpdate:
+        if tasks_filter.statuses is not None:
+            from_statuses = [status for status in from_statuses if status in tasks_filter.statuses]
+        if not from_statuses:
+            return TasksStatusBulkUpdate()
+
+        predicates, query_kwargs = self._build_predicates(tasks_filter)
+        query = text(f"""
+            WITH updated_task AS (
+                UPDATE task t
+                SET status = CAST(:to_status AS taskstatus), status_updated_at = :status_updated_at
+                WHERE t.status::text = ANY(:from_statuses) {''.join(f' AND {p}' for p in predicates)}
+                RETURNING t.id
+            ), task_status_log_insert AS (
+                INSERT INTO task_status_log (task_id, status_updated_at, status)
+                SELECT id, :status_updated_at, CAST(:to_status AS taskstatus) FROM updated_task
+            ), updated_task_run AS (
+                UPDATE task_run tr
+                SET status = CAST(:task_run_to_status AS taskrunstatus), status_updated_at = :status_updated_at
+                FROM updated_task, task_run previous_tr
+                WHERE tr.task_id = updated_task.id AND tr.status::text = ANY(:task_run_from_statuses)
+                    AND previous_tr.id = tr.id
+                RETURNING tr.id, tr.group_name, previous_tr.status::text AS previous_status
+            )
+            SELECT (SELECT COUNT(*) FROM updated_task) AS tasks_count, utr.id, utr.group_name, utr.previous_status
+            FROM (SELECT 1) AS one
+            LEFT JOIN updated_task_run utr ON TRUE
+        """)
+        query_kwargs.update({
+            "from_statuses": [status.value for status in from_statuses],
+            "to_status": to_status.value,
+            "task_run_from_statuses": [status.value for status in task_run_from_statuses],
+            "task_run_to_status": task_run_to_status.value,
+            "status_updated_at": status_updated_at,
+        })
+        if transaction:
+            result = await transaction.session.execute(query, query_kwargs)
+            rows = result.fetchall()
+        else:
+            async with self._database.session as session:
+                result = await session.execute(query, query_kwargs)
+                rows = result.fetchall()
+                await session.commit()
+
+        task_runs_rows = [row for row in rows if row.id is not None]
+        return TasksStatusBulkUpdate(tasks_count=rows[0].tasks_count,
+                                     task_runs_ids=[row.id for row in task_runs_rows],
+                                     task_runs_group_names=[row.group_name for row in task_runs_rows],
+                                     task_runs_previous_statuses=[TaskRunStatus(row.previous_status)
+                                                                  for row in task_runs_rows], )
+
+    @staticmethod
+    def _build_predicates(tasks_filter: TasksFilter) -> tuple[List[str], Dict[str, Any]]:
+        predicates = []
+        query_kwargs = {}
+        if tasks_filter.tasks_ids is not None:
+            predicates.append("t.id = ANY(:tasks_ids)")
+            query_kwargs["tasks_ids"] = tasks_filter.tasks_ids
+        if tasks_filter.group_ids is not None:
+            predicates.append("t.group_id = ANY(:group_ids)")
+            query_kwargs["group_ids"] = tasks_filter.group_ids
+        if tasks_filter.project_ids is not None:
+            predicates.append("t.group_id IN (SELECT group_id FROM task_group_by_project "
+                              "WHERE project_id = ANY(:project_ids))")
+            query_kwargs["project_ids"] = tasks_filter.project_ids
+        if tasks_filter.payload_contains is not None:
+            # JSONWithDatetime сохраняет data строкой JSON внутри JSON, поэтому строка разворачивается
+            predicates.append("EXISTS (SELECT 1 FROM payload p WHERE p.id = t.payload_id "
+                              "AND (CASE WHEN jsonb_typeof(p.data::jsonb) = 'string' "
+                              "THEN (p.data::jsonb #>> '{}')::jsonb ELSE p.data::jsonb END) "
+                              "@> CAST(:payload_contains AS jsonb))")
+            query_kwargs["payload_contains"] = json.dumps(tasks_filter.payload_contains, default=str)
+        return predicates, query_kwargs
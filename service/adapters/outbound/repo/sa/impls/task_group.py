@@ -16,7 +16,12 @@ class SATaskGroupRepo(AbstractSARepo):
                                 execution_arguments=obj.execution_arguments,
                                 time_interval_max_period=obj.time_interval_max_period,
                                 time_interval_first_left_bound_at=obj.time_interval_first_left_bound_at,
-                                time_interval_first_left_bound_depth=obj.time_interval_first_left_bound_depth, )
+                                time_interval_first_left_bound_depth=obj.time_interval_first_left_bound_depth,
+                                time_interval_min_period=obj.time_interval_min_period,
+                                time_interval_max_runs_per_tick=obj.time_interval_max_runs_per_tick,
+                                time_interval_freshness_sla=obj.time_interval_freshness_sla,
+                                execution_lease_s=obj.execution_lease_s,
+                                command_envelope_size=obj.command_envelope_size, )
 
     def to_domain(self, obj: models.TaskGroup) -> TaskGroup:
         return TaskGroup(id=obj.id,
@@ -28,7 +33,12 @@ class SATaskGroupRepo(AbstractSARepo):
                          execution_arguments=obj.execution_arguments,
                          time_interval_max_period=obj.time_interval_max_period,
                          time_interval_first_left_bound_at=obj.time_interval_first_left_bound_at,
-                         time_interval_first_left_bound_depth=obj.time_interval_first_left_bound_depth, )
+                         time_interval_first_left_bound_depth=obj.time_interval_first_left_bound_depth,
+                         time_interval_min_period=obj.time_interval_min_period,
+                         time_interval_max_runs_per_tick=obj.time_interval_max_runs_per_tick,
+                         time_interval_freshness_sla=obj.time_interval_freshness_sla,
+                         execution_lease_s=obj.execution_lease_s,
+                         command_envelope_size=obj.command_envelope_size, )
 
     def pk_to_model_pk(self, pk: TaskGroupPK) -> Dict:
         return {"id": pk.id}
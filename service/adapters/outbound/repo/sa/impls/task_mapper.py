@@ -16,7 +16,8 @@ class TaskMapper:
                            status=obj.status,
                            status_updated_at=obj.status_updated_at,
                            payload_id=obj.payload_id,
-                           loaded_at=obj.loaded_at, )
+                           loaded_at=obj.loaded_at,
+                           adaptive_timeout=obj.adaptive_timeout, )
 
     @staticmethod
     def to_domain(obj: models.Task) -> Task:
@@ -29,4 +30,5 @@ class TaskMapper:
                     status=obj.status,
                     status_updated_at=obj.status_updated_at,
                     payload_id=obj.payload_id,
-                    loaded_at=obj.loaded_at, )
+                    loaded_at=obj.loaded_at,
+                    adaptive_timeout=obj.adaptive_timeout, )
@@ -2,19 +2,23 @@ import json
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Union
 
-from sqlalchemy import text, select, union_all, RowMapping
+from sqlalchemy import text, select, union_all, RowMapping, case, false, update, bindparam, and_, or_, func
 
 from service.adapters.outbound.repo.sa import models
 from service.adapters.outbound.repo.sa.abstract import AbstractSARepo
 from service.adapters.outbound.repo.sa.database import Database
+from service.adapters.outbound.repo.sa.transaction import SATransaction
 from service.domain.schemas.enums import TaskRunStatus
 from service.domain.schemas.execution_bounds import as_execution_bounds
 from service.domain.schemas.payload import Payload
 from service.domain.schemas.task_run import TaskRun, TaskRunPK
 from service.domain.schemas.task_run_metrics import TaskRunMetrics, TaskRunGroupedMetrics, TaskRunAvgMetrics, \
-    TaskRunGroupedAvgMetrics, TasksRunsStatusMetrics, StatusMetrics
+    TaskRunGroupedAvgMetrics, TasksRunsStatusMetrics, StatusMetrics, TaskRunDeadlineMetrics, \
+    TaskRunGroupedDeadlineMetrics
 from service.ports.outbound.repo.abstract import Repo
-from service.ports.outbound.repo.task_run import WaitingTaskRunProvider, TaskRunMetricsProvider, RecentTaskRunsProvider
+from service.ports.outbound.repo.fields import UpdateFields
+from service.ports.outbound.repo.task_run import WaitingTaskRunProvider, TaskRunMetricsProvider, \
+    RecentTaskRunsProvider, TaskRunDeadlineMetricsProvider, TaskRunRepo
 
 
 class TaskRunMapper:
@@ -30,6 +34,10 @@ class TaskRunMapper:
                               payload=payload,
                               execution_bounds=execution_bounds,
                               execution_arguments=obj.execution_arguments,
+                              is_retro=obj.is_retro,
+                              deadline_at=obj.deadline_at,
+                              lease_expires_at=obj.lease_expires_at,
+                              last_reported_at=obj.last_reported_at,
                               status=obj.status,
                               status_updated_at=obj.status_updated_at,
                               description=obj.description)
@@ -65,12 +73,16 @@ class TaskRunMapper:
                        payload=payload,
                        execution_bounds=execution_bounds,
                        execution_arguments=execution_arguments,
+                       is_retro=obj.is_retro,
+                       deadline_at=obj.deadline_at,
+                       lease_expires_at=obj.lease_expires_at,
+                       last_reported_at=obj.last_reported_at,
                        status=obj.status,
                        status_updated_at=obj.status_updated_at,
                        description=obj.description,
                        )
 
-class SATaskRunRepo(AbstractSARepo):
+class SATaskRunRepo(AbstractSARepo, TaskRunRepo):
     def to_model(self, obj: TaskRun) -> models.TaskRun:
         return TaskRunMapper.to_model(obj)
 
@@ -80,28 +92,97 @@ class SATaskRunRepo(AbstractSARepo):
     def pk_to_model_pk(self, pk: TaskRunPK) -> Dict:
         return {"id": pk.id}
 
+    async def update_execution_states(self,
+                                      fields_by_task_run_pk: Dict[TaskRunPK, UpdateFields],
+                                      transaction: Optional[SATransaction] = None) -> None:
+        if not fields_by_task_run_pk:
+            return
+        table = self._model_class.__table__
+        new_status_updated_at = bindparam('new_status_updated_at', type_=table.c.status_updated_at.type)
+        # Условие в самом UPDATE: ответы одного запуска из разных пачек (разных потребителей) коммитятся
+        # в произвольном порядке, и устаревший ответ не должен перезаписать более новый статус. Сравниваются
+        # только отметки исполнителя (last_reported_at): status_updated_at пишет и сервер (отправка, переходы
+        # статусов), а часы исполнителя могут отставать от часов сервера
+        is_newer = and_(new_status_updated_at.is_not(None),
+                        or_(table.c.last_reported_at.is_(None), table.c.last_reported_at <= new_status_updated_at))
+        query = (update(table)
+                 .where(table.c.id == bindparam('task_run_id'))
+                 .values(status=case((is_newer, bindparam('new_status', type_=table.c.status.type)),
+                                     else_=table.c.status),
+                         status_updated_at=case((is_newer, new_status_updated_at), else_=table.c.status_updated_at),
+                         last_reported_at=case((is_newer, new_status_updated_at), else_=table.c.last_reported_at),
+                         # GREATEST пропускает NULL: без новой аренды остается прежняя
+                         lease_expires_at=func.greatest(table.c.lease_expires_at,
+                                                        bindparam('new_lease_expires_at',
+                                                                  type_=table.c.lease_expires_at.type))))
+        query_payload = []
+        for task_run_pk, update_fields in fields_by_task_run_pk.items():
+            values = update_fields.to_dict()
+            query_payload.append({'task_run_id': task_run_pk.id,
+                                  'new_status': values.get('status'),
+                                  'new_status_updated_at': values.get('status_updated_at'),
+                                  'new_lease_expires_at': values.get('lease_expires_at'), })
+        if not transaction:
+            async with self._database.session as session:
+                await session.execute(query, query_payload)
+                await session.commit()
+        else:
+            await transaction.session.execute(query, query_payload)
+
 
 class SAWaitingTaskRunProvider(WaitingTaskRunProvider):
+    """
+    Выбирает ожидающие запуски групп в порядке отправки.
+
+    Запуски групп с SLA свежести (deadline_at задан) отправляются по возрастанию крайнего срока.
+    Запуски с уже истекшим крайним сроком пропускаются вперед тех, кто еще успевает уложиться:
+    иначе при отставании повторы устаревших интервалов вытесняли бы самые свежие данные.
+    Запуски без крайнего срока идут после успевающих и перед просроченными, между собой — в порядке
+    очереди (status_updated_at); в группах без SLA это обычный FIFO.
 
-    def __init__(self, database: Database, task_run_repo: Repo[TaskRun, TaskRun, TaskRunPK], ):
+    Чтобы просроченные запуски и запуски без срока не голодали при постоянном отставании (а активный
+    запуск не блокировал создание новых запусков задачи), запуск, ожидающий дольше max_wait_s,
+    поднимается в начало очереди; такие запуски отправляются от самого давнего.
+    """
+
+    def __init__(self, database: Database, task_run_repo: Repo[TaskRun, TaskRun, TaskRunPK],
+                 retro_share: float = 0.2,
+                 max_wait_s: Optional[float] = None, ):
+        """
+        :param retro_share: доля пакета группы, зарезервированная для ретро-запусков (is_retro).
+        Незанятая ретро-запусками часть пакета отдается запускам реального времени и наоборот
+        :param max_wait_s: сколько запуск может ожидать в статусе WAITING, прежде чем будет поднят
+        в начало очереди независимо от крайнего срока; None — без старения
+        """
         self._database = database
         self._task_run_repo = task_run_repo
+        self._retro_share = retro_share
+        self._max_wait_s = max_wait_s
 
     async def provide(self, amount_by_group_name: Dict[str, int]) -> List[TaskRun]:
         if not amount_by_group_name:
             return []
             # Строим подзапросы для каждой группы
         subqueries = []
+        now = datetime.now(timezone.utc)
+        is_starving = models.TaskRun.status_updated_at < now - timedelta(seconds=self._max_wait_s) \
+            if self._max_wait_s is not None else false()
 
         for group_name, amount in amount_by_group_name.items():
-            subquery = (
-                select(models.TaskRun)  # используем вашу ORM-модель
-                .where(models.TaskRun.group_name == group_name)
-                .where(models.TaskRun.status == 'WAITING')
-                .order_by(models.TaskRun.status_updated_at)
-                .limit(amount)
-            )
-            subqueries.append(subquery)
+            # Каждая полоса выбирается с запасом на весь пакет, итоговое распределение — в _split_batch
+            for is_retro in (False, True):
+                subquery = (
+                    select(models.TaskRun)  # используем вашу ORM-модель
+                    .where(models.TaskRun.group_name == group_name)
+                    .where(models.TaskRun.status == 'WAITING')
+                    .where(models.TaskRun.is_retro == is_retro)
+                    .order_by(case((is_starving, 0), (models.TaskRun.deadline_at < now, 2), else_=1),
+                              case((is_starving, models.TaskRun.status_updated_at)).asc().nulls_last(),
+                              models.TaskRun.deadline_at.asc().nulls_last(),
+                              models.TaskRun.status_updated_at)
+                    .limit(amount)
+                )
+                subqueries.append(subquery)
 
         # Объединяем все подзапросы
         query = union_all(*subqueries)
@@ -109,7 +190,26 @@ class SAWaitingTaskRunProvider(WaitingTaskRunProvider):
         async with self._database.session as session:
             result = await session.execute(query)
             rows = result.mappings().fetchall()
-            return [self._task_run_repo.to_domain(row) for row in rows]
+            task_runs = [self._task_run_repo.to_domain(row) for row in rows]
+
+        realtime_by_group_name: Dict[str, List[TaskRun]] = {group_name: [] for group_name in amount_by_group_name}
+        retro_by_group_name: Dict[str, List[TaskRun]] = {group_name: [] for group_name in amount_by_group_name}
+        for task_run in task_runs:
+            lane = retro_by_group_name if task_run.is_retro else realtime_by_group_name
+            lane[task_run.group_name].append(task_run)
+
+        provided_task_runs = []
+        for group_name, amount in amount_by_group_name.items():
+            provided_task_runs.extend(self._split_batch(amount,
+                                                        realtime_by_group_name[group_name],
+                                                        retro_by_group_name[group_name]))
+        return provided_task_runs
+
+    def _split_batch(self, amount: int, realtime: List[TaskRun], retro: List[TaskRun]) -> List[TaskRun]:
+        amount = int(amount)
+        retro_reserved = int(amount * self._retro_share)
+        retro_amount = min(len(retro), max(retro_reserved, amount - len(realtime)))
+        return realtime[:amount - retro_amount] + retro[:retro_amount]
 
 
 class SATaskRunMetricsProvider(TaskRunMetricsProvider):
@@ -335,6 +435,51 @@ class SATaskRunMetricsProvider(TaskRunMetricsProvider):
             return TaskRunAvgMetrics(grouped_avg_metrics_by_name=grouped_avg_metrics_by_name)
 
 
+class SATaskRunDeadlineMetricsProvider(TaskRunDeadlineMetricsProvider):
+
+    def __init__(self, database: Database, ):
+        self._database = database
+
+    async def provide_deadline_metrics_by_period(self, period_s: int,
+                                                 group_name: Optional[str] = None) -> TaskRunDeadlineMetrics:
+        now = datetime.now(timezone.utc)
+        group_name_predicate = "AND group_name = :group_name" if group_name else ""
+        query = text(f"""
+            SELECT
+                group_name,
+                COUNT(*) FILTER (WHERE status = 'SUCCEED' AND status_updated_at > :bound_datetime) AS succeed,
+                COUNT(*) FILTER (WHERE status = 'SUCCEED' AND status_updated_at > :bound_datetime
+                                   AND status_updated_at > deadline_at) AS missed,
+                AVG(EXTRACT(EPOCH FROM (status_updated_at - deadline_at)))
+                    FILTER (WHERE status = 'SUCCEED' AND status_updated_at > :bound_datetime
+                              AND status_updated_at > deadline_at) AS avg_lateness_s,
+                COUNT(*) FILTER (WHERE status = 'WAITING' AND deadline_at < :now) AS overdue_waiting
+            FROM task_run
+            WHERE deadline_at IS NOT NULL
+              AND (status = 'WAITING' OR status_updated_at > :bound_datetime)
+              {group_name_predicate}
+            GROUP BY group_name
+        """)
+        query_kwargs = {"bound_datetime": now - timedelta(seconds=period_s), "now": now}
+        if group_name:
+            query_kwargs["group_name"] = group_name
+
+        async with self._database.session as session:
+            result = await session.execute(query, query_kwargs)
+            rows = result.fetchall()
+
+        grouped_deadline_metrics_by_name = {
+            row[0]: TaskRunGroupedDeadlineMetrics(group_name=row[0],
+                                                  period_s=period_s,
+                                                  succeed=row[1],
+                                                  missed=row[2],
+                                                  avg_lateness_s=float(row[3]) if row[3] is not None else 0,
+                                                  overdue_waiting=row[4], )
+            for row in rows
+        }
+        return TaskRunDeadlineMetrics(grouped_deadline_metrics_by_name=grouped_deadline_metrics_by_name)
+
+
 class SARecentTaskRunsProvider(RecentTaskRunsProvider):
     """
     Нужен индекс
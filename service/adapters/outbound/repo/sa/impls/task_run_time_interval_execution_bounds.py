@@ -1,11 +1,14 @@
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from sqlalchemy import func, select, text
+from more_itertools import batched
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 
 from service.adapters.outbound.repo.sa import models
 from service.adapters.outbound.repo.sa.abstract import AbstractSARepo
 from service.adapters.outbound.repo.sa.database import Database
+from service.adapters.outbound.repo.sa.transaction import SATransaction
 from service.domain.schemas.execution_bounds import TimeIntervalBounds
 from service.domain.schemas.task_run import TaskRunTimeIntervalExecutionBounds, TaskRunTimeIntervalExecutionBoundsPK
 from service.ports.outbound.repo.task_run import LatestTaskRunTimeIntervalExecutionBoundsProvider
@@ -42,16 +45,69 @@ class SATaskRunTimeIntervalExecutionBoundsRepo(AbstractSARepo):
             "task_run_id": pk.task_run_id,
         }
 
+    async def create(self,
+                     obj: TaskRunTimeIntervalExecutionBounds,
+                     transaction: Optional[SATransaction] = None) -> Optional[TaskRunTimeIntervalExecutionBounds]:
+        created_domains = await self.create_all([obj], transaction)
+        if created_domains:
+            return created_domains[0]
+
+    async def create_all(self,
+                         objs: List[TaskRunTimeIntervalExecutionBounds],
+                         transaction: Optional[SATransaction] = None) -> List[TaskRunTimeIntervalExecutionBounds]:
+        """
+        Вставляет границы запусков и в том же SQL-выражении обновляет последние границы задач
+        в task_time_interval_latest_bounds
+        """
+        if not objs:
+            return []
+        if not transaction:
+            async with self._database.session as session:
+                created_domains = await self._create_all(objs, session)
+                await session.commit()
+        else:
+            created_domains = await self._create_all(objs, transaction.session)
+        return created_domains
+
+    async def _create_all(self, objs: List[TaskRunTimeIntervalExecutionBounds],
+                          session) -> List[TaskRunTimeIntervalExecutionBounds]:
+        created_domains = []
+        for obj_chunk in batched(objs, self._chunk_size):
+            values = [self.to_model(obj).to_dict() for obj in obj_chunk]
+            inserted = (insert(self._model_class)
+                        .values(values)
+                        .on_conflict_do_nothing()
+                        .returning(self._model_class)
+                        .cte('inserted'))
+            latest_inserted = (select(inserted.c.task_id, inserted.c.task_run_id,
+                                      inserted.c.right_bound_at, inserted.c.left_bound_at)
+                               .distinct(inserted.c.task_id)
+                               .order_by(inserted.c.task_id, inserted.c.right_bound_at.desc()))
+            latest_bounds_upsert = (insert(models.TaskTimeIntervalLatestBounds)
+                                    .from_select(['task_id', 'task_run_id', 'right_bound_at', 'left_bound_at'],
+                                                 latest_inserted))
+            latest_bounds_upsert = latest_bounds_upsert.on_conflict_do_update(
+                index_elements=[models.TaskTimeIntervalLatestBounds.task_id],
+                set_={
+                    'task_run_id': latest_bounds_upsert.excluded.task_run_id,
+                    'right_bound_at': latest_bounds_upsert.excluded.right_bound_at,
+                    'left_bound_at': latest_bounds_upsert.excluded.left_bound_at,
+                },
+                where=(models.TaskTimeIntervalLatestBounds.right_bound_at
+                       < latest_bounds_upsert.excluded.right_bound_at),
+            ).cte('latest_bounds_upserted')
+            query = select(inserted).add_cte(latest_bounds_upsert)
+            result = await session.execute(query)
+            created_domains.extend([self.to_domain(row) for row in result.mappings().all()])
+        return created_domains
+
     async def get_latest_right_bound_by_task_ids(self, task_ids: List[int]) -> Dict[int, datetime]:
         if not task_ids:
             return {}
         query = (
-            select(
-                self._model_class.task_id,
-                func.max(self._model_class.right_bound_at).label("right_bound_at"),
-            )
-            .where(self._model_class.task_id.in_(task_ids))
-            .group_by(self._model_class.task_id)
+            select(models.TaskTimeIntervalLatestBounds.task_id,
+                   models.TaskTimeIntervalLatestBounds.right_bound_at)
+            .where(models.TaskTimeIntervalLatestBounds.task_id.in_(task_ids))
         )
         async with self._database.session as session:
             result = await session.execute(query)
@@ -64,19 +120,11 @@ class SALatestTaskRunTimeIntervalExecutionBoundsProvider(LatestTaskRunTimeInterv
 
     async def provide_latest_bounds_by_task_ids(self, task_ids: List[int]) -> Dict[
         int, TaskRunTimeIntervalExecutionBounds]:
-        async with self._database.session as session:  # FIXME: проверить, корректно ли делать where task_id = ANY(:task_ids) вмето task IN ...
-            query = text("""              
-    with task_last_right_bound as (
-        select task_id, max(right_bound_at) as right_bound_at from task_run_time_interval_execution_bounds
-        where task_id = ANY(:task_ids)
-        group by 1
-    )
-    select trtieb1.* from task_run_time_interval_execution_bounds trtieb1
-    join task_last_right_bound tlrb on tlrb.task_id = trtieb1.task_id and tlrb.right_bound_at = trtieb1.right_bound_at;
-                   """)
-            result = await session.execute(query, {
-                "task_ids": task_ids
-            })
-            rows = result.mappings().all()
-            return {row["task_id"]: TaskRunTimeIntervalExecutionBoundsMapper.to_domain(row) for row in rows}
-
+        if not task_ids:
+            return {}
+        query = (select(models.TaskTimeIntervalLatestBounds)
+                 .where(models.TaskTimeIntervalLatestBounds.task_id.in_(task_ids)))
+        async with self._database.session as session:
+            result = await session.scalars(query)
+            return {latest_bounds.task_id: TaskRunTimeIntervalExecutionBoundsMapper.to_domain(latest_bounds)
+                    for latest_bounds in result.all()}
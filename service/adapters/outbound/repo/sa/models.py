@@ -1,13 +1,17 @@
 from datetime import datetime, timezone
 from typing import Dict, List
 
-from sqlalchemy import JSON, BIGINT, ForeignKey, VARCHAR, Enum, INT, DateTime, FLOAT, TEXT, UUID, Boolean, String
+from sqlalchemy import JSON, BIGINT, ForeignKey, VARCHAR, Enum, INT, DateTime, FLOAT, TEXT, UUID, Boolean, String, \
+    Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from service.adapters.outbound.repo.sa.base import Base, TablenameMixin, SerialBigIntPKMixin, LoadTimestampMixin, \
     SerialIntPKMixin, JSONWithDatetime
 from service.domain.schemas.enums import TaskStatus, TaskType, PriorityType, MonitoringAlgorithmType, TaskRunStatus, \
-    AppUserRole
+    AppUserRole, ACTIVE_TASK_RUN_STATUSES
+
+# Значения подставляются в SQL литералами, чтобы планировщик мог сопоставить условие запроса с частичным индексом
+ACTIVE_TASK_RUN_STATUSES_SQL = ", ".join(f"'{status.value}'" for status in ACTIVE_TASK_RUN_STATUSES)
 
 
 class Payload(Base, TablenameMixin, SerialBigIntPKMixin, LoadTimestampMixin):
@@ -25,6 +29,7 @@ class Task(Base, TablenameMixin, SerialBigIntPKMixin, LoadTimestampMixin):
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus))
     status_updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     payload_id: Mapped[int] = mapped_column(BIGINT, ForeignKey("payload.id"))
+    adaptive_timeout: Mapped[float] = mapped_column(FLOAT, nullable=True)
 
 
 class MonitoringAlgorithm(Base, TablenameMixin, SerialIntPKMixin, LoadTimestampMixin):
@@ -37,6 +42,8 @@ class PeriodicMonitoringAlgorithm(Base, TablenameMixin, LoadTimestampMixin):
     id: Mapped[int] = mapped_column(INT, ForeignKey("monitoring_algorithm.id"), primary_key=True)
     timeout: Mapped[float] = mapped_column(FLOAT)
     timeout_noize: Mapped[float] = mapped_column(FLOAT)
+    adaptive_timeout_min: Mapped[float] = mapped_column(FLOAT, nullable=True)
+    adaptive_timeout_max: Mapped[float] = mapped_column(FLOAT, nullable=True)
 
 
 class SingleMonitoringAlgorithm(Base, TablenameMixin, LoadTimestampMixin):
@@ -46,6 +53,12 @@ class SingleMonitoringAlgorithm(Base, TablenameMixin, LoadTimestampMixin):
 
 
 class TaskRun(Base, TablenameMixin, SerialBigIntPKMixin, LoadTimestampMixin):
+    __table_args__ = (
+        # Частичный индекс для быстрой проверки наличия у задачи незавершенного запуска
+        Index('ix_task_run_task_id_active', 'task_id',
+              postgresql_where=text(f"status IN ({ACTIVE_TASK_RUN_STATUSES_SQL})")),
+    )
+
     task_id: Mapped[int] = mapped_column(BIGINT, ForeignKey("task.id"), )
     group_name: Mapped[str] = mapped_column(VARCHAR(64))
     priority: Mapped[PriorityType] = mapped_column(Enum(PriorityType))
@@ -53,6 +66,10 @@ class TaskRun(Base, TablenameMixin, SerialBigIntPKMixin, LoadTimestampMixin):
     execution_arguments: Mapped[Dict] = mapped_column(JSONWithDatetime, nullable=True)
     execution_bounds: Mapped[Dict] = mapped_column(JSONWithDatetime, nullable=True)
     payload: Mapped[Dict] = mapped_column(JSONWithDatetime, nullable=True)
+    is_retro: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
+    deadline_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    lease_expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_reported_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
 
     status: Mapped[TaskRunStatus] = mapped_column(Enum(TaskRunStatus))
     status_updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -88,6 +105,14 @@ class TaskRunTimeIntervalExecutionBounds(Base, TablenameMixin, LoadTimestampMixi
     left_bound_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
+class TaskTimeIntervalLatestBounds(Base, TablenameMixin, LoadTimestampMixin):
+    """ Денормализованные границы последнего запуска задачи (max right_bound_at), по одной записи на задачу """
+    task_id: Mapped[int] = mapped_column(BIGINT, ForeignKey("task.id"), primary_key=True)
+    task_run_id: Mapped[int] = mapped_column(BIGINT, )
+    right_bound_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), )
+    left_bound_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
 class AppUser(Base, TablenameMixin, SerialBigIntPKMixin, LoadTimestampMixin):
     roles: Mapped[List[AppUserRole]] = mapped_column(JSON, nullable=False)
     username: Mapped[str] = mapped_column(TEXT, nullable=False, unique=True)
@@ -119,6 +144,11 @@ class TaskGroup(Base, TablenameMixin, SerialIntPKMixin, LoadTimestampMixin):
     time_interval_max_period: Mapped[float] = mapped_column(FLOAT, nullable=True,)
     time_interval_first_left_bound_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True,)
     time_interval_first_left_bound_depth : Mapped[float] = mapped_column(FLOAT, nullable=True, server_default="86400")
+    time_interval_min_period: Mapped[float] = mapped_column(FLOAT, nullable=True,)
+    time_interval_max_runs_per_tick: Mapped[int] = mapped_column(INT, nullable=True,)
+    time_interval_freshness_sla: Mapped[float] = mapped_column(FLOAT, nullable=True,)
+    execution_lease_s: Mapped[float] = mapped_column(FLOAT, nullable=True,)
+    command_envelope_size: Mapped[int] = mapped_column(INT, nullable=True,)
 
 
 class TaskGroupByProject(Base, TablenameMixin, LoadTimestampMixin):
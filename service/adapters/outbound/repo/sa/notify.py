@@ -0,0 +1,150 @@
+import asyncio
+from typing import Callable, Optional, Any, Iterable
+
+import asyncpg
+from sqlalchemy import select, func
+
+from service.adapters.outbound.repo.cached import LocalCacheInvalidator
+from service.adapters.outbound.repo.sa.database import Database
+from service.ports.common.interfaces import Startable
+from service.ports.common.logs import logger
+from service.ports.outbound.cache import CacheInvalidator, ReferenceCacheName
+from service.ports.outbound.wake_up import WakeUpNotifier
+
+TASKS_CREATED_CHANNEL = 'potok_tasks_created'
+TASK_RUNS_WAITING_CHANNEL = 'potok_task_runs_waiting'
+
+
+class SAPgNotifier:
+    """Отправляет уведомление в канал Postgres NOTIFY"""
+
+    def __init__(self, database: Database, channel: str):
+        self._database = database
+        self._channel = channel
+
+    async def notify(self, payload: str = ''):
+        await self.notify_all([payload])
+
+    async def notify_all(self, payloads: Iterable[str]):
+        async with self._database.session as session:
+            for payload in payloads:
+                await session.execute(select(func.pg_notify(self._channel, payload)))
+            await session.commit()
+
+
+class SAPgWakeUpNotifier(WakeUpNotifier):
+    """Отправляет по уведомлению NOTIFY на каждую группу задач; одинаковые уведомления
+    в пределах транзакции Postgres доставляет один раз"""
+
+    def __init__(self, database: Database, channel: str):
+        self._notifier = SAPgNotifier(database, channel)
+        self._channel = channel
+
+    async def notify(self, group_keys: Iterable[str]):
+        group_keys = sorted(set(group_keys))
+        if not group_keys:
+            return
+        try:
+            await self._notifier.notify_all(group_keys)
+        except BaseException as e:
+            logger.warning(f"failed to notify {self._channel} for {len(group_keys)} group(s): "
+                           f"{e.__class__.__name__}: {e}")
+
+
+class PgNotificationListener(Startable):
+    """
+    Слушает канал Postgres LISTEN на выделенном соединении.
+
+    При разрыве соединения переподключается; уведомления, отправленные во время разрыва,
+    теряются, поэтому после переподключения вызывается on_reconnect.
+    """
+
+    def __init__(self,
+                 database: Database,
+                 channel: str,
+                 on_notification: Callable[[str], Any],
+                 on_reconnect: Optional[Callable[[], Any]] = None,
+                 reconnect_timeout_s: float = 5, ):
+        self._dsn = database.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+        self._channel = channel
+        self._on_notification = on_notification
+        self._on_reconnect = on_reconnect
+        self._reconnect_timeout_s = reconnect_timeout_s
+        self._task: Optional[asyncio.Task] = None
+        self._is_connected_once = False
+
+    async def start(self):
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen_forever(self):
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                terminated = asyncio.Event()
+                connection.add_termination_listener(lambda _: terminated.set())
+                await connection.add_listener(self._channel, self._handle)
+                logger.info(f"listening postgres channel {self._channel}")
+                if self._is_connected_once and self._on_reconnect:
+                    self._on_reconnect()
+                self._is_connected_once = True
+                await terminated.wait()
+                logger.warning(f"connection listening postgres channel {self._channel} terminated")
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                logger.error(f"failed to listen postgres channel {self._channel}: {e.__class__.__name__}: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self._reconnect_timeout_s)
+
+    def _handle(self, connection, pid: int, channel: str, payload: str):
+        try:
+            self._on_notification(payload)
+        except BaseException as e:
+            logger.error(f"failed to handle notification from {channel}: {e.__class__.__name__}: {e}")
+
+
+class PgNotifyCacheInvalidator(CacheInvalidator, Startable):
+    """
+    Сбрасывает кэши справочных данных текущего процесса и рассылает сброс остальным
+    процессам сервиса (API и воркерам) через Postgres NOTIFY.
+    """
+
+    def __init__(self,
+                 database: Database,
+                 local_cache_invalidator: LocalCacheInvalidator,
+                 channel: str = 'potok_reference_cache', ):
+        self._local_cache_invalidator = local_cache_invalidator
+        self._notifier = SAPgNotifier(database, channel)
+        self._listener = PgNotificationListener(database, channel,
+                                                self._on_notification,
+                                                local_cache_invalidator.invalidate_all)
+
+    async def invalidate(self, cache_name: ReferenceCacheName):
+        self._local_cache_invalidator.invalidate_local(cache_name)
+        await self._notifier.notify(cache_name.value)
+
+    async def start(self):
+        await self._listener.start()
+
+    async def stop(self):
+        await self._listener.stop()
+
+    def _on_notification(self, payload: str):
+        try:
+            cache_name = ReferenceCacheName(payload)
+        except ValueError:
+            logger.warning(f"got unknown reference cache name in notification: {payload}")
+            return
+        self._local_cache_invalidator.invalidate_local(cache_name)
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import List, Optional, Set, BinaryIO
+
+from service.ports.common.interfaces import Startable
+from service.ports.common.logs import logger
+from service.ports.outbound.spool import Spool
+
+SEGMENT_SUFFIX = '.spool'
+# Сегменты карантина: записи, которые не удалось обработать; при старте не восстанавливаются
+DEAD_SEGMENT_SUFFIX = '.dead'
+# Заголовок записи: длина и crc32 тела
+RECORD_HEADER = struct.Struct('>II')
+
+
+def encode_record(record: bytes) -> bytes:
+    return RECORD_HEADER.pack(len(record), zlib.crc32(record)) + record
+
+
+def decode_records(data: bytes) -> List[bytes]:
+    """ Записи сегмента до первой недописанной или поврежденной """
+    records = []
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, crc = RECORD_HEADER.unpack_from(data, offset)
+        record = data[offset + RECORD_HEADER.size: offset + RECORD_HEADER.size + length]
+        if len(record) < length or zlib.crc32(record) != crc:
+            break
+        records.append(record)
+        offset += RECORD_HEADER.size + length
+    return records
+
+
+class FileSpool(Spool, Startable):
+    """
+    Журнал в каталоге файлов-сегментов <номер>.spool; записи карантина — в файлах <номер>.dead того же формата.
+    Чтобы повторить обработку записей карантина, файл переименовывают в <номер>.spool до запуска.
+
+    Запись дописывается в текущий сегмент сразу, а fsync выполняется группой в отдельном потоке: записи,
+    пришедшие за fsync_delay_s и за время предыдущего fsync, сбрасываются на диск одним вызовом. Сегмент больше
+    segment_max_bytes закрывается, и запись продолжается в следующий.
+    """
+
+    def __init__(self, directory: str, segment_max_bytes: int = 64 * 1024 * 1024, fsync_delay_s: float = 0):
+        self._directory = Path(directory)
+        self._segment_max_bytes = segment_max_bytes
+        self._fsync_delay_s = fsync_delay_s
+        self._recovered_segments: List[str] = []
+        self._next_segment_number = 0
+        self._segment: Optional[BinaryIO] = None
+        self._segment_size = 0
+        # Сегменты, переполненные по размеру и еще не отданные seal
+        self._rotated_segments: List[BinaryIO] = []
+        self._dirty_files: List[BinaryIO] = []
+        self._is_directory_dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._fsync_lock = asyncio.Lock()
+
+    async def start(self):
+        self._directory.mkdir(parents=True, exist_ok=True)
+        numbers = sorted(int(path.stem) for path in self._directory.glob(f'*{SEGMENT_SUFFIX}') if path.stem.isdigit())
+        dead_numbers = [int(path.stem) for path in self._directory.glob(f'*{DEAD_SEGMENT_SUFFIX}') if path.stem.isdigit()]
+        self._recovered_segments = [self._make_segment_name(number) for number in numbers]
+        self._next_segment_number = max(numbers + dead_numbers, default=-1) + 1
+        if dead_numbers:
+            logger.warning(f"spool {self._directory}: {len(dead_numbers)} quarantined segment(s)")
+        if self._recovered_segments:
+            logger.info(f"spool {self._directory}: recovered {len(self._recovered_segments)} segment(s)")
+
+    async def stop(self):
+        # Текущий сегмент остается на диске и будет прочитан при следующем запуске
+        await self._close_files(self._take_segments())
+
+    def get_recovered_segments(self) -> List[str]:
+        return list(self._recovered_segments)
+
+    async def append(self, record: bytes):
+        data = encode_record(record)
+        if self._segment is not None and self._segment_size + len(data) > self._segment_max_bytes:
+            self._rotated_segments.append(self._segment)
+            self._segment = None
+        if self._segment is None:
+            self._open_segment()
+        self._segment.write(data)
+        self._segment_size += len(data)
+        if self._segment not in self._dirty_files:
+            self._dirty_files.append(self._segment)
+        await self._flush()
+
+    async def seal(self) -> List[str]:
+        segments = self._take_segments()
+        sealed_segments = [Path(segment.name).name for segment in segments]
+        await self._close_files(segments)
+        return sealed_segments
+
+    async def read(self, segment: str) -> List[bytes]:
+        data = await asyncio.to_thread((self._directory / segment).read_bytes)
+        records = decode_records(data)
+        if sum(RECORD_HEADER.size + len(record) for record in records) < len(data):
+            logger.warning(f"spool segment {segment}: skipped incomplete tail after {len(records)} record(s)")
+        return records
+
+    async def quarantine(self, records: List[bytes]) -> str:
+        segment_name = self._make_segment_name(self._next_segment_number, DEAD_SEGMENT_SUFFIX)
+        self._next_segment_number += 1
+        data = b''.join(encode_record(record) for record in records)
+        await asyncio.to_thread(self._write_segment, segment_name, data)
+        return segment_name
+
+    async def truncate(self, segments: List[str]):
+        await asyncio.to_thread(self._remove_segments, segments)
+        removed: Set[str] = set(segments)
+        self._recovered_segments = [segment for segment in self._recovered_segments if segment not in removed]
+
+    async def _flush(self):
+        # Первая запись группы запускает сброс, остальные ждут его же
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        await asyncio.shield(self._flush_task)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._fsync_delay_s)
+        async with self._fsync_lock:
+            # Записи, сделанные после этой точки, попадут в следующую группу
+            self._flush_task = None
+            files, self._dirty_files = self._dirty_files, []
+            is_directory_dirty, self._is_directory_dirty = self._is_directory_dirty, False
+            await asyncio.to_thread(self._fsync, files, is_directory_dirty)
+
+    async def _close_files(self, files: List[BinaryIO]):
+        # Под блокировкой: файл не закрывается, пока его сбрасывает группа записей
+        async with self._fsync_lock:
+            dirty_files = [file for file in files if file in self._dirty_files]
+            self._dirty_files = [file for file in self._dirty_files if file not in files]
+            await asyncio.to_thread(self._fsync, dirty_files, False)
+            for file in files:
+                file.close()
+
+    def _open_segment(self):
+        segment_name = self._make_segment_name(self._next_segment_number)
+        self._next_segment_number += 1
+        self._segment = open(self._directory / segment_name, 'ab', buffering=0)
+        self._segment_size = 0
+        self._is_directory_dirty = True
+
+    def _take_segments(self) -> List[BinaryIO]:
+        """ Забирает переполненные и текущий сегменты: следующая запись откроет новый """
+        segments, self._rotated_segments = self._rotated_segments, []
+        if self._segment is not None:
+            segments.append(self._segment)
+            self._segment = None
+        return segments
+
+    def _fsync(self, files: List[BinaryIO], is_directory_dirty: bool):
+        for file in files:
+            os.fsync(file.fileno())
+        if is_directory_dirty:
+            directory_fd = os.open(self._directory, os.O_RDONLY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+    def _write_segment(self, segment_name: str, data: bytes):
+        with open(self._directory / segment_name, 'xb', buffering=0) as segment:
+            segment.write(data)
+            self._fsync([segment], True)
+
+    def _remove_segments(self, segments: List[str]):
+        for segment in segments:
+            try:
+                os.remove(self._directory / segment)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _make_segment_name(number: int, suffix: str = SEGMENT_SUFFIX) -> str:
+        return f'{number:012d}{suffix}'
@@ -1,9 +1,10 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, List, Dict, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from service.domain.schemas.enums import CommandType, TaskRunStatus
+from service.domain.schemas.execution_bounds import ExecutionBounds
 from service.domain.schemas.execution_results import ExecutionResults
 from service.domain.schemas.task_run import TaskRun
 
@@ -17,9 +18,75 @@ class Command(BaseModel):
     task_run: TaskRun
 
 
+class SlimCommand(BaseModel):
+    """
+    Сокращенная команда: только то, что нужно исполнителю для выполнения запуска.
+    Исполнитель отвечает на нее CommandResponse с task_run_id и command_type вместо команды
+    """
+    type: CommandType = CommandType.EXECUTE
+    task_run_id: int
+    payload_data: Optional[Any] = None
+    execution_arguments: Optional[Dict[str, Any]] = None
+    execution_bounds: Optional[ExecutionBounds] = None
+
+    @classmethod
+    def from_task_run(cls, task_run: TaskRun, command_type: CommandType = CommandType.EXECUTE) -> 'SlimCommand':
+        if command_type == CommandType.CANCEL:
+            return cls(type=command_type, task_run_id=task_run.id)
+        return cls(type=command_type,
+                   task_run_id=task_run.id,
+                   payload_data=task_run.payload.data if task_run.payload else None,
+                   execution_arguments=task_run.execution_arguments,
+                   execution_bounds=task_run.execution_bounds)
+
+
+def make_status_queue_name(status_queue_name: str, task_run_id: int, shards_count: int) -> str:
+    """
+    Очередь, в которую исполнитель отправляет ответы по запуску. При шардировании все ответы
+    одного запуска попадают в одну шард-очередь, которую читает один потребитель, — порядок сохраняется
+    """
+    if shards_count <= 1:
+        return status_queue_name
+    return f"{status_queue_name}.{task_run_id % shards_count}"
+
+
+# Заголовок сообщения с пакетом команд; значение — количество команд в пакете
+COMMAND_ENVELOPE_HEADER = "x-command-envelope"
+# Заголовок сообщения с сокращенными командами SlimCommand; значение — COMMAND_FORMAT_SLIM
+COMMAND_FORMAT_HEADER = "x-command-format"
+COMMAND_FORMAT_SLIM = "slim"
+
+
+class CommandEnvelope(BaseModel):
+    """
+    Пакет команд в одном сообщении. Исполнитель отвечает на каждую команду пакета
+    отдельным CommandResponse, как на одиночную команду
+    """
+    commands: List[Command | SlimCommand]
+
+
 class CommandResponse(BaseModel):
-    command: Command
+    """
+    Ответ исполнителя на команду. На полную команду исполнитель возвращает ее в command,
+    на сокращенную — только task_run_id и command_type
+    """
+    command: Optional[Command] = None
+    task_run_id: Optional[int] = None
+    command_type: Optional[CommandType] = None
     status: TaskRunStatus
     description: Optional[str] = None
     result: Optional[ExecutionResults] = None
     created_at: datetime = Field(default_factory=datetime.now)
+    # Heartbeat исполнителя: только продлевает аренду выполнения запуска, статус и история не меняются
+    is_heartbeat: bool = False
+
+    @model_validator(mode='after')
+    def correlate_with_task_run(self) -> 'CommandResponse':
+        if self.command is not None:
+            self.task_run_id = self.command.task_run.id
+            self.command_type = self.command.type
+        elif self.task_run_id is None:
+            raise ValueError("command response must contain either command or task_run_id")
+        elif self.command_type is None:
+            self.command_type = CommandType.EXECUTE
+        return self
@@ -14,6 +14,7 @@ class TaskStatus(str, enum.Enum):
     EXECUTION = "EXECUTION"  # Задача выполняется
     SUCCEED = "SUCCEED"  # Выполнение задачи успешно завершено
     FINISHED = "FINISHED"  # Задача завершена окончательно и больше не подлежит выполнению
+    PAUSED = "PAUSED"  # Выполнение задачи приостановлено пользователем, выполняющиеся запуски завершаются
 
     CANCELLED = "CANCELLED"  # Выполнение задачи отменено пользователем
     ERROR = "ERROR"  # Все запуски задачи получили ошибку ERROR
@@ -30,6 +31,12 @@ class TaskRunStatus(str, enum.Enum):
     SUCCEED = "SUCCEED"  # Задача успешно выполнена
 
 
+# Статусы незавершенного запуска: пока у задачи есть такой запуск, новые запуски для нее не создаются.
+# INTERRUPTED и TEMP_ERROR тоже незавершенные: переходы статусов возвращают такие запуски в WAITING
+ACTIVE_TASK_RUN_STATUSES = (TaskRunStatus.WAITING, TaskRunStatus.QUEUED, TaskRunStatus.EXECUTION,
+                            TaskRunStatus.INTERRUPTED, TaskRunStatus.TEMP_ERROR)
+
+
 class TaskType(str, enum.Enum):
     UNDEFINED = "UNDEFINED"
     TIME_INTERVAL = "TIME_INTERVAL"
@@ -1,6 +1,6 @@
 from typing import List, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from service.domain.schemas.enums import MonitoringAlgorithmType
 
@@ -23,6 +23,25 @@ class PeriodicMonitoringAlgorithm(MonitoringAlgorithm):
     timeout_noize: float = Field(default=0, description="Число большее нуля, которое случайно будет прибавляться или "
                                                         "отниматься от значения timeout при вычислении времени "
                                                         "следующего запуска задачи. ")
+    adaptive_timeout_min: float | None = Field(default=None,
+                                               description="Минимальный период адаптивного режима. Если заданы обе "
+                                                           "границы, период каждой задачи подстраивается под объем "
+                                                           "собранных данных: сокращается, пока данные находятся, "
+                                                           "и растягивается, пока не находятся")
+    adaptive_timeout_max: float | None = Field(default=None,
+                                               description="Максимальный период адаптивного режима")
+
+    @model_validator(mode='after')
+    def check_adaptive_timeout_bounds(self):
+        if (self.adaptive_timeout_min is None) != (self.adaptive_timeout_max is None):
+            raise ValueError("adaptive_timeout_min and adaptive_timeout_max must be set together")
+        if self.is_adaptive and self.adaptive_timeout_min > self.adaptive_timeout_max:
+            raise ValueError("adaptive_timeout_min must not be greater than adaptive_timeout_max")
+        return self
+
+    @property
+    def is_adaptive(self) -> bool:
+        return self.adaptive_timeout_min is not None and self.adaptive_timeout_max is not None
 
 
 class SingleMonitoringAlgorithm(MonitoringAlgorithm):
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from pydantic import BaseModel, Field
 
@@ -29,6 +29,25 @@ class Task(TaskPK, TaskConfiguration):
     status_updated_at: datetime = Field(description="Время обновления статуса")
     payload_id: int = Field(description="Идентификатор полезной нагрузки задачи")
     loaded_at: Optional[datetime] = Field(default=None, description="Дата загрузки задачи в хранилище")
+    adaptive_timeout: Optional[float] = Field(default=None, description="Период задачи, подобранный адаптивным "
+                                                                        "режимом алгоритма мониторинга. Если не "
+                                                                        "задан, используется период алгоритма")
+
+
+class TasksFilter(BaseModel):
+    """ Отбор задач для массовых операций. Условия объединяются через И """
+    tasks_ids: Optional[List[int]] = Field(default=None, description="Идентификаторы задач")
+    group_ids: Optional[List[int]] = Field(default=None, description="Идентификаторы групп задач")
+    project_ids: Optional[List[int]] = Field(default=None, description="Идентификаторы проектов")
+    statuses: Optional[List[TaskStatus]] = Field(default=None, description="Статусы задач")
+    payload_contains: Optional[Dict[str, Any]] = Field(default=None,
+                                                       description="Фрагмент полезной нагрузки: отбираются задачи, "
+                                                                   "data полезной нагрузки которых его содержит")
+
+    @property
+    def is_empty(self) -> bool:
+        return all(value is None for value in (self.tasks_ids, self.group_ids, self.project_ids,
+                                                self.statuses, self.payload_contains))
 
 
 class TaskStatusLogPK(BaseModel):
@@ -45,6 +45,28 @@ class TaskGroupBody(BaseModel):
     time_interval_first_left_bound_depth: float | None = Field(description="Как глубоко относительно текущей даты будем"
                                                                            " собирать источник при первом сборе, секунды",
                                                                default=86400)  # В модели тоже установлено по умолчанию 86400
+    time_interval_min_period: float | None = Field(description="Минимальный размер временного интервала для сбора"
+                                                               " данных, секунды. Более короткий хвост интервала"
+                                                               " откладывается до следующих запусков",
+                                                   default=None)
+    time_interval_max_runs_per_tick: int | None = Field(description="Максимальное количество запусков, создаваемых"
+                                                                    " для одной задачи за один проход. Оставшаяся"
+                                                                    " часть интервала покрывается в следующих проходах",
+                                                        default=None)
+    time_interval_freshness_sla: float | None = Field(description="SLA свежести данных, секунды. Крайний срок запуска"
+                                                                  " — правая граница его интервала плюс SLA;"
+                                                                  " ожидающие запуски группы отправляются в порядке"
+                                                                  " крайних сроков. Если не задан — в порядке очереди",
+                                                      default=None)
+    execution_lease_s: float | None = Field(description="Длительность аренды выполнения запуска, секунды. Исполнитель"
+                                                        " продлевает аренду heartbeat-ответами; запуск прерывается,"
+                                                        " только если аренда истекла. Если не задана — значение"
+                                                        " по умолчанию сервиса",
+                                            default=None)
+    command_envelope_size: int | None = Field(description="Сколько команд упаковывать в одно сообщение исполнителю."
+                                                          " Если не задано или 1 — каждая команда отправляется"
+                                                          " отдельным сообщением",
+                                              default=None, ge=1)
     # TODO: добавить поле для выбора использования поля time_interval_first_left_bound_at или time_interval_first_left_bound_depth
 
 class TaskGroup(TaskGroupPK, TaskGroupBody):
@@ -9,6 +9,16 @@ from service.domain.schemas.execution_bounds import ExecutionBounds, TimeInterva
 from service.domain.schemas.payload import Payload
 
 
+def make_queue_name(group_name: str, task_type: TaskType, priority: PriorityType) -> str:
+    """ Очередь исполнителей для запусков группы заданного типа и приоритета """
+    return f"{group_name}.{task_type.value}.{priority.value}"
+
+
+def make_control_queue_name(group_name: str) -> str:
+    """ Управляющая очередь исполнителей группы: команды в ней не ждут очереди запусков """
+    return f"{group_name}.control"
+
+
 class TaskRunPK(BaseModel):
     id: int = None
 
@@ -28,6 +38,11 @@ class TaskRun(TaskRunPK):
     payload: Optional[Payload] = None
     execution_bounds: Optional[ExecutionBounds] = None
     execution_arguments: Optional[Dict[str, Any]] = None
+    is_retro: bool = False  # Запуск догоняет историческую часть интервала и отправляется в низкоприоритетной полосе
+    deadline_at: Optional[datetime] = None  # Крайний срок по SLA свежести группы, задает порядок отправки
+    lease_expires_at: Optional[datetime] = None  # Окончание аренды выполнения, продлевается heartbeat-ответами
+    # created_at последнего примененного ответа исполнителя (по часам исполнителя); сбрасывается при отправке
+    last_reported_at: Optional[datetime] = None
 
     status: TaskRunStatus
     status_updated_at: datetime
@@ -35,7 +50,11 @@ class TaskRun(TaskRunPK):
 
     @cached_property
     def queue_name(self):
-        return f"{self.group_name}.{self.type.value}.{self.priority.value}"
+        return make_queue_name(self.group_name, self.type, self.priority)
+
+    @property
+    def control_queue_name(self):
+        return make_control_queue_name(self.group_name)
 
 
 class TaskRunStatusLogPK(BaseModel):
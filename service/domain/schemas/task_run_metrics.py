@@ -57,5 +57,24 @@ class TaskRunMetrics(BaseModel):
     grouped_metrics_by_name: Dict[str, TaskRunGroupedMetrics]
 
 
+class TaskRunGroupedDeadlineMetrics(BaseModel):
+    """ Соблюдение SLA свежести: учитываются только запуски с крайним сроком (deadline_at) """
+    group_name: str
+    period_s: int
+
+    succeed: int = 0  # Выполнено за период
+    missed: int = 0  # Из них выполнено позже крайнего срока
+    avg_lateness_s: float = 0  # Среднее опоздание пропустивших крайний срок, сек
+    overdue_waiting: int = 0  # Ожидают отправки с уже истекшим крайним сроком
+
+    @cached_property
+    def miss_rate(self) -> float:
+        return self.missed / self.succeed if self.succeed else 0
+
+
+class TaskRunDeadlineMetrics(BaseModel):
+    grouped_deadline_metrics_by_name: Dict[str, TaskRunGroupedDeadlineMetrics]
+
+
 class TasksRunsStatusMetrics(BaseModel):
     status_metrics_by_task_id: Dict[int, StatusMetrics]
\ No newline at end of file
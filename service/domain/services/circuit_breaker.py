@@ -0,0 +1,130 @@
+import enum
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from service.domain.schemas.task_run_metrics import TaskRunGroupedMetrics
+from service.ports.common.logs import logger
+from service.ports.outbound.repo.task_run import TaskRunMetricsProvider
+
+
+class CircuitBreakerState(str, enum.Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+@dataclass
+class CircuitBreakerGroupState:
+    state: CircuitBreakerState = CircuitBreakerState.CLOSED
+    # Момент последней смены состояния: от него отсчитывается окно метрик, чтобы ошибки,
+    # из-за которых предохранитель сработал, не учитывались повторно после его закрытия
+    changed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    failure_rate: float = 0.0
+    failed: int = 0
+    finished: int = 0
+
+
+class TaskGroupCircuitBreaker:
+    """
+    Предохранитель отправки запусков задач на выполнение для каждой группы задач.
+
+    CLOSED — запуски отправляются в объеме, рассчитанном алгоритмом балансировки;
+    при доле TEMP_ERROR и INTERRUPTED выше порога предохранитель переходит в OPEN.
+    OPEN — отправка запусков группы приостановлена на open_timeout_s, затем HALF_OPEN.
+    HALF_OPEN — отправляются пробные пакеты размера probe_batch_size; по результатам
+    пробных запусков предохранитель закрывается или снова размыкается.
+    """
+
+    def __init__(self,
+                 task_run_metrics_provider: TaskRunMetricsProvider,
+                 period_s: int = 300,
+                 failure_rate_threshold: float = 0.5,
+                 min_finished_count: int = 20,
+                 open_timeout_s: int = 120,
+                 probe_batch_size: int = 5,
+                 probe_min_finished_count: int = 5,
+                 ):
+        self._task_run_metrics_provider = task_run_metrics_provider
+        self._period_s = period_s
+        self._failure_rate_threshold = failure_rate_threshold
+        self._min_finished_count = min_finished_count
+        self._open_timeout_s = open_timeout_s
+        self._probe_batch_size = probe_batch_size
+        self._probe_min_finished_count = probe_min_finished_count
+        self._state_by_group: Dict[str, CircuitBreakerGroupState] = {}
+
+    @property
+    def state_by_group(self) -> Dict[str, CircuitBreakerGroupState]:
+        return dict(self._state_by_group)
+
+    async def apply(self, batch_size_by_group_name: Dict[str, int]) -> Dict[str, int]:
+        """Ограничивает размеры пакетов групп в соответствии с состоянием предохранителя"""
+        now = datetime.now(timezone.utc)
+        group_states = {group_name: self._state_by_group.setdefault(group_name, CircuitBreakerGroupState())
+                        for group_name in batch_size_by_group_name}
+        metrics_by_group = await self._load_metrics(group_states, now)
+
+        limited_batch_size_by_group_name = {}
+        for group_name, batch_size in batch_size_by_group_name.items():
+            group_state = group_states[group_name]
+            self._update_state(group_name, group_state, metrics_by_group.get(group_name), now)
+            if group_state.state == CircuitBreakerState.OPEN:
+                continue
+            if group_state.state == CircuitBreakerState.HALF_OPEN:
+                batch_size = min(batch_size, self._probe_batch_size)
+            limited_batch_size_by_group_name[group_name] = batch_size
+        return limited_batch_size_by_group_name
+
+    async def _load_metrics(self, group_states: Dict[str, CircuitBreakerGroupState],
+                            now: datetime) -> Dict[str, TaskRunGroupedMetrics]:
+        group_names_by_period: Dict[int, List[str]] = defaultdict(list)
+        for group_name, group_state in group_states.items():
+            if group_state.state == CircuitBreakerState.OPEN:
+                continue
+            period_s = self._calculate_period(group_state, now)
+            group_names_by_period[period_s].append(group_name)
+
+        metrics_by_group = {}
+        for period_s, group_names in group_names_by_period.items():
+            task_run_metrics = await self._task_run_metrics_provider.provide_by_period(period_s, group_names)
+            metrics_by_group.update(task_run_metrics.grouped_metrics_by_name)
+        return metrics_by_group
+
+    def _calculate_period(self, group_state: CircuitBreakerGroupState, now: datetime) -> int:
+        since_changed_s = int((now - group_state.changed_at).total_seconds()) + 1
+        return max(1, min(self._period_s, since_changed_s))
+
+    def _update_state(self, group_name: str, group_state: CircuitBreakerGroupState,
+                      metrics: Optional[TaskRunGroupedMetrics], now: datetime):
+        if group_state.state == CircuitBreakerState.OPEN:
+            if (now - group_state.changed_at).total_seconds() >= self._open_timeout_s:
+                self._transit(group_name, group_state, CircuitBreakerState.HALF_OPEN, now)
+            return
+
+        failed = metrics.failed if metrics else 0
+        finished = failed + metrics.completed if metrics else 0
+        group_state.failed = failed
+        group_state.finished = finished
+        group_state.failure_rate = failed / finished if finished else 0.0
+        is_failure_rate_exceeded = group_state.failure_rate >= self._failure_rate_threshold
+
+        if group_state.state == CircuitBreakerState.CLOSED:
+            if finished >= self._min_finished_count and is_failure_rate_exceeded:
+                self._transit(group_name, group_state, CircuitBreakerState.OPEN, now)
+        elif group_state.state == CircuitBreakerState.HALF_OPEN:
+            if finished < self._probe_min_finished_count:
+                return
+            if is_failure_rate_exceeded:
+                self._transit(group_name, group_state, CircuitBreakerState.OPEN, now)
+            else:
+                self._transit(group_name, group_state, CircuitBreakerState.CLOSED, now)
+
+    @staticmethod
+    def _transit(group_name: str, group_state: CircuitBreakerGroupState,
+                 to_state: CircuitBreakerState, now: datetime):
+        logger.warning(f"Circuit breaker [{group_name}]: {group_state.state.value} -> {to_state.value}; "
+                       f"failure rate: {group_state.failure_rate:.2f} ({group_state.failed}/{group_state.finished})")
+        group_state.state = to_state
+        group_state.changed_at = now
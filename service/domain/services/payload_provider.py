@@ -1,15 +1,60 @@
+import json
+import sys
 from collections import defaultdict
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Iterable
+
+from cachetools import LRUCache
 
 from service.domain.schemas.payload import PayloadPK, Payload
 from service.domain.schemas.task import Task
+from service.ports.common.logs import logger
+from service.ports.outbound.cache import Cache
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import FilterFieldsDNF, ConditionOperation
 
 
-class PayloadProvider:
-    def __init__(self, payload_repo: Repo[Payload, Payload, PayloadPK]):
+@dataclass
+class PayloadCacheMetrics:
+    hits: int
+    misses: int
+    count: int
+    size_bytes: int
+    max_size_bytes: int
+
+
+def estimate_payload_size(payload: Payload) -> int:
+    """Оценка занимаемой полезной нагрузкой памяти по размеру сериализованного data"""
+    data_size = len(json.dumps(payload.data, default=str)) if payload.data is not None else 0
+    return sys.getsizeof(payload) + data_size
+
+
+class PayloadProvider(Cache):
+    """
+    Загружает полезные нагрузки задач.
+
+    Полезные нагрузки читаются на каждом цикле мониторинга, а меняются редко, поэтому
+    держатся в LRU-кэше, ограниченном суммарным размером; из БД загружаются только промахи.
+    Изменение полезной нагрузки сбрасывает кэш во всех процессах через CacheInvalidator.
+    Вызывающему коду отдаются копии: изменение полученной полезной нагрузки не портит кэш.
+    """
+
+    def __init__(self, payload_repo: Repo[Payload, Payload, PayloadPK],
+                 cache_max_size_bytes: int = 64 * 1024 * 1024, ):
         self._payload_repo = payload_repo
+        self._cache_max_size_bytes = cache_max_size_bytes
+        self._payload_by_id: LRUCache = LRUCache(maxsize=cache_max_size_bytes, getsizeof=estimate_payload_size)
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def metrics(self) -> PayloadCacheMetrics:
+        return PayloadCacheMetrics(hits=self._hits,
+                                   misses=self._misses,
+                                   count=len(self._payload_by_id),
+                                   size_bytes=int(self._payload_by_id.currsize),
+                                   max_size_bytes=self._cache_max_size_bytes, )
 
     async def provide(self, tasks: List[Task]) -> Dict[Task, Optional[Payload]]:
         if not tasks:
@@ -17,14 +62,46 @@ class PayloadProvider:
         tasks_by_payload_id = defaultdict(list)
         for task in tasks:
             tasks_by_payload_id[task.payload_id].append(task)
-        payload_ids = tasks_by_payload_id.keys()
-        payloads = await self._payload_repo.filter(FilterFieldsDNF.single("id",
-                                                                          payload_ids,
-                                                                          ConditionOperation.IN))
-        payload_by_id = {payload.id: payload for payload in payloads}
+        payload_by_id = await self.provide_by_ids(tasks_by_payload_id.keys())
         payload_by_task = {}
         for payload_id, tasks in tasks_by_payload_id.items():
             payload = payload_by_id.get(payload_id)
             for task in tasks:
                 payload_by_task[task] = payload
         return payload_by_task
+
+    async def get(self, payload_id: int) -> Optional[Payload]:
+        payload_by_id = await self.provide_by_ids([payload_id])
+        return payload_by_id.get(payload_id)
+
+    async def provide_by_ids(self, payload_ids: Iterable[int]) -> Dict[int, Payload]:
+        payload_by_id = {}
+        missed_payload_ids = []
+        for payload_id in payload_ids:
+            payload = self._payload_by_id.get(payload_id)
+            if payload is None:
+                missed_payload_ids.append(payload_id)
+            else:
+                payload_by_id[payload_id] = payload.model_copy(deep=True)
+        self._hits += len(payload_by_id)
+        self._misses += len(missed_payload_ids)
+        if not missed_payload_ids:
+            return payload_by_id
+
+        version = self._version
+        payloads = await self._payload_repo.filter(FilterFieldsDNF.single("id",
+                                                                          missed_payload_ids,
+                                                                          ConditionOperation.IN))
+        for payload in payloads:
+            payload_by_id[payload.id] = payload
+            if version != self._version:
+                continue
+            try:
+                self._payload_by_id[payload.id] = payload.model_copy(deep=True)
+            except ValueError:
+                logger.warning(f"payload {payload.id} is too large to be cached")
+        return payload_by_id
+
+    def invalidate(self):
+        self._version += 1
+        self._payload_by_id.clear()
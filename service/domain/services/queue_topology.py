@@ -0,0 +1,69 @@
+from typing import Iterable, Set
+
+from service.domain.schemas.enums import TaskType, PriorityType
+from service.domain.schemas.task_group import TaskGroup, TaskGroupPK
+from service.domain.schemas.task_run import make_queue_name, make_control_queue_name
+from service.ports.common.interfaces import Startable
+from service.ports.common.logs import logger
+from service.ports.outbound.cache import Cache
+from service.ports.outbound.producer import QueueCreator
+from service.ports.outbound.repo.abstract import Repo
+
+
+class QueueTopology(Cache, Startable):
+    """
+    Объявляет очереди {group}.{type}.{priority} и управляющие очереди {group}.control всех групп задач:
+    при старте и после изменения групп.
+
+    Изменение групп сбрасывает топологию через CacheInvalidator, как кэш справочных данных, и очереди
+    новых групп объявляются перед следующей отправкой. Уже объявленные очереди повторно не объявляются,
+    поэтому при отправке сообщений работы с топологией нет.
+    """
+
+    def __init__(self, task_group_repo: Repo[TaskGroup, TaskGroup, TaskGroupPK], queue_creator: QueueCreator):
+        self._task_group_repo = task_group_repo
+        self._queue_creator = queue_creator
+        self._declared_queue_names: Set[str] = set()
+        self._is_stale = True
+
+    async def start(self):
+        await self.ensure_declared()
+
+    async def stop(self):
+        pass
+
+    def invalidate(self):
+        self._is_stale = True
+
+    def is_declared(self, queue_name: str) -> bool:
+        return queue_name in self._declared_queue_names
+
+    async def ensure_declared(self, queue_names: Iterable[str] = ()):
+        """
+        Объявляет очереди всех групп, если группы менялись, и переданные очереди, которые еще не объявлены
+        (например, группа создана, а уведомление о сбросе еще не пришло)
+        """
+        if self._is_stale:
+            self._is_stale = False
+            task_groups = await self._task_group_repo.get_all()
+            group_queue_names = {make_queue_name(task_group.name, task_type, priority)
+                                 for task_group in task_groups
+                                 for task_type in TaskType
+                                 for priority in PriorityType}
+            group_queue_names.update(make_control_queue_name(task_group.name) for task_group in task_groups)
+            await self._declare(group_queue_names)
+        await self._declare(set(queue_names))
+
+    async def _declare(self, queue_names: Set[str]):
+        queue_names = queue_names - self._declared_queue_names
+        if not queue_names:
+            return
+        for queue_name in sorted(queue_names):
+            is_queue_exists = await self._queue_creator.is_queue_exists(queue_name)
+            if not is_queue_exists:
+                is_queue_exists = await self._queue_creator.create_queue(queue_name)
+            if is_queue_exists:
+                self._declared_queue_names.add(queue_name)
+            else:
+                logger.warning(f"failed to declare queue {queue_name}")
+        logger.info(f"declared {len(queue_names)} queue(s)")
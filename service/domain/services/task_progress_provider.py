@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 from collections import defaultdict
 from datetime import datetime, timezone
 from typing import List, Dict, Any
@@ -36,8 +37,18 @@ class TimeInterval:
 
 
 class TimeIntervalExecutionBoundsCutter:
+    """
+    Обрезает границы выполнения по уже собранному прогрессу задачи.
+
+    cut выполняется бинарным поиском, но построение резчика сортирует и объединяет всю историю
+    прогресса задачи: резчик выгодно строить один раз и обрезать им все границы задачи
+    """
+
     def __init__(self, time_interval_task_progresses: List[TimeIntervalTaskProgress]):
+        # Объединенные интервалы не пересекаются и упорядочены по убыванию, поэтому их левые границы
+        # строго убывают: по ним в обратном порядке выполняется бинарный поиск в cut
         self.intervals = self.create_intervals(time_interval_task_progresses)
+        self._left_bounds_asc = [interval.left_bound_at for interval in reversed(self.intervals)]
 
     def create_intervals(self, time_interval_task_progresses: List[TimeIntervalTaskProgress]):
         if time_interval_task_progresses:
@@ -67,18 +78,19 @@ class TimeIntervalExecutionBoundsCutter:
     def cut(self, execution_bounds: TimeIntervalBounds):
         if not self.intervals:
             return execution_bounds
-        for interval in self.intervals:
-            if interval.has_interval(execution_bounds.left_bound_at, execution_bounds.right_bound_at):
-                # Граничный случай: интервал уже выполнен, возвращаем равные даты в границах выполнения
-                execution_bounds.left_bound_at = execution_bounds.right_bound_at
-                return execution_bounds
-            if interval.is_interval_lower(execution_bounds.left_bound_at, execution_bounds.right_bound_at):
-                # Интервал полностью меньше - идем дальше
-                continue
-            # Иначе - правая граница входит в этот интервал. Левая граница задачи всегда постоянна
-            # из-за атомарности запуска задач
-            execution_bounds.right_bound_at = interval.left_bound_at
+        # Ближайший к концу истории интервал, левая граница которого не больше правой границы выполнения.
+        # Все более поздние интервалы целиком лежат правее границ выполнения - их пропускаем
+        position = bisect_right(self._left_bounds_asc, execution_bounds.right_bound_at)
+        if not position:
             return execution_bounds
+        interval = self.intervals[len(self.intervals) - position]
+        if interval.has_interval(execution_bounds.left_bound_at, execution_bounds.right_bound_at):
+            # Граничный случай: интервал уже выполнен, возвращаем равные даты в границах выполнения
+            execution_bounds.left_bound_at = execution_bounds.right_bound_at
+            return execution_bounds
+        # Иначе - правая граница входит в этот интервал. Левая граница задачи всегда постоянна
+        # из-за атомарности запуска задач
+        execution_bounds.right_bound_at = interval.left_bound_at
         return execution_bounds
 
 
@@ -90,6 +102,8 @@ class ActualExecutionBoundsProvider(ABC):
 
 
 class ActualTimeIntervalExecutionBoundsProvider(ActualExecutionBoundsProvider):
+    """ Строит резчики заново на каждый вызов provide: история прогресса загружается и объединяется целиком """
+
     def __init__(self, time_interval_task_progress_repo: Repo[TimeIntervalTaskProgress,
                                                               TimeIntervalTaskProgress,
                                                               TimeIntervalTaskProgressPK],
@@ -1,10 +1,12 @@
 from datetime import datetime, timezone
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from service.domain.schemas.enums import TaskStatus, TaskRunStatus
 from service.domain.schemas.task import Task, TaskPK
 from service.domain.schemas.task_run import TaskRun, TaskRunPK, TaskRunStatusLog, TaskRunStatusLogPK
 from service.domain.use_cases.abstract import UCResponse, UCRequest, UseCase
+from service.domain.use_cases.internal.send_cancel_commands import SendCancelCommandsUC, SendCancelCommandsUCRq, \
+    IN_FLIGHT_TASK_RUN_STATUSES
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import UpdateFields, FilterFieldsDNF, FilterField, ConditionOperation
 from service.ports.outbound.repo.transaction import TransactionFactory
@@ -23,11 +25,13 @@ class CancelTasksUC(UseCase):
     def __init__(self, task_repo: Repo[Task, Task, TaskPK],
                  task_run_repo: Repo[TaskRun, TaskRun, TaskRunPK],
                  task_run_status_log_repo: Repo[TaskRunStatusLog, TaskRunStatusLog, TaskRunStatusLogPK],
-                 transaction_factory: TransactionFactory,):
+                 transaction_factory: TransactionFactory,
+                 send_cancel_commands_uc: Optional[SendCancelCommandsUC] = None, ):
         self._task_repo = task_repo
         self._task_run_repo = task_run_repo
         self._task_run_status_log_repo = task_run_status_log_repo
         self._transaction_factory = transaction_factory
+        self._send_cancel_commands_uc = send_cancel_commands_uc
 
     async def apply(self, request: CancelTasksUCRq) -> CancelTasksUCRs:
         # TODO: можно оптимизировать несколько запросов с помощью SQL UPDATE ... SET ... WHERE ... RETURNING ...
@@ -38,7 +42,8 @@ class CancelTasksUC(UseCase):
                     FilterField(name='status',
                                 value=[TaskStatus.EXECUTION,
                                        TaskStatus.SUCCEED,
-                                       TaskStatus.NEW],
+                                       TaskStatus.NEW,
+                                       TaskStatus.PAUSED],
                                 operation=ConditionOperation.IN),
                     FilterField(name='id', value=request.tasks_ids, operation=ConditionOperation.IN)
                 ]
@@ -77,4 +82,11 @@ class CancelTasksUC(UseCase):
                                       for processing_task_run in processing_tasks_runs]
             await self._task_run_status_log_repo.create_all(tasks_runs_status_logs, transaction)
 
+        # 4. Останавливаем у исполнителей запуски, которые уже отправлены на выполнение
+        in_flight_task_runs = [task_run.model_copy(update={'status': TaskRunStatus.CANCELLED,
+                                                           'status_updated_at': status_updated_at})
+                               for task_run in processing_tasks_runs
+                               if task_run.status in IN_FLIGHT_TASK_RUN_STATUSES]
+        if self._send_cancel_commands_uc and in_flight_task_runs:
+            await self._send_cancel_commands_uc.apply(SendCancelCommandsUCRq(task_runs=in_flight_task_runs))
         return CancelTasksUCRs(success=True, request=request, cancelled_task_by_id={t.id: t for t in processing_tasks})
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from itertools import chain
-from typing import List
+from typing import List, Optional
 
 from service.domain.schemas.enums import TaskStatus
 from service.domain.schemas.payload import PayloadBody, PayloadPK, Payload
@@ -10,6 +10,7 @@ from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
 from service.ports.common.logs import logger
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.transaction import TransactionFactory
+from service.ports.outbound.wake_up import WakeUpNotifier
 
 
 class CreateTasksUCRq(UCRequest):
@@ -28,13 +29,15 @@ class CreateTasksUC(UseCase):
                  uniqueness_payload_checker: UniquenessPayloadChecker,
                  payload_repo: Repo[Payload, Payload, PayloadPK],
                  task_repo: Repo[Task, Task, TaskPK],
-                 task_status_log_repo: Repo[TaskStatusLog, TaskStatusLog, TaskStatusLogPK]
+                 task_status_log_repo: Repo[TaskStatusLog, TaskStatusLog, TaskStatusLogPK],
+                 wake_up_notifier: Optional[WakeUpNotifier] = None,
                  ):
         self._transaction_factory = transaction_factory
         self._uniqueness_payload_checker = uniqueness_payload_checker
         self._payload_repo = payload_repo
         self._task_repo = task_repo
         self._task_status_log_repo = task_status_log_repo
+        self._wake_up_notifier = wake_up_notifier
 
     async def apply(self, request: CreateTasksUCRq) -> CreateTasksUCRs:
         try:
@@ -62,4 +65,7 @@ class CreateTasksUC(UseCase):
             logger.error(e)
             return CreateTasksUCRs(success=False, error=e, request=request)
         else:
+            # Новые задачи сразу попадают в создание запусков, не дожидаясь периодического запуска
+            if self._wake_up_notifier and created_tasks:
+                await self._wake_up_notifier.notify(str(task.group_id) for task in created_tasks)
             return CreateTasksUCRs(success=True, request=request, tasks=created_tasks)
@@ -34,6 +34,8 @@ from service.domain.use_cases.external.project import GetAllProjectsUCRs, GetAll
     UpdateProjectUCRs, UpdateProjectUC, GetAllTaskGroupByProjectDetailedUC, GetAllTaskGroupByProjectDetailedUCRs, \
     GetAllTaskGroupByProjectDetailedUCRq, GetProjectByTaskGroupUC, GetProjectByTaskGroupUCRq, GetProjectByTaskGroupUCRs
 from service.domain.use_cases.external.resume_tasks import ResumeTasksUC, ResumeTasksUCRq, ResumeTasksUCRs
+from service.domain.use_cases.external.tasks_by_filter import CancelTasksByFilterUC, PauseTasksByFilterUC, \
+    ResumeTasksByFilterUC, TasksByFilterUCRq, TasksByFilterUCRs
 from service.domain.use_cases.external.task_group import GetAllTaskGroupUC, GetAllTaskGroupUCRq, GetAllTaskGroupUCRs, \
     CreateTaskGroupUCRq, CreateTaskGroupUCRs, CreateTaskGroupUC, GetTaskGroupUCRq, GetTaskGroupUCRs, GetTaskGroupUC, \
     UpdateTaskGroupUCRq, UpdateTaskGroupUC, UpdateTaskGroupUCRs
@@ -80,6 +82,9 @@ class UseCaseFacade:
                  cancel_tasks_uc: CancelTasksUC,
                  get_payloads_by_group_uc: GetPayloadsByGroupUC,
                  find_or_create_simplified_periodic_algorithm_uc: FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUC,
+                 cancel_tasks_by_filter_uc: CancelTasksByFilterUC,
+                 pause_tasks_by_filter_uc: PauseTasksByFilterUC,
+                 resume_tasks_by_filter_uc: ResumeTasksByFilterUC,
                  ):
         self._create_tasks_uc = create_tasks_uc
         self._create_monitoring_algorithm_uc = create_monitoring_algorithm_uc
@@ -118,6 +123,9 @@ class UseCaseFacade:
         self._cancel_tasks_uc = cancel_tasks_uc
         self._find_or_create_simplified_periodic_algorithm_uc = find_or_create_simplified_periodic_algorithm_uc
         self._get_payloads_by_group_uc = get_payloads_by_group_uc
+        self._cancel_tasks_by_filter_uc = cancel_tasks_by_filter_uc
+        self._pause_tasks_by_filter_uc = pause_tasks_by_filter_uc
+        self._resume_tasks_by_filter_uc = resume_tasks_by_filter_uc
 
     async def create_tasks(self, request: CreateTasksUCRq) -> CreateTasksUCRs:
         return await self._create_tasks_uc.apply(request)
@@ -225,6 +233,15 @@ class UseCaseFacade:
     async def resume_tasks(self, request: ResumeTasksUCRq) -> ResumeTasksUCRs:
         return await self._resume_tasks_uc.apply(request)
 
+    async def cancel_tasks_by_filter(self, request: TasksByFilterUCRq) -> TasksByFilterUCRs:
+        return await self._cancel_tasks_by_filter_uc.apply(request)
+
+    async def pause_tasks_by_filter(self, request: TasksByFilterUCRq) -> TasksByFilterUCRs:
+        return await self._pause_tasks_by_filter_uc.apply(request)
+
+    async def resume_tasks_by_filter(self, request: TasksByFilterUCRq) -> TasksByFilterUCRs:
+        return await self._resume_tasks_by_filter_uc.apply(request)
+
     async def find_or_create_simplified_periodic_algorithm(self, request: FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUCRq) -> FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUCRs:
         return await self._find_or_create_simplified_periodic_algorithm_uc.apply(request)
 
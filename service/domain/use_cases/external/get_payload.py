@@ -1,8 +1,9 @@
 from typing import Optional, List
 
-from service.domain.schemas.payload import Payload, PayloadPK
+from service.domain.schemas.payload import Payload
 from service.domain.schemas.task import TaskPK, Task
 from service.domain.schemas.task_detailed import TaskDetailed
+from service.domain.services.payload_provider import PayloadProvider
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
 from service.domain.use_cases.external.get_tasks_detailed import GetTasksDetailedUC, GetTasksDetailedUCRq
 from service.ports.outbound.repo.abstract import Repo
@@ -22,15 +23,15 @@ class GetPayloadUCRs(UCResponse):
 
 class GetPayloadUC(UseCase):
 
-    def __init__(self, payload_repo: Repo[Payload, Payload, PayloadPK],
+    def __init__(self, payload_provider: PayloadProvider,
                  task_repo: Repo[Task, Task, TaskPK],
                  get_tasks_detailed_uc: GetTasksDetailedUC, ):
-        self._payload_repo = payload_repo
+        self._payload_provider = payload_provider
         self._task_repo = task_repo
         self._get_tasks_detailed_uc = get_tasks_detailed_uc
 
     async def apply(self, request: GetPayloadUCRq) -> GetPayloadUCRs:
-        payload = await self._payload_repo.get(PayloadPK(id=request.payload_id))
+        payload = await self._payload_provider.get(request.payload_id)
         if not payload:
             return GetPayloadUCRs(success=False, error="Not found", request=request)
         if request.with_tasks:
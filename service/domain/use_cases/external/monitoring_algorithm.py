@@ -8,6 +8,7 @@ from service.domain.schemas.monitoring_algorithm import (
     MonitoringAlgorithmUnion, SingleMonitoringAlgorithm,
 )
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
+from service.ports.outbound.cache import CacheInvalidator, ReferenceCacheName
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import PaginationQuery, FilterFieldsDNF, ConditionOperation, UpdateFields, \
     FilterField
@@ -46,11 +47,13 @@ class CreateMonitoringAlgorithmUC(UseCase):
                 SingleMonitoringAlgorithm, SingleMonitoringAlgorithm, MonitoringAlgorithmPK
             ],
             transaction_factory: TransactionFactory,
+            cache_invalidator: Optional[CacheInvalidator] = None,
     ):
         self._monitoring_algorithm_repo = monitoring_algorithm_repo
         self._periodic_monitoring_algorithm_repo = periodic_monitoring_algorithm_repo
         self._single_monitoring_algorithm_repo = single_monitoring_algorithm_repo
         self._transaction_factory = transaction_factory
+        self._cache_invalidator = cache_invalidator
 
     async def apply(
             self, request: CreateMonitoringAlgorithmUCRq
@@ -68,6 +71,7 @@ class CreateMonitoringAlgorithmUC(UseCase):
         except BaseException as e:
             return CreateMonitoringAlgorithmUCRs(success=False, error=str(e), request=request, created_algorithm=None)
         else:
+            await invalidate_monitoring_algorithm_cache(self._cache_invalidator)
             created.title = created_ma.title
             created.description = created_ma.description
             return CreateMonitoringAlgorithmUCRs(
@@ -208,17 +212,20 @@ class UpdateMonitoringAlgorithmUC(UseCase):
                 SingleMonitoringAlgorithm, SingleMonitoringAlgorithm, MonitoringAlgorithmPK
             ],
             transaction_factory: TransactionFactory,
+            cache_invalidator: Optional[CacheInvalidator] = None,
     ):
         self._monitoring_algorithm_repo = monitoring_algorithm_repo
         self._periodic_monitoring_algorithm_repo = periodic_monitoring_algorithm_repo
         self._single_monitoring_algorithm_repo = single_monitoring_algorithm_repo
         self._transaction_factory = transaction_factory
+        self._cache_invalidator = cache_invalidator
 
     async def apply(self, request: UpdateMonitoringAlgorithmUCRq) -> UpdateMonitoringAlgorithmUCRs:
         monitoring_algorithm_pk = MonitoringAlgorithmPK(id=request.monitoring_algorithm_id)
         base_algorithm = await self._monitoring_algorithm_repo.update(monitoring_algorithm_pk,
             UpdateFields.multiple({'name': request.title,
                                    'description': request.description}))
+        await invalidate_monitoring_algorithm_cache(self._cache_invalidator)
         if base_algorithm.type == MonitoringAlgorithmType.PERIODIC:
             monitoring_algorithm = await self._periodic_monitoring_algorithm_repo.get(monitoring_algorithm_pk)
         elif base_algorithm.type == MonitoringAlgorithmType.SINGLE:
@@ -253,7 +260,9 @@ class FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUC(UseCase):
     async def apply(self, request: FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUCRq) -> FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUCRs:
         timeout = period_to_seconds(request.simplified_monitoring_period)
         filter_fields_dnf = FilterFieldsDNF.single_conjunct([FilterField.new('timeout', timeout, ConditionOperation.EQ),
-                                                             FilterField.new('timeout_noize', 0, ConditionOperation.EQ)])
+                                                             FilterField.new('timeout_noize', 0, ConditionOperation.EQ),
+                                                             FilterField.new('adaptive_timeout_min', None,
+                                                                             ConditionOperation.IS_NULL)])
         periodic_monitoring_algorithms = await self._periodic_monitoring_algorithm_repo.filter(filter_fields_dnf)
         if periodic_monitoring_algorithms:
             periodic_monitoring_algorithm = periodic_monitoring_algorithms[0]
@@ -267,6 +276,11 @@ class FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUC(UseCase):
 
 
 
+async def invalidate_monitoring_algorithm_cache(cache_invalidator: Optional[CacheInvalidator]):
+    if cache_invalidator:
+        await cache_invalidator.invalidate(ReferenceCacheName.MONITORING_ALGORITHM)
+
+
 def period_to_seconds(period: SimplifiedMonitoringPeriod) -> int:
     """Convert enum period to seconds."""
     mapping = {
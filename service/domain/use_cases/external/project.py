@@ -12,6 +12,7 @@ from service.domain.schemas.task_group_by_project import TaskGroupByProject, Tas
     TaskGroupByProjectDetailed
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
 from service.domain.use_cases.external.task_group import GetAllTaskGroupUC, GetAllTaskGroupUCRq
+from service.ports.outbound.cache import CacheInvalidator, ReferenceCacheName
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields, ConditionOperation
 
@@ -114,10 +115,17 @@ class ProjectTaskGroupUC(UseCase, ABC):
             task_group_by_project_repo: Repo[
                 TaskGroupByProject, TaskGroupByProject, TaskGroupByProjectPK
             ],
+            cache_invalidator: Optional[CacheInvalidator] = None,
     ):
         self._project_repo = project_repo
         self._task_group_repo = task_group_repo
         self._task_group_by_project_repo = task_group_by_project_repo
+        self._cache_invalidator = cache_invalidator
+
+    async def _invalidate_task_group_cache(self):
+        # Привязка к проекту — часть справочных данных группы задач
+        if self._cache_invalidator:
+            await self._cache_invalidator.invalidate(ReferenceCacheName.TASK_GROUP)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -173,6 +181,7 @@ class AddTaskGroupToProjectUC(ProjectTaskGroupUC):
                 ) for task_group_id in request.task_group_ids
             ]
         )
+        await self._invalidate_task_group_cache()
         return AddTaskGroupToProjectUCRs(
             success=True, request=request, task_group_by_project_list=links
         )
@@ -209,6 +218,7 @@ class RemoveTaskGroupFromProjectUC(ProjectTaskGroupUC):
             )
 
         await self._task_group_by_project_repo.delete(link)
+        await self._invalidate_task_group_cache()
         return RemoveTaskGroupFromProjectUCRs(success=True, request=request)
 
 
@@ -38,7 +38,8 @@ class ResumeTasksUC(UseCase):
             # 1. Обновлям статусы задач
             cancelled_tasks_condition = FilterFieldsDNF.single_conjunct(
                 [
-                    FilterField(name='status', value=TaskStatus.CANCELLED),
+                    FilterField(name='status', value=[TaskStatus.CANCELLED, TaskStatus.PAUSED],
+                                operation=ConditionOperation.IN),
                     FilterField(name='id', value=request.tasks_ids, operation=ConditionOperation.IN)
                 ]
             )
@@ -8,13 +8,20 @@ from service.domain.schemas.task_run_metrics import TaskRunGroupedMetrics, \
     TaskRunGroupedAvgMetrics
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
 from service.domain.use_cases.external.get_tasks_detailed import GetTasksDetailedUC, GetTasksDetailedUCRq
+from service.ports.outbound.cache import CacheInvalidator, ReferenceCacheName
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields, PaginationQuery
 
 
 class TaskGroupUC(UseCase, ABC):
-    def __init__(self, task_group_repo: Repo[TaskGroup, TaskGroup, TaskGroupPK]):
+    def __init__(self, task_group_repo: Repo[TaskGroup, TaskGroup, TaskGroupPK],
+                 cache_invalidator: Optional[CacheInvalidator] = None, ):
         self._task_group_repo = task_group_repo
+        self._cache_invalidator = cache_invalidator
+
+    async def _invalidate_task_group_cache(self):
+        if self._cache_invalidator:
+            await self._cache_invalidator.invalidate(ReferenceCacheName.TASK_GROUP)
 
 
 class CreateTaskGroupUCRq(UCRequest):
@@ -37,6 +44,7 @@ class CreateTaskGroupUC(TaskGroupUC):
                                        request=request)
         task_group = TaskGroup.model_validate(request.task_group_body, from_attributes=True)
         task_group = await self._task_group_repo.create(task_group)
+        await self._invalidate_task_group_cache()
         return CreateTaskGroupUCRs(success=True, request=request, task_group=task_group)
 
 
@@ -92,6 +100,11 @@ class UpdateTaskGroupUCRq(UCRequest):
     time_interval_max_period: float | None = None
     time_interval_first_left_bound_at: datetime | None = None
     time_interval_first_left_bound_depth: float | None = None
+    time_interval_min_period: float | None = None
+    time_interval_max_runs_per_tick: int | None = None
+    time_interval_freshness_sla: float | None = None
+    execution_lease_s: float | None = None
+    command_envelope_size: int | None = None
 
 
 class UpdateTaskGroupUCRs(UCResponse):
@@ -125,6 +138,16 @@ class UpdateTaskGroupUC(TaskGroupUC):
             updates['time_interval_first_left_bound_at'] = request.time_interval_first_left_bound_at
         if request.time_interval_first_left_bound_depth is not None:
             updates['time_interval_first_left_bound_depth'] = request.time_interval_first_left_bound_depth
+        if request.time_interval_min_period is not None:
+            updates['time_interval_min_period'] = request.time_interval_min_period
+        if request.time_interval_max_runs_per_tick is not None:
+            updates['time_interval_max_runs_per_tick'] = request.time_interval_max_runs_per_tick
+        if request.time_interval_freshness_sla is not None:
+            updates['time_interval_freshness_sla'] = request.time_interval_freshness_sla
+        if request.execution_lease_s is not None:
+            updates['execution_lease_s'] = request.execution_lease_s
+        if request.command_envelope_size is not None:
+            updates['command_envelope_size'] = request.command_envelope_size
 
         if not updates:
             # Нечего обновлять — возвращаем как есть
@@ -134,6 +157,7 @@ class UpdateTaskGroupUC(TaskGroupUC):
             TaskGroupPK(id=request.task_group_id),
             UpdateFields.multiple(updates)
         )
+        await self._invalidate_task_group_cache()
 
         return UpdateTaskGroupUCRs(success=True, request=request, task_group=updated)
 
@@ -0,0 +1,184 @@
+from abc import abstractmethod
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from service.domain.schemas.enums import TaskStatus, TaskRunStatus
+from service.domain.schemas.task import TasksFilter
+from service.domain.schemas.task_run import TaskRunStatusLog, TaskRunStatusLogPK, TaskRun, TaskRunPK
+from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
+from service.domain.use_cases.internal.send_cancel_commands import SendCancelCommandsUC, SendCancelCommandsUCRq, \
+    IN_FLIGHT_TASK_RUN_STATUSES
+from service.ports.outbound.repo.abstract import Repo
+from service.ports.outbound.repo.fields import FilterFieldsDNF, ConditionOperation
+from service.ports.outbound.repo.task import TaskStatusBulkUpdater, TasksStatusBulkUpdate
+from service.ports.outbound.repo.transaction import TransactionFactory
+from service.ports.outbound.wake_up import WakeUpNotifier
+
+# Запуски, которые еще не завершены и не отменены
+UNFINISHED_TASK_RUN_STATUSES = [TaskRunStatus.WAITING, TaskRunStatus.QUEUED, TaskRunStatus.EXECUTION,
+                                TaskRunStatus.INTERRUPTED, TaskRunStatus.TEMP_ERROR]
+# Запуски, которые еще не отправлены на выполнение или будут отправлены повторно
+NOT_SENT_TASK_RUN_STATUSES = [TaskRunStatus.WAITING, TaskRunStatus.INTERRUPTED, TaskRunStatus.TEMP_ERROR]
+
+
+class TasksByFilterUCRq(UCRequest):
+    tasks_filter: TasksFilter
+
+
+class TasksByFilterUCRs(UCResponse):
+    request: TasksByFilterUCRq
+    tasks_count: int = 0
+    task_runs_count: int = 0
+
+
+class AbstractTasksByFilterUC(UseCase):
+    """
+    Массовая смена статуса задач, отобранных фильтром, и статуса их запусков.
+
+    Задачи и запуски обновляются одним запросом без загрузки в приложение, история статусов
+    запусков записывается в той же транзакции.
+    """
+
+    def __init__(self,
+                 task_status_bulk_updater: TaskStatusBulkUpdater,
+                 task_run_status_log_repo: Repo[TaskRunStatusLog, TaskRunStatusLog, TaskRunStatusLogPK],
+                 transaction_factory: TransactionFactory,
+                 wake_up_notifier: Optional[WakeUpNotifier] = None, ):
+        self._task_status_bulk_updater = task_status_bulk_updater
+        self._task_run_status_log_repo = task_run_status_log_repo
+        self._transaction_factory = transaction_factory
+        self._wake_up_notifier = wake_up_notifier
+
+    @property
+    @abstractmethod
+    def from_statuses(self) -> List[TaskStatus]:
+        pass
+
+    @property
+    @abstractmethod
+    def to_status(self) -> TaskStatus:
+        pass
+
+    @property
+    @abstractmethod
+    def task_run_from_statuses(self) -> List[TaskRunStatus]:
+        pass
+
+    @property
+    @abstractmethod
+    def task_run_to_status(self) -> TaskRunStatus:
+        pass
+
+    async def apply(self, request: TasksByFilterUCRq) -> TasksByFilterUCRs:
+        if request.tasks_filter.is_empty:
+            return TasksByFilterUCRs(success=False, request=request,
+                                     error="Tasks filter must contain at least one condition")
+        status_updated_at = datetime.now(timezone.utc)
+        async with self._transaction_factory.create() as transaction:
+            bulk_update = await self._task_status_bulk_updater.update_by_filter(request.tasks_filter,
+                                                                                self.from_statuses,
+                                                                                self.to_status,
+                                                                                self.task_run_from_statuses,
+                                                                                self.task_run_to_status,
+                                                                                status_updated_at,
+                                                                                transaction)
+            await self._task_run_status_log_repo.create_all([TaskRunStatusLog(task_run_id=task_run_id,
+                                                                               status_updated_at=status_updated_at,
+                                                                               status=self.task_run_to_status)
+                                                             for task_run_id in bulk_update.task_runs_ids],
+                                                            transaction)
+        await self._after_commit(bulk_update)
+        return TasksByFilterUCRs(success=True, request=request,
+                                 tasks_count=bulk_update.tasks_count,
+                                 task_runs_count=len(bulk_update.task_runs_ids))
+
+    async def _after_commit(self, bulk_update: TasksStatusBulkUpdate):
+        pass
+
+
+class CancelTasksByFilterUC(AbstractTasksByFilterUC):
+    """ Отменяет задачи и все их незавершенные запуски; исполнителям уже отправленных запусков уходит CANCEL """
+
+    def __init__(self,
+                 task_status_bulk_updater: TaskStatusBulkUpdater,
+                 task_run_status_log_repo: Repo[TaskRunStatusLog, TaskRunStatusLog, TaskRunStatusLogPK],
+                 transaction_factory: TransactionFactory,
+                 task_run_repo: Optional[Repo[TaskRun, TaskRun, TaskRunPK]] = None,
+                 send_cancel_commands_uc: Optional[SendCancelCommandsUC] = None, ):
+        super().__init__(task_status_bulk_updater, task_run_status_log_repo, transaction_factory)
+        self._task_run_repo = task_run_repo
+        self._send_cancel_commands_uc = send_cancel_commands_uc
+
+    @property
+    def from_statuses(self) -> List[TaskStatus]:
+        return [TaskStatus.NEW, TaskStatus.EXECUTION, TaskStatus.SUCCEED, TaskStatus.PAUSED]
+
+    @property
+    def to_status(self) -> TaskStatus:
+        return TaskStatus.CANCELLED
+
+    @property
+    def task_run_from_statuses(self) -> List[TaskRunStatus]:
+        return UNFINISHED_TASK_RUN_STATUSES
+
+    @property
+    def task_run_to_status(self) -> TaskRunStatus:
+        return TaskRunStatus.CANCELLED
+
+    async def _after_commit(self, bulk_update: TasksStatusBulkUpdate):
+        if not self._send_cancel_commands_uc or not self._task_run_repo:
+            return
+        in_flight_task_runs_ids = [task_run_id
+                                   for task_run_id, previous_status in zip(bulk_update.task_runs_ids,
+                                                                           bulk_update.task_runs_previous_statuses)
+                                   if previous_status in IN_FLIGHT_TASK_RUN_STATUSES]
+        if not in_flight_task_runs_ids:
+            return
+        in_flight_task_runs = await self._task_run_repo.filter(FilterFieldsDNF.single('id',
+                                                                                      in_flight_task_runs_ids,
+                                                                                      ConditionOperation.IN))
+        await self._send_cancel_commands_uc.apply(SendCancelCommandsUCRq(task_runs=in_flight_task_runs))
+
+
+class PauseTasksByFilterUC(AbstractTasksByFilterUC):
+    """ Приостанавливает задачи: неотправленные запуски отменяются, отправленные выполняются до конца """
+
+    @property
+    def from_statuses(self) -> List[TaskStatus]:
+        return [TaskStatus.NEW, TaskStatus.EXECUTION, TaskStatus.SUCCEED]
+
+    @property
+    def to_status(self) -> TaskStatus:
+        return TaskStatus.PAUSED
+
+    @property
+    def task_run_from_statuses(self) -> List[TaskRunStatus]:
+        return NOT_SENT_TASK_RUN_STATUSES
+
+    @property
+    def task_run_to_status(self) -> TaskRunStatus:
+        return TaskRunStatus.CANCELLED
+
+
+class ResumeTasksByFilterUC(AbstractTasksByFilterUC):
+    """ Возобновляет отмененные и приостановленные задачи, их отмененные запуски снова ожидают отправки """
+
+    @property
+    def from_statuses(self) -> List[TaskStatus]:
+        return [TaskStatus.CANCELLED, TaskStatus.PAUSED]
+
+    @property
+    def to_status(self) -> TaskStatus:
+        return TaskStatus.EXECUTION
+
+    @property
+    def task_run_from_statuses(self) -> List[TaskRunStatus]:
+        return [TaskRunStatus.CANCELLED]
+
+    @property
+    def task_run_to_status(self) -> TaskRunStatus:
+        return TaskRunStatus.WAITING
+
+    async def _after_commit(self, bulk_update: TasksStatusBulkUpdate):
+        if self._wake_up_notifier and bulk_update.task_runs_group_names:
+            await self._wake_up_notifier.notify(bulk_update.task_runs_group_names)
@@ -3,6 +3,7 @@ from typing import Optional, Dict
 from service.domain.schemas.payload import Payload, PayloadPK, PayloadBody
 from service.domain.services.uniqueness_payload_checker import UniquenessPayloadChecker
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
+from service.ports.outbound.cache import CacheInvalidator, ReferenceCacheName
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import UpdateFields
 
@@ -20,9 +21,12 @@ class UpdatePayloadUCRs(UCResponse):
 class UpdatePayloadUC(UseCase):
     def __init__(self, payload_repo: Repo[Payload, Payload, PayloadPK],
                  uniqueness_payload_checker: UniquenessPayloadChecker,
+                 cache_invalidator: Optional[CacheInvalidator] = None,
                  ):
         self._payload_repo = payload_repo
         self._uniqueness_payload_checker = uniqueness_payload_checker
+        self._cache_invalidator = cache_invalidator
+
     async def apply(self, request: UpdatePayloadUCRq) -> UpdatePayloadUCRs:
         payload_body = PayloadBody(data=request.payload_data)
         check_response = await self._uniqueness_payload_checker.check([payload_body])
@@ -41,4 +45,6 @@ class UpdatePayloadUC(UseCase):
                                                           ))
         if not updated_payload:
             return UpdatePayloadUCRs(success=False, error="Not found", request=request)
+        if self._cache_invalidator:
+            await self._cache_invalidator.invalidate(ReferenceCacheName.PAYLOAD)
         return UpdatePayloadUCRs(success=True, request=request, payload=updated_payload)
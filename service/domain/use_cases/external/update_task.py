@@ -35,6 +35,8 @@ class UpdateTaskUC(UseCase):
             updates['priority'] = request.priority
         if request.monitoring_algorithm_id is not None and request.monitoring_algorithm_id != existing.monitoring_algorithm_id:
             updates['monitoring_algorithm_id'] = request.monitoring_algorithm_id
+            # Период, подобранный под прежний алгоритм, к новому не относится
+            updates['adaptive_timeout'] = None
         if request.execution_arguments is not None:
             updates['execution_arguments'] = request.execution_arguments
 
@@ -22,6 +22,7 @@ from service.ports.outbound.repo.fields import UpdateFields, FilterFieldsDNF, Co
 from service.ports.outbound.repo.monitoring_algorithm import TaskToExecuteProviderRegistry
 from service.ports.outbound.repo.task_run import LatestTaskRunTimeIntervalExecutionBoundsProvider
 from service.ports.outbound.repo.transaction import TransactionFactory
+from service.ports.outbound.wake_up import WakeUpNotifier
 
 
 class CreateTaskRunsUCRq(UCRequest):
@@ -85,6 +86,17 @@ class TimeIntervalTaskRunBuilder:
 
     Если задан time_interval_max_period и интервал его превышает —
     делит на равные отрезки.
+
+    Если задан time_interval_min_period — интервал короче него не создается
+    (откладывается до следующих проходов), а отрезки разбиения не делаются меньше него.
+    Если задан time_interval_max_runs_per_tick — за проход создаются только самые ранние
+    отрезки; следующий проход продолжит с правой границы последнего из них.
+
+    Запуски, правая граница которых меньше текущего момента, помечаются как ретро (is_retro):
+    они догоняют историю и отправляются в низкоприоритетной полосе.
+
+    Если задан time_interval_freshness_sla — запуску назначается крайний срок
+    deadline_at = right_bound_at + SLA, по которому упорядочивается отправка.
     """
 
     def build(
@@ -108,12 +120,22 @@ class TimeIntervalTaskRunBuilder:
             return []
 
         interval = TimeInterval(left_bound_at=left, right_bound_at=right)
+        min_period = group.time_interval_min_period  # секунды или None
+        if min_period is not None and interval.duration_seconds < min_period:
+            return []
+
         max_period = group.time_interval_max_period  # секунды или None
+        if max_period is not None and min_period is not None:
+            max_period = max(max_period, min_period)
 
         if max_period is None or interval.duration_seconds <= max_period:
             return [interval]
 
-        return self._split(interval, max_period)
+        intervals = self._split(interval, max_period, min_period)
+        max_runs_per_tick = group.time_interval_max_runs_per_tick
+        if max_runs_per_tick:
+            intervals = intervals[:max_runs_per_tick]
+        return intervals
 
     @staticmethod
     def _first_left_bound(group: TaskGroup, now: datetime) -> datetime:
@@ -128,9 +150,12 @@ class TimeIntervalTaskRunBuilder:
         return now - timedelta(seconds=depth)
 
     @staticmethod
-    def _split(interval: TimeInterval, max_period_seconds: float) -> List[TimeInterval]:
-        """Делит интервал на отрезки длиной не более max_period_seconds."""
+    def _split(interval: TimeInterval, max_period_seconds: float,
+               min_period_seconds: Optional[float] = None) -> List[TimeInterval]:
+        """Делит интервал на отрезки длиной не более max_period_seconds и не менее min_period_seconds."""
         runs_number = int(interval.duration_seconds // max_period_seconds) + 1
+        if min_period_seconds:
+            runs_number = max(1, min(runs_number, int(interval.duration_seconds // min_period_seconds)))
         step = timedelta(seconds=interval.duration_seconds / runs_number)
 
         result: List[TimeInterval] = []
@@ -152,6 +177,7 @@ class TimeIntervalTaskRunBuilder:
         last_bounds: Optional[TaskRunTimeIntervalExecutionBounds],
     ) -> List[TaskRun]:
         intervals = self.build(task, group, payload, now, last_bounds)
+        freshness_sla = group.time_interval_freshness_sla
         return [
             TaskRun(
                 task_id=task.id,
@@ -164,6 +190,9 @@ class TimeIntervalTaskRunBuilder:
                     right_bound_at=iv.right_bound_at,
                 ),
                 execution_arguments=task.execution_arguments,
+                is_retro=iv.right_bound_at < now,
+                deadline_at=(iv.right_bound_at + timedelta(seconds=freshness_sla)
+                             if freshness_sla is not None else None),
                 status=TaskRunStatus.WAITING,
                 status_updated_at=now,
             )
@@ -194,6 +223,7 @@ class CreateTaskRunsUC(UseCase):
         task_group_repo:                              Repo[TaskGroup, TaskGroup, TaskGroupPK],
         latest_task_run_time_interval_execution_bounds_provider: LatestTaskRunTimeIntervalExecutionBoundsProvider,
         tasks_batch_size:                             int = 5000,
+        wake_up_notifier:                             Optional[WakeUpNotifier] = None,
     ):
         self._task_repo                                    = task_repo
         self._task_run_repo                                = task_run_repo
@@ -206,6 +236,7 @@ class CreateTaskRunsUC(UseCase):
         self._task_group_repo                              = task_group_repo
         self._latest_task_run_time_interval_execution_bounds_provider = latest_task_run_time_interval_execution_bounds_provider
         self._tasks_batch_size                             = tasks_batch_size
+        self._wake_up_notifier                             = wake_up_notifier
 
         self._undefined_builder     = UndefinedTaskRunBuilder()
         self._time_interval_builder = TimeIntervalTaskRunBuilder()
@@ -216,16 +247,21 @@ class CreateTaskRunsUC(UseCase):
             return CreateTaskRunsUCRs(success=True, request=request, task_runs_created=0)
 
         total_created = 0
+        group_names = set()
         async with self._transaction_factory.create() as transaction:
             for chunk in batched(tasks, self._tasks_batch_size):
                 chunk = list(chunk)
-                created = await self._process_chunk(chunk, transaction)
-                total_created += created
+                task_runs_created = await self._process_chunk(chunk, transaction)
+                total_created += len(task_runs_created)
+                group_names.update(task_run.group_name for task_run in task_runs_created)
 
+        # Уведомление отправляется после коммита, чтобы диспетчер увидел созданные запуски
+        if self._wake_up_notifier and group_names:
+            await self._wake_up_notifier.notify(group_names)
         logger.info(f"CreateTaskRunsUC: создано {total_created} запусков")
         return CreateTaskRunsUCRs(success=True, request=request, task_runs_created=total_created)
 
-    async def _process_chunk(self, tasks: List[Task], transaction) -> int:
+    async def _process_chunk(self, tasks: List[Task], transaction) -> List[TaskRun]:
         now = datetime.now(timezone.utc)
 
         # ── 1. Загружаем группы и payload батчем ─────────────────────────────
@@ -270,7 +306,7 @@ class CreateTaskRunsUC(UseCase):
                 all_task_runs.extend(runs)
 
         if not all_task_runs:
-            return 0
+            return []
 
         # ── 4. Сохраняем всё в одной транзакции ──────────────────────────────
         task_ids_with_runs = {run.task_id for run in all_task_runs}
@@ -316,7 +352,7 @@ class CreateTaskRunsUC(UseCase):
                 bounds_to_save, transaction=transaction
             )
 
-        return len(task_runs_created)
+        return task_runs_created
 
     async def _load_last_bounds(
         self,
@@ -1,14 +1,25 @@
-from typing import List
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import List, Dict, Any, Optional, Hashable, TypeVar, Tuple
 
 from service.domain.schemas.command import CommandResponse
+from service.domain.schemas.enums import CommandType, TaskRunStatus
+from service.domain.schemas.task_group import TaskGroup, TaskGroupPK
 from service.domain.schemas.task_progress import TimeIntervalTaskProgress, TimeIntervalTaskProgressPK
 
 from service.domain.schemas.task_run import TaskRunPK, TaskRun, TaskRunStatusLog, TaskRunStatusLogPK, \
     TaskRunTimeIntervalProgress, TaskRunTimeIntervalProgressPK
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
+from service.ports.common.exceptions import PoisonMessageError
+from service.ports.common.logs import logger
 from service.ports.outbound.repo.abstract import Repo
-from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields
+from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields, ConditionOperation
+from service.ports.outbound.repo.task_run import TaskRunRepo
 from service.ports.outbound.repo.transaction import TransactionFactory
+from service.ports.outbound.spool import Spool
 
 
 class ReceiveTaskRunExecutionStatusUCRq(UCRequest):
@@ -19,51 +30,410 @@ class ReceiveTaskRunExecutionStatusUCRs(UCResponse):
     request: ReceiveTaskRunExecutionStatusUCRq
 
 
+CANCEL_ACKNOWLEDGED_DESCRIPTION = "Cancel acknowledged by executor"
+
+TProgress = TypeVar('TProgress', TimeIntervalTaskProgress, TaskRunTimeIntervalProgress)
+
+
+def merge_adjacent_progresses(progresses: List[TProgress], key: str) -> List[TProgress]:
+    """
+    Объединяет пересекающиеся и смежные интервалы прогресса с одинаковым key: границы расширяются,
+    объемы данных суммируются. Интервалы с разрывом и без левой границы остаются отдельными
+    """
+    progresses_by_key: Dict[Hashable, List[TProgress]] = defaultdict(list)
+    for progress in progresses:
+        progresses_by_key[getattr(progress, key)].append(progress)
+    merged = []
+    for key_progresses in progresses_by_key.values():
+        current = None
+        key_progresses.sort(key=lambda p: (p.left_bound_at is None, p.left_bound_at, p.right_bound_at))
+        for progress in key_progresses:
+            if current is not None and current.left_bound_at is not None and progress.left_bound_at is not None \
+                    and progress.left_bound_at <= current.right_bound_at:
+                current = current.model_copy(update={
+                    'right_bound_at': max(current.right_bound_at, progress.right_bound_at),
+                    'collected_data_amount': current.collected_data_amount + progress.collected_data_amount,
+                    'saved_data_amount': current.saved_data_amount + progress.saved_data_amount,
+                })
+                continue
+            if current is not None:
+                merged.append(current)
+            current = progress
+        merged.append(current)
+    return merged
+
+
+@dataclass
+class StatusIntakeMetrics:
+    buffered: int  # Ответов в накопителе, ожидающих выгрузки
+    uploading: int  # Ответов в выгружаемой сейчас пачке
+    max_buffered: Optional[int]
+    uploads_count: int
+    failed_uploads_count: int
+    last_upload_size: int
+    last_upload_duration_s: float
+    max_upload_duration_s: float
+    backpressure_waits_count: int  # Сколько раз прием ответов ждал освобождения места
+    coalesced_count: int  # Heartbeat-ответов, замененных более новым heartbeat того же запуска
+    rejected_count: int  # Ответов, которые не удалось записать даже отдельно от пачки
+    quarantined_count: int  # Записей журнала, отложенных в карантин
+
+
+@dataclass
+class _UploadIsolation:
+    """ Ход выгрузки пачки по частям """
+    max_failures: int  # Сколько частей может упасть подряд, пока не записана ни одна, прежде чем ошибка считается общей
+    failures_count: int = 0
+    uploaded_count: int = 0
+    rejected: List[Tuple[CommandResponse, BaseException]] = field(default_factory=list)
+
+
 class ReceiveTaskRunExecutionStatusUC(UseCase):
+    """
+    Принимает статусы выполнения запусков от исполнителей.
+
+    Ответ на команду CANCEL подтверждает, что исполнитель прекратил выполнение запуска: запуск
+    фиксируется в статусе CANCELLED. Статусы по команде EXECUTE, пришедшие для уже отмененного запуска,
+    пишутся только в историю и не возвращают запуск в работу.
+
+    Статус EXECUTION и heartbeat-ответы продлевают аренду выполнения запуска на длительность,
+    заданную группой задач (или default_execution_lease_s); heartbeat не меняет статус и не пишется в историю.
+
+    Запуски ответов пачки загружаются из БД одним запросом: ответ на сокращенную команду содержит только
+    task_run_id, а ответ для запуска, которого нет в БД (например, удаленного очисткой), пропускается.
+
+    Если пачку не удается записать, она делится пополам и части выгружаются отдельными транзакциями, пока
+    упавшие части не сократятся до одного ответа: такие ответы отклоняются (apply пробрасывает
+    PoisonMessageError), а остальная пачка записывается. Если не записалась ни одна часть, ошибка считается
+    общей (например, недоступна БД) и пробрасывается для всей пачки. Ответ, выгружаемый в одиночку,
+    отклонить нельзя: его ошибка неотличима от общей.
+
+    Ответы одного запуска могут прийти не по порядку (несколько потребителей одной очереди): внутри пачки
+    статус запуска берется из ответа с наибольшим created_at, а между пачками порядок держит сам UPDATE —
+    статус не заменяется более старым, аренда только продлевается (update_execution_states). История
+    пишется полностью.
+
+    С wait_upload apply завершается только после коммита пачки, в которую попал ответ, и пробрасывает
+    ошибку записи: потребитель подтверждает сообщение брокеру, когда ответ уже сохранен в БД.
+
+    Ответы копятся в двух буферах: пока одна пачка выгружается, прием продолжается в новую.
+    Пачка выгружается по таймеру (upload_command_responses из PeriodicRunner) и, если задан
+    upload_batch_size, сразу по набору размера. При max_buffered ответов в обоих буферах apply ждет
+    окончания выгрузки — потребитель перестает подтверждать сообщения и брокер приостанавливает доставку.
+
+    Ответы запуска схлопываются до записи: в накопителе хранится только последний heartbeat запуска,
+    запуск обновляется одной строкой с итоговым состоянием, а смежные интервалы прогресса
+    объединяются; история статусов пишется полностью.
+
+    Со spool каждый ответ до завершения apply записывается в локальный журнал: потребитель может
+    подтвердить сообщение, не дожидаясь коммита. При выгрузке текущий сегмент журнала закрывается вместе
+    с пачкой и удаляется после ее коммита; пачка, которую не удалось записать, возвращается в накопитель
+    и остается в журнале до следующей выгрузки. replay_spool при старте загружает в накопитель ответы
+    из сегментов, оставшихся от прошлого запуска процесса.
+
+    Чтобы одна незаписываемая пачка не держала накопитель заполненным (и прием статусов — остановленным),
+    журнал откладывает в карантин (Spool.quarantine): отклоненные ответы, нечитаемые при replay_spool записи
+    и пачку, не выгруженную max_upload_attempts раз подряд. Карантин остается на диске для разбора,
+    а остальные ответы продолжают выгружаться.
+    """
+
     def __init__(self,
-                 task_run_repo: Repo[TaskRun, TaskRun, TaskRunPK],
+                 task_run_repo: TaskRunRepo,
                  task_run_status_log_repo: Repo[TaskRunStatusLog, TaskRunStatusLog, TaskRunStatusLogPK],
                  time_interval_task_progress_repo: Repo[TimeIntervalTaskProgress, TimeIntervalTaskProgress, TimeIntervalTaskProgressPK],
                  task_run_time_interval_progress_repo: Repo[TaskRunTimeIntervalProgress,TaskRunTimeIntervalProgress,TaskRunTimeIntervalProgressPK],
                  transaction_factory: TransactionFactory,
-                 instant_upload: bool = True,):
+                 instant_upload: bool = True,
+                 task_group_repo: Optional[Repo[TaskGroup, TaskGroup, TaskGroupPK]] = None,
+                 default_execution_lease_s: float = 300,
+                 wait_upload: bool = False,
+                 upload_batch_size: Optional[int] = None,
+                 max_buffered: Optional[int] = None,
+                 spool: Optional[Spool] = None,
+                 max_upload_attempts: Optional[int] = None, ):
         self._task_run_repo = task_run_repo
         self._task_run_status_log_repo = task_run_status_log_repo
         self._time_interval_task_progress_repo = time_interval_task_progress_repo
         self._task_run_time_interval_progress_repo = task_run_time_interval_progress_repo
         self._transaction_factory = transaction_factory
+        self._task_group_repo = task_group_repo
+        self._default_execution_lease_s = default_execution_lease_s
 
         # FIXME: быстрое решение для предотвращения вставки малого количества статусов в БД (забирают все соединения)
         self._accumulated_command_responses: List[CommandResponse] = []
+        # Позиция последнего heartbeat запуска в накопителе: новый heartbeat заменяет его
+        self._heartbeat_index_by_task_run_id: Dict[int, int] = {}
         self._instant_upload = instant_upload
+        self._wait_upload = wait_upload
+        # Ожидание коммита накопленной пачки; создается первым ожидающим ответом
+        self._upload_waiter: Optional[asyncio.Future] = None
+        self._upload_batch_size = upload_batch_size
+        self._max_buffered = max_buffered
+        # Выгрузки идут по одной: следующая пачка забирается из накопителя после коммита предыдущей
+        self._upload_lock = asyncio.Lock()
+        self._upload_task: Optional[asyncio.Task] = None
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self._spool = spool
+        # Закрытые сегменты журнала, ответы которых лежат в накопителе
+        self._spooled_segments: List[str] = []
+        self._max_upload_attempts = max_upload_attempts
+        # Неудачных выгрузок подряд с возвратом пачки в накопитель
+        self._failed_attempts_count = 0
+
+        self._uploading = 0
+        self._uploads_count = 0
+        self._failed_uploads_count = 0
+        self._last_upload_size = 0
+        self._last_upload_duration_s = 0.0
+        self._max_upload_duration_s = 0.0
+        self._backpressure_waits_count = 0
+        self._coalesced_count = 0
+        self._rejected_count = 0
+        self._quarantined_count = 0
+
+    @property
+    def metrics(self) -> StatusIntakeMetrics:
+        return StatusIntakeMetrics(buffered=len(self._accumulated_command_responses),
+                                   uploading=self._uploading,
+                                   max_buffered=self._max_buffered,
+                                   uploads_count=self._uploads_count,
+                                   failed_uploads_count=self._failed_uploads_count,
+                                   last_upload_size=self._last_upload_size,
+                                   last_upload_duration_s=self._last_upload_duration_s,
+                                   max_upload_duration_s=self._max_upload_duration_s,
+                                   backpressure_waits_count=self._backpressure_waits_count,
+                                   coalesced_count=self._coalesced_count,
+                                   rejected_count=self._rejected_count,
+                                   quarantined_count=self._quarantined_count, )
 
-    async def upload_command_responses(self):
-        accumulated_command_responses= self._accumulated_command_responses
-        self._accumulated_command_responses = []
+    @property
+    def _buffered_count(self) -> int:
+        return len(self._accumulated_command_responses) + self._uploading
 
-        update_fields_by_task_run_pk = {}
+    async def upload_command_responses(self) -> List[Tuple[CommandResponse, BaseException]]:
+        """ Выгружает накопленную пачку; возвращает отклоненные ответы с ошибками их записи """
+        async with self._upload_lock:
+            accumulated_command_responses = self._accumulated_command_responses
+            self._accumulated_command_responses = []
+            self._heartbeat_index_by_task_run_id = {}
+            upload_waiter, self._upload_waiter = self._upload_waiter, None
+
+            if not accumulated_command_responses:
+                return []
+            self._uploading = len(accumulated_command_responses)
+            started_at = time.monotonic()
+            spooled_segments = []
+            try:
+                if self._spool is not None:
+                    # Сегмент закрывается до первого переключения, вместе с заменой накопителя
+                    spooled_segments, self._spooled_segments = self._spooled_segments, []
+                    spooled_segments = spooled_segments + await self._spool.seal()
+                rejected = await self._upload_isolating(accumulated_command_responses)
+            except BaseException as e:
+                self._failed_uploads_count += 1
+                if self._spool is not None:
+                    await self._keep_failed_batch(accumulated_command_responses, spooled_segments, e)
+                if upload_waiter is not None:
+                    upload_waiter.set_exception(e)
+                raise
+            else:
+                self._rejected_count += len(rejected)
+                for command_response, error in rejected:
+                    logger.error(f"rejected status of task run {command_response.task_run_id}: "
+                                 f"{error.__class__.__name__}: {error}")
+                if upload_waiter is not None:
+                    upload_waiter.set_result(rejected)
+                self._failed_attempts_count = 0
+                is_rejected_kept = not rejected or self._spool is None \
+                    or await self._quarantine([command_response for command_response, _ in rejected])
+                # Если карантин не записался, сегменты остаются: отклоненные ответы повторятся при следующем запуске
+                if spooled_segments and is_rejected_kept:
+                    await self._truncate_spool(spooled_segments)
+                return rejected
+            finally:
+                self._uploading = 0
+                self._uploads_count += 1
+                self._last_upload_size = len(accumulated_command_responses)
+                self._last_upload_duration_s = time.monotonic() - started_at
+                self._max_upload_duration_s = max(self._max_upload_duration_s, self._last_upload_duration_s)
+                if not self._is_full():
+                    self._has_room.set()
+
+    def _restore(self, command_responses: List[CommandResponse], spooled_segments: List[str]):
+        """ Возвращает невыгруженную пачку в начало накопителя вместе с ее сегментами журнала """
+        self._accumulated_command_responses = command_responses + self._accumulated_command_responses
+        self._spooled_segments = spooled_segments + self._spooled_segments
+        self._heartbeat_index_by_task_run_id = {
+            command_response.task_run_id: index
+            for index, command_response in enumerate(self._accumulated_command_responses)
+            if command_response.is_heartbeat
+        }
+
+    async def _keep_failed_batch(self, command_responses: List[CommandResponse], spooled_segments: List[str],
+                                 error: BaseException):
+        """ Возвращает невыгруженную пачку в накопитель, а после max_upload_attempts неудач подряд — в карантин """
+        self._failed_attempts_count += 1
+        is_exhausted = isinstance(error, Exception) and self._max_upload_attempts is not None \
+            and self._failed_attempts_count >= self._max_upload_attempts
+        if is_exhausted and await self._quarantine(command_responses):
+            self._failed_attempts_count = 0
+            await self._truncate_spool(spooled_segments)
+            return
+        self._restore(command_responses, spooled_segments)
+
+    async def _quarantine(self, command_responses: List[CommandResponse]) -> bool:
+        return await self._quarantine_records([command_response.model_dump_json().encode('utf-8')
+                                               for command_response in command_responses])
+
+    async def _quarantine_records(self, records: List[bytes]) -> bool:
+        try:
+            segment = await self._spool.quarantine(records)
+        except Exception as e:
+            logger.error(f"failed to quarantine {len(records)} task run status(es): {e.__class__.__name__}: {e}")
+            return False
+        self._quarantined_count += len(records)
+        logger.error(f"quarantined {len(records)} task run status(es) to status spool segment {segment}")
+        return True
+
+    async def _truncate_spool(self, segments: List[str]):
+        try:
+            await self._spool.truncate(segments)
+        except Exception as e:
+            # Ответы уже в БД: оставшийся сегмент только повторит их при следующем запуске
+            logger.error(f"failed to truncate status spool segments {segments}: {e.__class__.__name__}: {e}")
+
+    async def replay_spool(self):
+        """ Загружает в накопитель ответы из сегментов журнала, оставшихся от прошлого запуска, и выгружает их """
+        if self._spool is None:
+            return
+        segments = self._spool.get_recovered_segments()
+        if not segments:
+            return
+        replayed_count = 0
+        undecodable_records = []
+        for segment in segments:
+            for record in await self._spool.read(segment):
+                try:
+                    command_response = CommandResponse.model_validate_json(record)
+                except ValueError as e:
+                    logger.error(f"spool segment {segment}: failed to decode task run status: {e}")
+                    undecodable_records.append(record)
+                    continue
+                if not self._coalesce_heartbeat(command_response):
+                    self._accumulated_command_responses.append(command_response)
+                replayed_count += 1
+        if undecodable_records:
+            await self._quarantine_records(undecodable_records)
+        self._spooled_segments.extend(segments)
+        logger.info(f"replayed {replayed_count} task run status(es) from {len(segments)} spool segment(s)")
+        try:
+            await self.upload_command_responses()
+        except Exception as e:
+            # Ответы остаются в накопителе и журнале, выгрузка повторится по таймеру
+            logger.error(f"failed to upload replayed task run statuses: {e.__class__.__name__}: {e}")
+
+    def _is_full(self) -> bool:
+        return self._max_buffered is not None and self._buffered_count >= self._max_buffered
+
+    def _is_upload_needed(self) -> bool:
+        is_batch_full = self._upload_batch_size is not None \
+            and len(self._accumulated_command_responses) >= self._upload_batch_size
+        return is_batch_full or self._is_full()
+
+    def _schedule_upload(self):
+        if self._upload_task is None or self._upload_task.done():
+            self._upload_task = asyncio.create_task(self._upload_while_needed())
+
+    async def _upload_while_needed(self):
+        try:
+            while self._is_upload_needed():
+                await self.upload_command_responses()
+        except BaseException as e:
+            logger.error(f"failed to upload received task run statuses: {e.__class__.__name__}: {e}")
+
+    async def _upload_isolating(self,
+                                command_responses: List[CommandResponse]) -> List[Tuple[CommandResponse, BaseException]]:
+        """ Выгружает пачку, при ошибке — по частям; возвращает ответы, не записанные даже поодиночке """
+        try:
+            await self._upload(command_responses)
+            return []
+        except Exception as e:
+            if len(command_responses) == 1:
+                raise
+            error = e
+        # Спуск к одному ответу падает не больше bit_length раз; вдвое больше падений без единой записи — общая ошибка
+        isolation = _UploadIsolation(max_failures=2 * len(command_responses).bit_length())
+        await self._upload_halves(command_responses, isolation)
+        if not isolation.uploaded_count:
+            raise error
+        return isolation.rejected
+
+    async def _upload_halves(self, command_responses: List[CommandResponse], isolation: _UploadIsolation):
+        middle = len(command_responses) // 2
+        for part in (command_responses[:middle], command_responses[middle:]):
+            try:
+                await self._upload(part)
+            except Exception as e:
+                isolation.failures_count += 1
+                if not isolation.uploaded_count and isolation.failures_count >= isolation.max_failures:
+                    raise
+                if len(part) == 1:
+                    isolation.rejected.append((part[0], e))
+                else:
+                    await self._upload_halves(part, isolation)
+            else:
+                isolation.uploaded_count += len(part)
+
+    async def _upload(self, accumulated_command_responses: List[CommandResponse]):
+        task_run_by_id = await self._get_task_runs(accumulated_command_responses)
+        execution_lease_s_by_group_name = await self._get_execution_lease_s_by_group_name(
+            accumulated_command_responses)
+
+        update_values_by_task_run_pk: Dict[TaskRunPK, Dict[str, Any]] = {}
         task_run_status_logs = []
         task_progresses = []
         task_run_progresses = []
         for command_response in accumulated_command_responses:
-            update_fields_by_task_run_pk[TaskRunPK(id=command_response.command.task_run.id)] = UpdateFields.multiple({
-                "status": command_response.status,
-                "status_updated_at": command_response.created_at,
-            })
-            task_run_status_log = TaskRunStatusLog(task_run_id=command_response.command.task_run.id,
-                                                   status_updated_at=command_response.created_at,
-                                                   status=command_response.status,
-                                                   description=command_response.description, )
-            task_run_status_logs.append(task_run_status_log)
+            task_run_id = command_response.task_run_id
+            task_run = task_run_by_id.get(task_run_id)
+            if task_run is None:
+                logger.warning(f"got command response for unknown task run {task_run_id}")
+                continue
+            status = command_response.status
+            description = command_response.description
+            if command_response.command_type == CommandType.CANCEL:
+                status = TaskRunStatus.CANCELLED
+                description = description or CANCEL_ACKNOWLEDGED_DESCRIPTION
+            is_cancelled = command_response.command_type == CommandType.EXECUTE \
+                and task_run.status == TaskRunStatus.CANCELLED
+            update_values = update_values_by_task_run_pk.setdefault(TaskRunPK(id=task_run_id), {})
+            if not is_cancelled and (command_response.is_heartbeat or status == TaskRunStatus.EXECUTION):
+                execution_lease_s = execution_lease_s_by_group_name.get(task_run.group_name,
+                                                                        self._default_execution_lease_s)
+                lease_expires_at = command_response.created_at + timedelta(seconds=execution_lease_s)
+                update_values["lease_expires_at"] = max(update_values.get("lease_expires_at", lease_expires_at),
+                                                        lease_expires_at)
+            is_latest = command_response.created_at >= update_values.get("status_updated_at",
+                                                                         command_response.created_at)
+            if not is_cancelled and not command_response.is_heartbeat and is_latest:
+                update_values["status"] = status
+                update_values["status_updated_at"] = command_response.created_at
+            if not command_response.is_heartbeat:
+                task_run_status_log = TaskRunStatusLog(task_run_id=task_run_id,
+                                                       status_updated_at=command_response.created_at,
+                                                       status=status,
+                                                       description=description, )
+                task_run_status_logs.append(task_run_status_log)
             if command_response.result:
-                task_progress = TimeIntervalTaskProgress(task_id=command_response.command.task_run.task_id,
+                task_progress = TimeIntervalTaskProgress(task_id=task_run.task_id,
                                                          right_bound_at=command_response.result.right_bound_at,
                                                          left_bound_at=command_response.result.left_bound_at,
                                                          collected_data_amount=command_response.result.collected_data_amount,
                                                          saved_data_amount=command_response.result.saved_data_amount,
                                                          )
                 task_progresses.append(task_progress)
-                task_run_progress = TaskRunTimeIntervalProgress(task_run_id=command_response.command.task_run.id,
+                task_run_progress = TaskRunTimeIntervalProgress(task_run_id=task_run_id,
                                                          right_bound_at=command_response.result.right_bound_at,
                                                          left_bound_at=command_response.result.left_bound_at,
                                                          collected_data_amount=command_response.result.collected_data_amount,
@@ -71,15 +441,78 @@ class ReceiveTaskRunExecutionStatusUC(UseCase):
                                                          )
                 task_run_progresses.append(task_run_progress)
 
+        update_fields_by_task_run_pk = {task_run_pk: UpdateFields.multiple(update_values)
+                                        for task_run_pk, update_values in update_values_by_task_run_pk.items()
+                                        if update_values}
         async with self._transaction_factory.create() as transaction:
-            await self._task_run_repo.update_all(update_fields_by_task_run_pk, transaction)
+            await self._task_run_repo.update_execution_states(update_fields_by_task_run_pk, transaction)
             await self._task_run_status_log_repo.create_all(task_run_status_logs, transaction)
-            await self._time_interval_task_progress_repo.create_all(task_progresses, transaction)
-            await self._task_run_time_interval_progress_repo.create_all(task_run_progresses, transaction)
+            await self._time_interval_task_progress_repo.create_all(
+                merge_adjacent_progresses(task_progresses, 'task_id'), transaction)
+            await self._task_run_time_interval_progress_repo.create_all(
+                merge_adjacent_progresses(task_run_progresses, 'task_run_id'), transaction)
+
+    async def _get_task_runs(self, command_responses: List[CommandResponse]) -> Dict[int, TaskRun]:
+        task_runs_ids = list({command_response.task_run_id for command_response in command_responses})
+        if not task_runs_ids:
+            return {}
+        task_runs = await self._task_run_repo.filter(FilterFieldsDNF.single('id',
+                                                                            task_runs_ids,
+                                                                            ConditionOperation.IN))
+        return {task_run.id: task_run for task_run in task_runs}
+
+    async def _get_execution_lease_s_by_group_name(self,
+                                                   command_responses: List[CommandResponse]) -> Dict[str, float]:
+        if not self._task_group_repo:
+            return {}
+        if not any(command_response.is_heartbeat or command_response.status == TaskRunStatus.EXECUTION
+                   for command_response in command_responses):
+            return {}
+        task_groups = await self._task_group_repo.get_all()
+        return {task_group.name: task_group.execution_lease_s
+                for task_group in task_groups if task_group.execution_lease_s}
 
     async def apply(self, request: ReceiveTaskRunExecutionStatusUCRq) -> ReceiveTaskRunExecutionStatusUCRs:
         command_response = request.command_response
-        self._accumulated_command_responses.append(command_response)
+        while self._is_full():
+            self._backpressure_waits_count += 1
+            self._has_room.clear()
+            self._schedule_upload()
+            await self._has_room.wait()
+        if not self._coalesce_heartbeat(command_response):
+            self._accumulated_command_responses.append(command_response)
+        if self._spool is not None:
+            # Запись попадает в тот же сегмент, что и пачка накопителя: между ними нет переключения
+            await self._spool.append(command_response.model_dump_json().encode('utf-8'))
         if self._instant_upload:
-            await self.upload_command_responses()
+            self._raise_if_rejected(command_response, await self.upload_command_responses())
+            return ReceiveTaskRunExecutionStatusUCRs(success=True, request=request)
+        if self._is_upload_needed():
+            self._schedule_upload()
+        if self._wait_upload:
+            if self._upload_waiter is None:
+                self._upload_waiter = asyncio.get_running_loop().create_future()
+            # shield: отмена одного ожидающего не должна отменять ожидание остальных
+            self._raise_if_rejected(command_response, await asyncio.shield(self._upload_waiter))
         return ReceiveTaskRunExecutionStatusUCRs(success=True, request=request)
+
+    @staticmethod
+    def _raise_if_rejected(command_response: CommandResponse, rejected: List[Tuple[CommandResponse, BaseException]]):
+        for rejected_command_response, error in rejected:
+            if rejected_command_response is command_response:
+                raise PoisonMessageError(f"status of task run {command_response.task_run_id} "
+                                         f"can not be saved: {error.__class__.__name__}: {error}") from error
+
+    def _coalesce_heartbeat(self, command_response: CommandResponse) -> bool:
+        """ Заменяет heartbeat запуска в накопителе более новым; True, если ответ уже учтен в накопителе """
+        if not command_response.is_heartbeat:
+            return False
+        index = self._heartbeat_index_by_task_run_id.get(command_response.task_run_id)
+        if index is None:
+            self._heartbeat_index_by_task_run_id[command_response.task_run_id] = \
+                len(self._accumulated_command_responses)
+            return False
+        if command_response.created_at > self._accumulated_command_responses[index].created_at:
+            self._accumulated_command_responses[index] = command_response
+        self._coalesced_count += 1
+        return True
@@ -1,10 +1,11 @@
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 
 from service.domain.schemas.enums import TaskRunStatus
 from service.domain.schemas.task_group import TaskGroup, TaskGroupPK
 from service.domain.schemas.task_run import TaskRunPK, TaskRun, TaskRunStatusLog, TaskRunStatusLogPK
 from service.domain.services.balancing_algorithm.abstract import BalancingAlgorithm
+from service.domain.services.circuit_breaker import TaskGroupCircuitBreaker
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields, PaginationQuery
@@ -29,6 +30,7 @@ class RetrieveWaitingTaskRunsUC(UseCase):
                  transaction_factory: TransactionFactory,
                  waiting_task_run_provider: WaitingTaskRunProvider,
                  balancing_algorithm: BalancingAlgorithm,
+                 circuit_breaker: Optional[TaskGroupCircuitBreaker] = None,
                  ):
         self._task_group_repo = task_group_repo
         self._task_run_repo = task_run_repo
@@ -36,17 +38,22 @@ class RetrieveWaitingTaskRunsUC(UseCase):
         self._transaction_factory = transaction_factory
         self._waiting_task_run_provider = waiting_task_run_provider
         self._balancing_algorithm = balancing_algorithm
+        self._circuit_breaker = circuit_breaker
         
     async def apply(self, request: RetrieveWaitingTaskRunsUCRq) -> RetrieveWaitingTaskRunsUCRs:
         async with self._transaction_factory.create() as transaction:
             active_groups = await self._task_group_repo.filter(FilterFieldsDNF.single('is_active', True))
             group_names = [active_group.name for active_group in active_groups]
             batch_size_by_group_name = await self._balancing_algorithm.calculate_batch_size_by_group(group_names)
+            if self._circuit_breaker:
+                batch_size_by_group_name = await self._circuit_breaker.apply(batch_size_by_group_name)
             task_runs = await self._waiting_task_run_provider.provide(batch_size_by_group_name)
             status_updated_at = datetime.now(timezone.utc)
             await self._task_run_repo.update_all({task_run: UpdateFields.multiple({
                 'status': TaskRunStatus.QUEUED,
                 'status_updated_at': status_updated_at,
+                # Новая отправка: ответы исполнителя упорядочиваются заново
+                'last_reported_at': None,
             }) for task_run in task_runs})
             task_run_status_logs = [TaskRunStatusLog(task_run_id=task_run.id,
                                                      status_updated_at=status_updated_at,
@@ -0,0 +1,69 @@
+from typing import List
+
+from service.domain.schemas.command import Command, SlimCommand, COMMAND_FORMAT_HEADER, COMMAND_FORMAT_SLIM
+from service.domain.schemas.enums import CommandType, TaskRunStatus
+from service.domain.schemas.task_run import TaskRun
+from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
+from service.ports.common.logs import logger
+from service.domain.services.queue_topology import QueueTopology
+from service.ports.outbound.producer import DataProducerI
+
+# Запуски, которые уже отправлены исполнителю и занимают его ресурсы
+IN_FLIGHT_TASK_RUN_STATUSES = (TaskRunStatus.QUEUED, TaskRunStatus.EXECUTION)
+
+
+class SendCancelCommandsUCRq(UCRequest):
+    task_runs: List[TaskRun]
+
+
+class SendCancelCommandsUCRs(UCResponse):
+    request: SendCancelCommandsUCRq
+    sent_count: int = 0
+
+
+class SendCancelCommandsUC(UseCase):
+    """
+    Отправляет команды CANCEL исполнителям отмененных запусков, которые уже были в очереди или выполнялись.
+
+    Команда отправляется в управляющую очередь группы {group}.control, а не в очередь запусков: очередь
+    запусков FIFO, и CANCEL ждал бы за всеми командами EXECUTE, включая EXECUTE отменяемого запуска.
+    Исполнители группы слушают управляющую очередь отдельным потребителем, поэтому CANCEL доходит
+    до исполнителя, занятого запуском, сразу; исполнитель прекращает выполнение и подтверждает отмену.
+    Если запуск еще не взят из очереди запусков, исполнитель, получив CANCEL, должен запомнить task_run_id
+    и пропустить EXECUTE при получении.
+    Ошибка отправки не отменяет отмену в БД: запуск без подтверждения будет обработан исполнителем,
+    а его статус останется CANCELLED.
+    """
+
+    def __init__(self, task_runs_producer: DataProducerI, queue_topology: QueueTopology,
+                 message_ttl: int = 300, slim_commands: bool = False):
+        self._task_runs_producer = task_runs_producer
+        self._queue_topology = queue_topology
+        self._message_ttl = message_ttl
+        self._slim_commands = slim_commands
+
+    async def apply(self, request: SendCancelCommandsUCRq) -> SendCancelCommandsUCRs:
+        sent_count = 0
+        try:
+            # Запуск без объявленной очереди не мог быть отправлен исполнителю
+            await self._queue_topology.ensure_declared()
+            task_runs = [task_run for task_run in request.task_runs
+                         if self._queue_topology.is_declared(task_run.queue_name)]
+            await self._queue_topology.ensure_declared(task_run.control_queue_name for task_run in task_runs)
+            if self._slim_commands:
+                commands = [SlimCommand.from_task_run(task_run, CommandType.CANCEL) for task_run in task_runs]
+                headers = {COMMAND_FORMAT_HEADER: COMMAND_FORMAT_SLIM}
+            else:
+                commands = [Command(type=CommandType.CANCEL, task_run=task_run) for task_run in task_runs]
+                headers = None
+            is_produced = await self._task_runs_producer.produce_many(
+                commands,
+                [task_run.control_queue_name for task_run in task_runs],
+                headers=headers,
+                item_params={'expiration': self._message_ttl})
+            sent_count = is_produced.count(True)
+        except BaseException as e:
+            logger.warning(f"failed to send cancel commands for {len(request.task_runs)} task run(s): "
+                           f"{e.__class__.__name__}: {e}")
+        logger.info(f"sent {sent_count} cancel command(s)")
+        return SendCancelCommandsUCRs(request=request, success=True, sent_count=sent_count)
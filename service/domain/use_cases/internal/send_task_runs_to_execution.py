@@ -1,9 +1,18 @@
-from typing import List
+from collections import defaultdict
+from typing import List, Optional, Dict
 
-from service.domain.schemas.command import Command
+from more_itertools import batched
+
+from service.domain.schemas.command import Command, CommandEnvelope, COMMAND_ENVELOPE_HEADER, SlimCommand, \
+    COMMAND_FORMAT_HEADER, COMMAND_FORMAT_SLIM
+from service.domain.schemas.task_group import TaskGroup, TaskGroupPK
 from service.domain.schemas.task_run import TaskRun
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
-from service.ports.outbound.producer import DataProducerI, QueueCreator
+from service.ports.common.logs import logger
+from service.domain.services.queue_topology import QueueTopology
+from service.ports.outbound.producer import DataProducerI
+from service.ports.outbound.repo.abstract import Repo
+from service.ports.outbound.repo.fields import FilterFieldsDNF, ConditionOperation
 
 
 class SendTaskRunsToExecutionUCRq(UCRequest):
@@ -15,18 +24,93 @@ class SendTaskRunsToExecutionUCRs(UCResponse):
 
 
 class SendTaskRunsToExecutionUC(UseCase):
-    def __init__(self, task_runs_producer: DataProducerI, queue_creator: QueueCreator,
-                 message_ttl: int = 300):
+    """
+    Отправляет запуски исполнителям.
+
+    По умолчанию каждый запуск — отдельное сообщение с командой. Группа задач с command_envelope_size > 1
+    получает команды пакетами CommandEnvelope до command_envelope_size команд в одном сообщении:
+    пакет собирается из запусков одной очереди, а исполнитель отвечает на каждую команду отдельно.
+    С slim_commands вместо запуска целиком отправляется SlimCommand с заголовком x-command-format
+    """
+
+    def __init__(self, task_runs_producer: DataProducerI, queue_topology: QueueTopology,
+                 message_ttl: int = 300,
+                 task_group_repo: Optional[Repo[TaskGroup, TaskGroup, TaskGroupPK]] = None,
+                 slim_commands: bool = False, ):
         self._task_runs_producer = task_runs_producer
-        self._queue_creator = queue_creator
+        self._queue_topology = queue_topology
         self._message_ttl = message_ttl
+        self._task_group_repo = task_group_repo
+        self._slim_commands = slim_commands
 
     async def apply(self, request: SendTaskRunsToExecutionUCRq) -> SendTaskRunsToExecutionUCRs:
+        await self._queue_topology.ensure_declared(task_run.queue_name for task_run in request.task_runs)
+        envelope_size_by_group_name = await self._get_envelope_size_by_group_name(request.task_runs)
+        single_task_runs = []
+        enveloped_task_runs_by_queue_name: Dict[str, List[TaskRun]] = defaultdict(list)
         for task_run in request.task_runs:
-            is_queue_exists = await self._queue_creator.is_queue_exists(task_run.queue_name)
-            if not is_queue_exists:
-                await self._queue_creator.create_queue(task_run.queue_name)
-            command = Command(task_run=task_run)
-            await self._task_runs_producer.produce(command, task_run.queue_name,
-                                                   item_params={'expiration': self._message_ttl})
+            if task_run.group_name in envelope_size_by_group_name:
+                enveloped_task_runs_by_queue_name[task_run.queue_name].append(task_run)
+            else:
+                single_task_runs.append(task_run)
+        if single_task_runs:
+            await self._send_single(single_task_runs)
+        for queue_name, task_runs in enveloped_task_runs_by_queue_name.items():
+            await self._send_enveloped(queue_name, task_runs,
+                                       envelope_size_by_group_name[task_runs[0].group_name])
         return SendTaskRunsToExecutionUCRs(request=request, success=True)
+
+    async def _send_single(self, task_runs: List[TaskRun]):
+        # Пачка отправляется конкурентно, с подтверждением брокера для каждого сообщения
+        commands = [self._make_command(task_run) for task_run in task_runs]
+        is_produced = await self._task_runs_producer.produce_many(commands,
+                                                                  [task_run.queue_name for task_run in task_runs],
+                                                                  headers=self._make_headers(),
+                                                                  item_params={'expiration': self._message_ttl})
+        failed_count = is_produced.count(False)
+        if failed_count:
+            logger.error(f"failed to send {failed_count} of {len(commands)} task run(s)")
+
+    async def _send_enveloped(self, queue_name: str, task_runs: List[TaskRun], envelope_size: int):
+        envelopes = [CommandEnvelope(commands=[self._make_command(task_run) for task_run in chunk])
+                     for chunk in batched(task_runs, envelope_size)]
+        # Заголовок одинаков для всех сообщений пачки, поэтому полные и неполный пакет отправляются раздельно
+        for envelopes_chunk in self._split_by_size(envelopes):
+            commands_count = len(envelopes_chunk[0].commands)
+            is_produced = await self._task_runs_producer.produce_many(
+                envelopes_chunk,
+                [queue_name] * len(envelopes_chunk),
+                headers=self._make_headers({COMMAND_ENVELOPE_HEADER: str(commands_count)}),
+                item_params={'expiration': self._message_ttl})
+            failed_count = is_produced.count(False)
+            if failed_count:
+                logger.error(f"failed to send {failed_count} of {len(envelopes_chunk)} envelope(s) "
+                             f"with {commands_count} task run(s) to {queue_name}")
+
+    def _make_command(self, task_run: TaskRun) -> Command | SlimCommand:
+        if self._slim_commands:
+            return SlimCommand.from_task_run(task_run)
+        return Command(task_run=task_run)
+
+    def _make_headers(self, headers: Optional[dict] = None) -> Optional[dict]:
+        if not self._slim_commands:
+            return headers
+        return {**(headers or {}), COMMAND_FORMAT_HEADER: COMMAND_FORMAT_SLIM}
+
+    @staticmethod
+    def _split_by_size(envelopes: List[CommandEnvelope]) -> List[List[CommandEnvelope]]:
+        envelopes_by_size: Dict[int, List[CommandEnvelope]] = defaultdict(list)
+        for envelope in envelopes:
+            envelopes_by_size[len(envelope.commands)].append(envelope)
+        return list(envelopes_by_size.values())
+
+    async def _get_envelope_size_by_group_name(self, task_runs: List[TaskRun]) -> Dict[str, int]:
+        if not self._task_group_repo or not task_runs:
+            return {}
+        group_names = sorted({task_run.group_name for task_run in task_runs})
+        task_groups = await self._task_group_repo.filter(FilterFieldsDNF.single('name',
+                                                                                group_names,
+                                                                                ConditionOperation.IN))
+        return {task_group.name: task_group.command_envelope_size
+                for task_group in task_groups
+                if task_group.command_envelope_size and task_group.command_envelope_size > 1}
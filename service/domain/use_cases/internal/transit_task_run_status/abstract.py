@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone, timedelta
 from functools import cached_property
+from typing import Optional
 
 from service.domain.schemas.enums import TaskRunStatus
 from service.domain.schemas.task_run import TaskRun, TaskRunPK, TaskRunStatusLog
@@ -8,6 +9,7 @@ from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import FilterFieldsDNF, FilterField, ConditionOperation, UpdateFields
 from service.ports.outbound.repo.transaction import TransactionFactory
+from service.ports.outbound.wake_up import WakeUpNotifier
 
 
 class TransitTaskRunStatusUCRq(UCRequest):
@@ -30,10 +32,12 @@ class AbstractTransitTaskRunStatusUC(UseCase, ABC):
         task_run_repo: Repo[TaskRun, TaskRun, TaskRunPK],
         task_run_status_log_repo: Repo[TaskRunStatusLog, TaskRunStatusLog, TaskRunPK],
         transaction_factory: TransactionFactory,
+        wake_up_notifier: Optional[WakeUpNotifier] = None,
     ):
         self._task_run_repo = task_run_repo
         self._task_run_status_log_repo = task_run_status_log_repo
         self._transaction_factory = transaction_factory
+        self._wake_up_notifier = wake_up_notifier
 
     @cached_property
     @abstractmethod
@@ -46,9 +50,7 @@ class AbstractTransitTaskRunStatusUC(UseCase, ABC):
         pass
 
 
-    async def apply(
-        self, request: TransitTaskRunStatusUCRq
-    ) -> TransitTaskRunStatusUCRs:
+    def _build_filter_fields(self, request: TransitTaskRunStatusUCRq) -> FilterFieldsDNF:
         # Если в запросе указано ttl - вычисляем граничную дату
         if request.ttl_seconds:
             # Вычисляем граничное время: задачи, обновлённые раньше этого момента, считаются просроченными
@@ -68,8 +70,12 @@ class AbstractTransitTaskRunStatusUC(UseCase, ABC):
         else:
             # Находим все TaskRun в статусе 1, которые пробыли в нём дольше TTL
             filter_fields = FilterFieldsDNF.single(name="status", value=self.from_status)
+        return filter_fields
 
-        expired_task_runs = await self._task_run_repo.filter(filter_fields)
+    async def apply(
+        self, request: TransitTaskRunStatusUCRq
+    ) -> TransitTaskRunStatusUCRs:
+        expired_task_runs = await self._task_run_repo.filter(self._build_filter_fields(request))
 
         if not expired_task_runs:
             return TransitTaskRunStatusUCRs(
@@ -103,6 +109,10 @@ class AbstractTransitTaskRunStatusUC(UseCase, ABC):
 
             await self._task_run_status_log_repo.create_all(status_logs, transaction)
 
+        # Запуски, вернувшиеся в WAITING, отправляются на выполнение без ожидания периодического запуска
+        if self._wake_up_notifier and self.to_status == TaskRunStatus.WAITING:
+            await self._wake_up_notifier.notify(tr.group_name for tr in expired_task_runs)
+
         return TransitTaskRunStatusUCRs(
             success=True,
             request=request,
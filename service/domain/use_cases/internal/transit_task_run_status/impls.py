@@ -1,8 +1,11 @@
+from datetime import datetime, timezone, timedelta
 from functools import cached_property
 
-from service.domain.use_cases.internal.transit_task_run_status.abstract import AbstractTransitTaskRunStatusUC
+from service.domain.use_cases.internal.transit_task_run_status.abstract import AbstractTransitTaskRunStatusUC, \
+    TransitTaskRunStatusUCRq
 
 from service.domain.schemas.enums import TaskRunStatus
+from service.ports.outbound.repo.fields import FilterFieldsDNF, FilterFieldsConjunct, FilterField, ConditionOperation
 
 
 class TransitStatusFromQueuedToInterruptedUC(AbstractTransitTaskRunStatusUC):
@@ -22,10 +25,26 @@ class TransitStatusFromQueuedToInterruptedUC(AbstractTransitTaskRunStatusUC):
 
 class TransitStatusFromExecutionToInterruptedUC(AbstractTransitTaskRunStatusUC):
     """
-    Переводит TaskRun из статуса EXECUTION в INTERRUPTED, если задача пробыла
-    в статусе EXECUTION дольше, чем ttl_seconds.
+    Переводит TaskRun из статуса EXECUTION в INTERRUPTED, если истекла аренда выполнения запуска.
+    Запуски без аренды (исполнитель не прислал статус EXECUTION с момента ее появления)
+    прерываются, если пробыли в статусе EXECUTION дольше, чем ttl_seconds.
     """
 
+    def _build_filter_fields(self, request: TransitTaskRunStatusUCRq) -> FilterFieldsDNF:
+        now = datetime.now(timezone.utc)
+        threshold_time = now - timedelta(seconds=request.ttl_seconds)
+        return FilterFieldsDNF(conjunctions=[
+            FilterFieldsConjunct(group=[
+                FilterField(name="status", value=self.from_status),
+                FilterField(name="lease_expires_at", value=now, operation=ConditionOperation.LT),
+            ]),
+            FilterFieldsConjunct(group=[
+                FilterField(name="status", value=self.from_status),
+                FilterField(name="lease_expires_at", value=None, operation=ConditionOperation.IS_NULL),
+                FilterField(name="status_updated_at", value=threshold_time, operation=ConditionOperation.LT),
+            ]),
+        ])
+
     @cached_property
     def from_status(self) -> TaskRunStatus:
         return TaskRunStatus.EXECUTION
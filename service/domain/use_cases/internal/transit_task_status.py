@@ -1,14 +1,18 @@
+from collections import defaultdict
 from datetime import datetime, timezone
+from typing import Optional, List, Dict
 
 from more_itertools import batched
 
 from service.domain.schemas.enums import TaskStatus, TaskRunStatus
+from service.domain.schemas.monitoring_algorithm import PeriodicMonitoringAlgorithm, MonitoringAlgorithmPK
 from service.domain.schemas.task import Task, TaskPK, TaskStatusLogPK, TaskStatusLog
-from service.domain.schemas.task_run import TaskRunPK, TaskRun
+from service.domain.schemas.task_run import TaskRunPK, TaskRun, TaskRunTimeIntervalProgress, \
+    TaskRunTimeIntervalProgressPK
 from service.domain.use_cases.abstract import UseCase, UCRequest, UCResponse
 from service.ports.outbound.repo.abstract import Repo
 from service.ports.outbound.repo.fields import FilterFieldsDNF, PaginationQuery, ConditionOperation, FilterField, \
-    UpdateFields
+    UpdateFields, UpdateField
 from service.ports.outbound.repo.task import TaskProvider
 from service.ports.outbound.repo.transaction import TransactionFactory
 
@@ -23,16 +27,55 @@ class TransitTaskStatusUCRs(UCResponse):
     error_count: int = 0
 
 
+def calculate_adaptive_timeout(timeout: float,
+                               collected_data_amount: int,
+                               timeout_min: float,
+                               timeout_max: float,
+                               factor: float, ) -> float:
+    """ Сокращает период задачи в factor раз, если запуски нашли данные, иначе во столько же раз растягивает """
+    if collected_data_amount > 0:
+        timeout = timeout / factor
+    else:
+        timeout = timeout * factor
+    return min(max(timeout, timeout_min), timeout_max)
+
+
 class TransitTaskStatusUC(UseCase):
+    """
+    Переводит выполняющиеся задачи в SUCCEED или ERROR по результатам их запусков.
+
+    Для задач с адаптивным периодическим алгоритмом (заданы adaptive_timeout_min и adaptive_timeout_max)
+    при переходе в SUCCEED пересчитывается собственный период задачи по объему данных, собранных
+    запусками завершившегося прохода. Задачи, запуски которых не сообщили о прогрессе, не адаптируются.
+    """
+
     def __init__(self,
                  task_repo: Repo[Task, Task, TaskPK],
                  task_provider: TaskProvider,
                  task_status_log_repo: Repo[TaskStatusLog, TaskStatusLog, TaskStatusLogPK,],
-                 transaction_factory: TransactionFactory, ):
+                 transaction_factory: TransactionFactory,
+                 periodic_monitoring_algorithm_repo: Optional[Repo[PeriodicMonitoringAlgorithm,
+                                                                   PeriodicMonitoringAlgorithm,
+                                                                   MonitoringAlgorithmPK]] = None,
+                 task_run_repo: Optional[Repo[TaskRun, TaskRun, TaskRunPK]] = None,
+                 task_run_time_interval_progress_repo: Optional[Repo[TaskRunTimeIntervalProgress,
+                                                                     TaskRunTimeIntervalProgress,
+                                                                     TaskRunTimeIntervalProgressPK]] = None,
+                 adaptive_timeout_factor: float = 2, ):
         self._task_repo = task_repo
         self._task_provider = task_provider
         self._task_status_log_repo = task_status_log_repo
         self._transaction_factory = transaction_factory
+        self._periodic_monitoring_algorithm_repo = periodic_monitoring_algorithm_repo
+        self._task_run_repo = task_run_repo
+        self._task_run_time_interval_progress_repo = task_run_time_interval_progress_repo
+        self._adaptive_timeout_factor = adaptive_timeout_factor
+
+    @property
+    def _is_adaptive_timeout_enabled(self) -> bool:
+        return (self._periodic_monitoring_algorithm_repo is not None
+                and self._task_run_repo is not None
+                and self._task_run_time_interval_progress_repo is not None)
 
     async def apply(self, request: TransitTaskStatusUCRq) -> TransitTaskStatusUCRs:  # TODO: optimize by sql
         tasks_ids_to_transit = await self._task_provider.provide_tasks_ids_to_transit_via_sql()
@@ -53,6 +96,12 @@ class TransitTaskStatusUC(UseCase):
         task_status_logs.extend([TaskStatusLog(task_id=task_id, status_updated_at=status_updated_at,
                                                status=TaskStatus.ERROR) for task_id in error_tasks_ids])
 
+        if self._is_adaptive_timeout_enabled and succeed_tasks_ids:
+            adaptive_timeout_by_task_id = await self._calculate_adaptive_timeouts(succeed_tasks_ids)
+            for task_id, adaptive_timeout in adaptive_timeout_by_task_id.items():
+                tasks_to_update[TaskPK(id=task_id)].group.append(UpdateField(name='adaptive_timeout',
+                                                                             value=adaptive_timeout))
+
         # Обновляем статусы
         await self._task_repo.update_all(tasks_to_update, )
         # Сохраняем в лог событие смены статуса
@@ -62,3 +111,44 @@ class TransitTaskStatusUC(UseCase):
                                      succeed_count=len(succeed_tasks_ids),
                                      error_count=len(error_tasks_ids),
                                      success=True)
+
+    async def _calculate_adaptive_timeouts(self, tasks_ids: List[int]) -> Dict[int, float]:
+        tasks = await self._task_repo.filter(FilterFieldsDNF.single('id', tasks_ids, ConditionOperation.IN))
+        algorithms = await self._periodic_monitoring_algorithm_repo.filter(
+            FilterFieldsDNF.single('id', list({task.monitoring_algorithm_id for task in tasks}), ConditionOperation.IN))
+        algorithm_by_id = {algorithm.id: algorithm for algorithm in algorithms if algorithm.is_adaptive}
+        adaptive_tasks = [task for task in tasks if task.monitoring_algorithm_id in algorithm_by_id]
+        if not adaptive_tasks:
+            return {}
+
+        # Запуски завершившегося прохода — выполненные после перевода задачи в EXECUTION
+        task_by_id = {task.id: task for task in adaptive_tasks}
+        task_runs = await self._task_run_repo.filter(FilterFieldsDNF.single_conjunct([
+            FilterField.new('task_id', list(task_by_id), ConditionOperation.IN),
+            FilterField.new('status', TaskRunStatus.SUCCEED, ConditionOperation.EQ),
+            FilterField.new('status_updated_at', min(task.status_updated_at for task in adaptive_tasks),
+                            ConditionOperation.GTE),
+        ]))
+        task_id_by_task_run_id = {task_run.id: task_run.task_id for task_run in task_runs
+                                  if task_run.status_updated_at >= task_by_id[task_run.task_id].status_updated_at}
+        if not task_id_by_task_run_id:
+            return {}
+        task_run_progresses = await self._task_run_time_interval_progress_repo.filter(
+            FilterFieldsDNF.single('task_run_id', list(task_id_by_task_run_id), ConditionOperation.IN))
+        collected_data_amount_by_task_id = defaultdict(int)
+        for task_run_progress in task_run_progresses:
+            collected_data_amount_by_task_id[task_id_by_task_run_id[task_run_progress.task_run_id]] += \
+                task_run_progress.collected_data_amount
+
+        adaptive_timeout_by_task_id = {}
+        for task_id, collected_data_amount in collected_data_amount_by_task_id.items():
+            task = task_by_id[task_id]
+            algorithm = algorithm_by_id[task.monitoring_algorithm_id]
+            adaptive_timeout_by_task_id[task_id] = calculate_adaptive_timeout(
+                task.adaptive_timeout or algorithm.timeout,
+                collected_data_amount,
+                algorithm.adaptive_timeout_min,
+                algorithm.adaptive_timeout_max,
+                self._adaptive_timeout_factor,
+            )
+        return adaptive_timeout_by_task_id
@@ -11,7 +11,8 @@ from service.adapters.inbound.consumer.rmq import AioPikaRMQConsumer, AioPikaRMQ
 from service.adapters.inbound.rest_api.fast_api_server import FastAPIServer
 from service.adapters.inbound.rest_api.html_auth_middleware import AuthMiddleware
 from service.adapters.outbound.producer.rmq import AioPikaRMQProducerConnection, AioPikaRMQProducer, \
-    AioPikaRMQQueueBoundToExchangeCreator
+    AioPikaRMQQueueBoundToExchangeCreator, AioPikaRMQChannelPool
+from service.adapters.outbound.repo.cached import CachedRepo, LocalCacheInvalidator
 from service.adapters.outbound.repo.sa import models
 from service.adapters.outbound.repo.sa.database import Database
 from service.adapters.outbound.repo.sa.impls.analytical_metrics import SAAnalyticalMetricsProvider
@@ -22,28 +23,35 @@ from service.adapters.outbound.repo.sa.impls.monitoring_algorithm import SAMonit
 from service.adapters.outbound.repo.sa.impls.payload import SAPayloadRepo
 from service.adapters.outbound.repo.sa.impls.project import SAProjectRepo
 from service.adapters.outbound.repo.sa.impls.refresh_token import SARefreshTokenRepo
-from service.adapters.outbound.repo.sa.impls.task import SATaskRepo, SATaskProvider, SATaskStatisticsProvider
+from service.adapters.outbound.repo.sa.impls.task import SATaskRepo, SATaskProvider, SATaskStatisticsProvider, \
+    SATaskStatusBulkUpdater
 from service.adapters.outbound.repo.sa.impls.task_group import SATaskGroupRepo
 from service.adapters.outbound.repo.sa.impls.task_group_by_project import SATaskGroupByProjectRepo
 from service.adapters.outbound.repo.sa.impls.task_run import SATaskRunRepo, SAWaitingTaskRunProvider, \
-    SATaskRunMetricsProvider, SARecentTaskRunsProvider
+    SATaskRunMetricsProvider, SARecentTaskRunsProvider, SATaskRunDeadlineMetricsProvider
 from service.adapters.outbound.repo.sa.impls.task_run_status_log import SATaskRunStatusLogRepo
 from service.adapters.outbound.repo.sa.impls.task_run_time_interval_execution_bounds import \
     SATaskRunTimeIntervalExecutionBoundsRepo, SALatestTaskRunTimeIntervalExecutionBoundsProvider
 from service.adapters.outbound.repo.sa.impls.task_run_time_interval_progress import SATaskRunTimeIntervalProgressRepo
 from service.adapters.outbound.repo.sa.impls.task_status_log import SATaskStatusLogRepo
 from service.adapters.outbound.repo.sa.impls.time_interval_task_progress import SATimeIntervalTaskProgressRepo
+from service.adapters.outbound.repo.sa.notify import PgNotifyCacheInvalidator, SAPgWakeUpNotifier, \
+    PgNotificationListener, TASKS_CREATED_CHANNEL, TASK_RUNS_WAITING_CHANNEL
 from service.adapters.outbound.repo.sa.transaction import SATransactionFactory
+from service.adapters.outbound.spool import FileSpool
 from service.di import set_use_case_facade
+from service.domain.schemas.command import make_status_queue_name
 from service.domain.schemas.enums import BalancingAlgorithmType
 from service.domain.services.analytical_metrics import AnalyticalMetricsService
 from service.domain.services.balancing_algorithm.adaptive_model import AdaptiveModelBalancingAlgorithm
 from service.domain.services.balancing_algorithm.aimd import AIMDBalancingAlgorithm
 from service.domain.services.balancing_algorithm.constant import ConstantBalancingAlgorithm
+from service.domain.services.circuit_breaker import TaskGroupCircuitBreaker
 from service.domain.services.execution_bounds_provider import DefaultExecutionBoundsProvider
 from service.domain.services.hasher import Hasher
 from service.domain.services.log_cleaner import TaskRunStatusLogCleaner
 from service.domain.services.payload_provider import PayloadProvider
+from service.domain.services.queue_topology import QueueTopology
 from service.domain.services.task_progress_provider import ActualTimeIntervalExecutionBoundsProvider
 from service.domain.services.token_service import TokenService
 from service.domain.services.uniqueness_payload_checker import UniquenessPayloadChecker
@@ -83,6 +91,8 @@ from service.domain.use_cases.external.project import GetAllProjectsUC, CreatePr
     GetTaskGroupsWithoutProjectUC, AddTaskGroupToProjectUC, RemoveTaskGroupFromProjectUC, UpdateProjectUC, \
     GetAllTaskGroupByProjectDetailedUC, GetProjectByTaskGroupUC
 from service.domain.use_cases.external.resume_tasks import ResumeTasksUC
+from service.domain.use_cases.external.tasks_by_filter import CancelTasksByFilterUC, PauseTasksByFilterUC, \
+    ResumeTasksByFilterUC
 from service.domain.use_cases.external.task_group import GetTaskGroupUC, GetAllTaskGroupUC, CreateTaskGroupUC, \
     UpdateTaskGroupUC
 from service.domain.use_cases.external.update_payload import UpdatePayloadUC
@@ -95,15 +105,18 @@ from service.domain.use_cases.internal.receive_task_run_execution_status import
 from service.domain.use_cases.internal.retrieve_and_send_task_runs import RetrieveAndSendTaskRunsUC, \
     RetrieveAndSendTaskRunsUCRq
 from service.domain.use_cases.internal.retrieve_waiting_task_runs import RetrieveWaitingTaskRunsUC
+from service.domain.use_cases.internal.send_cancel_commands import SendCancelCommandsUC
 from service.domain.use_cases.internal.send_task_runs_to_execution import SendTaskRunsToExecutionUC
 from service.domain.use_cases.internal.transit_task_run_status.abstract import TransitTaskRunStatusUCRq
 from service.domain.use_cases.internal.transit_task_run_status.impls import TransitStatusFromExecutionToInterruptedUC, \
     TransitStatusFromQueuedToInterruptedUC, TransitStatusFromInterruptedToWaitingUC, \
     TransitStatusFromTempErrorToWaitingUC
 from service.domain.use_cases.internal.transit_task_status import TransitTaskStatusUC, TransitTaskStatusUCRq
+from service.ports.common.codec import MessageDecoder
 from service.ports.common.input_converter import InputConverterI
 from service.ports.common.logs import logger, set_log_level
 from service.ports.common.periodic_runner import PeriodicRunner
+from service.ports.outbound.cache import ReferenceCacheName
 from service.ports.outbound.producer import DirectDataProducer
 from service.ports.outbound.repo.monitoring_algorithm import TaskToExecuteProviderRegistry
 from service.settings import ServiceSettings, ServiceType
@@ -113,7 +126,8 @@ from tests.conftest import compress_task_progress_uc
 class CommandResponseToReceiveTaskRunExecutionStatusUCRq(InputConverterI):
 
     def convert(self, raw_message: Any) -> Any:
-        command_response = json.loads(raw_message)
+        # Сообщение уже декодировано MessageDecoder потребителя по его content_type
+        command_response = json.loads(raw_message) if isinstance(raw_message, (str, bytes)) else raw_message
         return ReceiveTaskRunExecutionStatusUCRq(command_response=command_response)
 
 
@@ -123,7 +137,9 @@ async def main():
     database = Database(settings.database_uri)
     transaction_factory = SATransactionFactory(database)
     monitoring_algorithm_repo = SAMonitoringAlgorithmRepo(database, models.MonitoringAlgorithm)
-    periodic_monitoring_algorithm_repo = SAPeriodicMonitoringAlgorithmRepo(database, models.PeriodicMonitoringAlgorithm)
+    periodic_monitoring_algorithm_repo = SAPeriodicMonitoringAlgorithmRepo(
+        database, models.PeriodicMonitoringAlgorithm,
+        max_tasks_per_tick=settings.periodic_max_tasks_per_tick)
     single_monitoring_algorithm_repo = SASingleMonitoringAlgorithmRepo(database, models.SingleMonitoringAlgorithm)
     task_repo = SATaskRepo(database, models.Task, chunk_size=2000)
     task_run_repo = SATaskRunRepo(database, models.TaskRun, chunk_size=2000)
@@ -142,7 +158,9 @@ async def main():
 
     time_interval_task_progress_repo = SATimeIntervalTaskProgressRepo(database, models.TimeIntervalTaskProgress)
 
-    waiting_task_run_provider = SAWaitingTaskRunProvider(database, task_run_repo)
+    waiting_task_run_provider = SAWaitingTaskRunProvider(database, task_run_repo,
+                                                         retro_share=settings.retro_task_run_batch_share,
+                                                         max_wait_s=settings.waiting_task_run_max_wait_s)
     payload_repo = SAPayloadRepo(database, models.Payload)
     app_user_repo = SAAppUserRepo(database, models.AppUser)
     refresh_token_repo = SARefreshTokenRepo(database, models.RefreshToken)
@@ -153,8 +171,38 @@ async def main():
 
     api_token_repo = SAApiTokenRepo(database, models.ApiToken)
 
+    # Справочные данные групп задач и алгоритмов мониторинга кэшируются в процессе;
+    # провайдеры задач к выполнению (task_to_execute_provider_registry) читают БД напрямую
+    local_cache_invalidator = LocalCacheInvalidator()
+    pg_notify_cache_invalidator = PgNotifyCacheInvalidator(database, local_cache_invalidator)
+    cache_invalidator = pg_notify_cache_invalidator
+
+    # Внеочередное пробуждение создания запусков и диспетчера; периодический запуск остается страховкой
+    tasks_created_notifier = None
+    task_runs_waiting_notifier = None
+    if settings.use_wake_up_notifications:
+        tasks_created_notifier = SAPgWakeUpNotifier(database, TASKS_CREATED_CHANNEL)
+        task_runs_waiting_notifier = SAPgWakeUpNotifier(database, TASK_RUNS_WAITING_CHANNEL)
+    if settings.use_reference_cache:
+        task_group_repo = local_cache_invalidator.register(
+            ReferenceCacheName.TASK_GROUP, CachedRepo(task_group_repo, settings.reference_cache_ttl_s))
+        task_group_by_project_repo = local_cache_invalidator.register(
+            ReferenceCacheName.TASK_GROUP, CachedRepo(task_group_by_project_repo, settings.reference_cache_ttl_s))
+        monitoring_algorithm_repo = local_cache_invalidator.register(
+            ReferenceCacheName.MONITORING_ALGORITHM, CachedRepo(monitoring_algorithm_repo,
+                                                                settings.reference_cache_ttl_s))
+        periodic_monitoring_algorithm_repo = local_cache_invalidator.register(
+            ReferenceCacheName.MONITORING_ALGORITHM, CachedRepo(periodic_monitoring_algorithm_repo,
+                                                                settings.reference_cache_ttl_s))
+        single_monitoring_algorithm_repo = local_cache_invalidator.register(
+            ReferenceCacheName.MONITORING_ALGORITHM, CachedRepo(single_monitoring_algorithm_repo,
+                                                                settings.reference_cache_ttl_s))
+        monitoring_algorithms = [periodic_monitoring_algorithm_repo, single_monitoring_algorithm_repo]
+
     task_run_metrics_provider = SATaskRunMetricsProvider(database)
+    task_run_deadline_metrics_provider = SATaskRunDeadlineMetricsProvider(database)
     task_provider = SATaskProvider(database)
+    task_status_bulk_updater = SATaskStatusBulkUpdater(database)
     analytical_metrics_provider = SAAnalyticalMetricsProvider(database)
 
     latest_task_run_time_interval_execution_bounds_provider = SALatestTaskRunTimeIntervalExecutionBoundsProvider(database)
@@ -166,10 +214,20 @@ async def main():
     rmq_producer_connection = AioPikaRMQProducerConnection.from_settings(settings.rmq_producer_connection)
     rmq_producer = AioPikaRMQProducer.from_settings(settings.rmq_producer_task_run, rmq_producer_connection)
     task_runs_producer = DirectDataProducer(settings.rmq_producer_task_run.routing_key, rmq_producer)
-    queue_creator = AioPikaRMQQueueBoundToExchangeCreator(rmq_producer, rmq_producer_connection)
-
-
-    payload_provider = PayloadProvider(payload_repo)
+    rmq_channel_pool = AioPikaRMQChannelPool(rmq_producer_connection,
+                                             settings.rmq_producer_connection.channel_pool_size)
+    queue_creator = AioPikaRMQQueueBoundToExchangeCreator(rmq_producer, rmq_channel_pool)
+    # Очереди групп объявляются при старте и после изменения групп, а не перед каждой отправкой
+    queue_topology = local_cache_invalidator.register(ReferenceCacheName.TASK_GROUP,
+                                                      QueueTopology(task_group_repo, queue_creator))
+    # Отмена запусков, уже отправленных исполнителям, сопровождается командой CANCEL
+    send_cancel_commands_uc = SendCancelCommandsUC(task_runs_producer, queue_topology,
+                                                   slim_commands=settings.use_slim_commands) \
+        if settings.use_cancel_commands else None
+
+
+    payload_provider = local_cache_invalidator.register(
+        ReferenceCacheName.PAYLOAD, PayloadProvider(payload_repo, settings.payload_cache_max_size_bytes))
     uniqueness_payload_checker = UniquenessPayloadChecker(payload_repo)
     task_status_log_cleaner = TaskRunStatusLogCleaner(task_run_status_log_repo)
     hasher = Hasher()
@@ -188,29 +246,39 @@ async def main():
         balancing_algorithm = adaptive_model_balancing_algorithm
     else:
         raise RuntimeError("Not specified balancing_algorithm_type in env")
+    if settings.use_circuit_breaker:
+        circuit_breaker = TaskGroupCircuitBreaker(task_run_metrics_provider,
+                                                  period_s=settings.circuit_breaker_period_s,
+                                                  failure_rate_threshold=settings.circuit_breaker_failure_rate_threshold,
+                                                  open_timeout_s=settings.circuit_breaker_open_timeout_s,
+                                                  probe_batch_size=settings.circuit_breaker_probe_batch_size, )
+    else:
+        circuit_breaker = None
     # USE CASE: external
     create_monitoring_algorithm_uc = CreateMonitoringAlgorithmUC(monitoring_algorithm_repo,
                                                                  periodic_monitoring_algorithm_repo,
                                                                  single_monitoring_algorithm_repo,
-                                                                 transaction_factory)
+                                                                 transaction_factory,
+                                                                 cache_invalidator)
     get_all_monitoring_algorithms_uc = GetAllMonitoringAlgorithmsUC(monitoring_algorithm_repo, monitoring_algorithms)
     create_tasks_uc = CreateTasksUC(transaction_factory, uniqueness_payload_checker, payload_repo, task_repo,
-                                    task_status_log_repo)
+                                    task_status_log_repo, tasks_created_notifier)
     get_tasks_uc = GetTasksUC(task_repo)
     get_task_runs_uc = GetTaskRunsUC(task_repo, task_run_repo)
     get_tasks_runs_uc = GetTasksRunsUC(task_run_repo)
     get_task_progress_uc = GetTaskProgressUC(task_repo, time_interval_task_progress_repo)
     get_payloads_uc = GetPayloadsUC(payload_repo)
-    update_payload_uc = UpdatePayloadUC(payload_repo, uniqueness_payload_checker)
+    update_payload_uc = UpdatePayloadUC(payload_repo, uniqueness_payload_checker, cache_invalidator)
     update_task_uc = UpdateTaskUC(task_repo)
     get_monitoring_algorithm_uc = GetMonitoringAlgorithmUC(monitoring_algorithm_repo,
                                                            periodic_monitoring_algorithm_repo,
                                                            single_monitoring_algorithm_repo, transaction_factory)
-    update_monitoring_algorithm_uc = UpdateMonitoringAlgorithmUC(monitoring_algorithm_repo, periodic_monitoring_algorithm_repo, single_monitoring_algorithm_repo, transaction_factory)
+    update_monitoring_algorithm_uc = UpdateMonitoringAlgorithmUC(monitoring_algorithm_repo, periodic_monitoring_algorithm_repo, single_monitoring_algorithm_repo, transaction_factory,
+                                                                 cache_invalidator)
     get_task_run_status_logs_uc = GetTaskRunStatusLogsUC(task_run_status_log_repo)
     get_task_run_detailed_uc = GetTaskRunDetailedUC(task_run_repo, task_run_time_interval_progress_repo)
 
-    create_task_group_uc = CreateTaskGroupUC(task_group_repo)
+    create_task_group_uc = CreateTaskGroupUC(task_group_repo, cache_invalidator)
     get_task_group_uc = GetTaskGroupUC(task_group_repo)
     get_task_detailed_uc = GetTaskDetailedUC(task_repo, payload_repo, task_group_repo, get_monitoring_algorithm_uc,
                                              get_task_progress_uc, task_run_metrics_provider)
@@ -223,7 +291,7 @@ async def main():
     get_task_groups_without_project_uc = GetTaskGroupsWithoutProjectUC(project_repo, task_group_repo,
                                                                        task_group_by_project_repo)
 
-    get_payload_uc = GetPayloadUC(payload_repo, task_repo, get_tasks_detailed_uc, )
+    get_payload_uc = GetPayloadUC(payload_provider, task_repo, get_tasks_detailed_uc, )
     create_payload_uc = CreatePayloadUC(uniqueness_payload_checker, payload_repo)
 
     get_all_projects_uc = GetAllProjectsUC(project_repo)
@@ -233,16 +301,25 @@ async def main():
                                                         get_all_task_group_uc)
     get_all_task_group_statistics_uc = GetAllTaskGroupStatisticsUC(task_group_repo, task_run_metrics_provider)
     get_task_group_statistics_uc = GetTaskGroupStatisticsUC(task_group_repo, task_run_metrics_provider)
-    add_task_group_to_project_uc = AddTaskGroupToProjectUC(project_repo, task_group_repo, task_group_by_project_repo)
+    add_task_group_to_project_uc = AddTaskGroupToProjectUC(project_repo, task_group_repo, task_group_by_project_repo,
+                                                           cache_invalidator)
     remove_task_group_from_project_uc = RemoveTaskGroupFromProjectUC(project_repo, task_group_repo,
-                                                                     task_group_by_project_repo)
+                                                                     task_group_by_project_repo,
+                                                                     cache_invalidator)
     get_all_task_group_by_project_detailed_uc = GetAllTaskGroupByProjectDetailedUC(project_repo, task_group_repo,
                                                                                    task_group_by_project_repo, )
     get_project_by_task_group_uc = GetProjectByTaskGroupUC(project_repo, task_group_repo, task_group_by_project_repo)
-    update_task_group_uc = UpdateTaskGroupUC(task_group_repo)
+    update_task_group_uc = UpdateTaskGroupUC(task_group_repo, cache_invalidator)
 
     resume_tasks_uc = ResumeTasksUC(task_repo, task_run_repo, task_run_status_log_repo, transaction_factory)
-    cancel_tasks_uc = CancelTasksUC(task_repo, task_run_repo, task_run_status_log_repo, transaction_factory)
+    cancel_tasks_uc = CancelTasksUC(task_repo, task_run_repo, task_run_status_log_repo, transaction_factory,
+                                    send_cancel_commands_uc)
+    cancel_tasks_by_filter_uc = CancelTasksByFilterUC(task_status_bulk_updater, task_run_status_log_repo,
+                                                      transaction_factory, task_run_repo, send_cancel_commands_uc)
+    pause_tasks_by_filter_uc = PauseTasksByFilterUC(task_status_bulk_updater, task_run_status_log_repo,
+                                                    transaction_factory)
+    resume_tasks_by_filter_uc = ResumeTasksByFilterUC(task_status_bulk_updater, task_run_status_log_repo,
+                                                      transaction_factory, task_runs_waiting_notifier)
     get_payloads_by_group_uc = GetPayloadsByGroupUC(payload_repo, task_repo)
     find_or_create_simplified_periodic_monitoring_algorithm = FindOrCreateSimplifiedPeriodicMonitoringAlgorithmUC(
         create_monitoring_algorithm_uc, periodic_monitoring_algorithm_repo)
@@ -282,7 +359,10 @@ async def main():
                                     resume_tasks_uc,
                                     cancel_tasks_uc,
                                     get_payloads_by_group_uc,
-                                    find_or_create_simplified_periodic_monitoring_algorithm,)
+                                    find_or_create_simplified_periodic_monitoring_algorithm,
+                                    cancel_tasks_by_filter_uc,
+                                    pause_tasks_by_filter_uc,
+                                    resume_tasks_by_filter_uc,)
     set_use_case_facade(use_case_facade)
 
     delete_api_token_uc = DeleteApiTokenUC(api_token_repo)
@@ -302,20 +382,35 @@ async def main():
                                            task_run_time_interval_execution_bounds_repo,
                                            transaction_factory,
                                            task_to_execute_provider_registry,
-                                           payload_provider, task_group_repo, latest_task_run_time_interval_execution_bounds_provider)
+                                           payload_provider, task_group_repo, latest_task_run_time_interval_execution_bounds_provider,
+                                           wake_up_notifier=task_runs_waiting_notifier)
+    status_spool = FileSpool(settings.status_spool_dir,
+                             settings.status_spool_segment_max_bytes,
+                             settings.status_spool_fsync_delay_s) if settings.status_spool_dir else None
     receive_task_run_execution_status_uc = ReceiveTaskRunExecutionStatusUC(task_run_repo,
                                                                            task_run_status_log_repo,
                                                                            time_interval_task_progress_repo,
                                                                            task_run_time_interval_progress_repo,
                                                                            transaction_factory,
-                                                                           instant_upload=False)
+                                                                           instant_upload=False,
+                                                                           task_group_repo=task_group_repo,
+                                                                           default_execution_lease_s=settings.default_execution_lease_s,
+                                                                           # С журналом статус сохранен до подтверждения, ждать коммита не нужно
+                                                                           wait_upload=settings.ack_statuses_after_upload and not status_spool,
+                                                                           upload_batch_size=settings.status_upload_batch_size,
+                                                                           max_buffered=settings.status_max_buffered,
+                                                                           spool=status_spool,
+                                                                           max_upload_attempts=settings.status_spool_max_upload_attempts)
     retrieve_waiting_task_runs_uc = RetrieveWaitingTaskRunsUC(task_group_repo,
                                                               task_run_repo,
                                                               task_run_status_log_repo,
                                                               transaction_factory,
                                                               waiting_task_run_provider,
-                                                              balancing_algorithm, )
-    send_task_runs_to_execution_uc = SendTaskRunsToExecutionUC(task_runs_producer, queue_creator)
+                                                              balancing_algorithm,
+                                                              circuit_breaker, )
+    send_task_runs_to_execution_uc = SendTaskRunsToExecutionUC(task_runs_producer, queue_topology,
+                                                               task_group_repo=task_group_repo,
+                                                               slim_commands=settings.use_slim_commands)
     retrieve_and_send_task_runs_uc = RetrieveAndSendTaskRunsUC(retrieve_waiting_task_runs_uc,
                                                                send_task_runs_to_execution_uc)
 
@@ -327,16 +422,22 @@ async def main():
                                                                                                 transaction_factory)
     transit_status_from_interrupted_to_waiting_uc = TransitStatusFromInterruptedToWaitingUC(task_run_repo,
                                                                                             task_run_status_log_repo,
-                                                                                            transaction_factory)
+                                                                                            transaction_factory,
+                                                                                            task_runs_waiting_notifier)
     transit_status_from_temp_error_to_waiting_uc = TransitStatusFromTempErrorToWaitingUC(task_run_repo,
                                                                                          task_run_status_log_repo,
-                                                                                         transaction_factory)
+                                                                                         transaction_factory,
+                                                                                         task_runs_waiting_notifier)
 
     transit_task_status_uc = TransitTaskStatusUC(
         task_repo=task_repo,
         task_provider=task_provider,
         task_status_log_repo=task_status_log_repo,
         transaction_factory=transaction_factory,
+        periodic_monitoring_algorithm_repo=periodic_monitoring_algorithm_repo,
+        task_run_repo=task_run_repo,
+        task_run_time_interval_progress_repo=task_run_time_interval_progress_repo,
+        adaptive_timeout_factor=settings.adaptive_timeout_factor,
     )
     cleanup_task_runs_uc = CleanupTaskRunsUC(task_run_repo, task_run_status_log_repo, task_run_time_interval_execution_bounds_repo,
                                              task_run_time_interval_progress_repo, transaction_factory,)
@@ -360,13 +461,28 @@ async def main():
     admin_use_case_facade = AdminUseCaseFacade(deactivate_user_uc, get_all_users_uc, activate_user_uc)
 
     rmq_consumer_connection = AioPikaRMQConsumerConnection.from_settings(settings.rmq_consumer_connection)
-    rmq_consumer = AioPikaRMQConsumer.from_settings(settings.rmq_consumer, rmq_consumer_connection)
-    rmq_task_run_execution_status_consumer = RMQQueueConsumer(rmq_consumer,
-                                                              settings.rmq_task_run_execution_status_queue,
-                                                              receive_task_run_execution_status_uc.apply,
-                                                              CommandResponseToReceiveTaskRunExecutionStatusUCRq(),
-                                                              durable=True,
-                                                              passive=True,)
+    # Каждый потребитель — отдельный канал со своим prefetch; все они пишут в один накопитель статусов.
+    # Основная очередь объявляется при развертывании, шард-очереди сервис объявляет сам
+    rmq_consumers = []
+    rmq_task_run_execution_status_consumers = []
+    status_queues = [(settings.rmq_task_run_execution_status_queue, settings.status_consumers_count, True)]
+    if settings.status_queue_shards > 1:
+        status_queues.extend((make_status_queue_name(settings.rmq_task_run_execution_status_queue, shard,
+                                                     settings.status_queue_shards), 1, False)
+                             for shard in range(settings.status_queue_shards))
+    for status_queue_name, consumers_count, is_passive in status_queues:
+        for _ in range(consumers_count):
+            rmq_consumer = AioPikaRMQConsumer.from_settings(settings.rmq_consumer, rmq_consumer_connection,
+                                                            MessageDecoder())
+            rmq_consumers.append(rmq_consumer)
+            rmq_task_run_execution_status_consumers.append(RMQQueueConsumer(
+                rmq_consumer,
+                status_queue_name,
+                receive_task_run_execution_status_uc.apply,
+                CommandResponseToReceiveTaskRunExecutionStatusUCRq(),
+                ack_after_processing=settings.ack_statuses_after_upload or bool(status_spool),
+                durable=True,
+                passive=is_passive, ))
 
     fastapi_server = FastAPIServer.from_settings(settings.fastapi_server)
     fastapi_server.app.state.auth_facade = auth_use_case_facade
@@ -375,34 +491,56 @@ async def main():
     fastapi_server.app.state.admin_use_case_facade = admin_use_case_facade
     fastapi_server.app.state.analytical_metrics_service = analytical_metrics_service
     fastapi_server.app.state.api_token_facade = api_token_facade
+    fastapi_server.app.state.circuit_breaker = circuit_breaker
+    fastapi_server.app.state.payload_provider = payload_provider
+    fastapi_server.app.state.receive_task_run_execution_status_uc = receive_task_run_execution_status_uc
+    fastapi_server.app.state.task_run_deadline_metrics_provider = task_run_deadline_metrics_provider
     fastapi_server.app.add_middleware(AuthMiddleware)
 
     startable = [
         rmq_producer_connection,
         rmq_producer,
+        rmq_channel_pool,
+        queue_topology,
         rmq_consumer_connection,
-        rmq_consumer,
-        rmq_task_run_execution_status_consumer,
+        *rmq_consumers,
+        *rmq_task_run_execution_status_consumers,
 
     ]
+    # Команды CANCEL отправляются из API, поэтому в режиме API продюсер тоже запускается
+    api_startable = [rmq_producer_connection, rmq_producer, rmq_channel_pool] \
+        if settings.use_cancel_commands else []
+    create_task_runs_runner = PeriodicRunner(create_task_runs_uc.apply, 30, run_name="Create task runs from tasks",
+                                             verbose_exception=True,
+                                             method_args=[CreateTaskRunsUCRq()],
+                                             wake_up_delay_s=settings.wake_up_delay_s)
+    retrieve_and_send_task_runs_runner = PeriodicRunner(retrieve_and_send_task_runs_uc.apply, 30,
+                                                        run_name="Send task runs to execution",
+                                                        method_args=[RetrieveAndSendTaskRunsUCRq()],
+                                                        wake_up_delay_s=settings.wake_up_delay_s)
+    if settings.use_wake_up_notifications:
+        startable.extend([
+            PgNotificationListener(database, TASKS_CREATED_CHANNEL,
+                                   lambda group_key: create_task_runs_runner.wake_up()),
+            PgNotificationListener(database, TASK_RUNS_WAITING_CHANNEL,
+                                   lambda group_key: retrieve_and_send_task_runs_runner.wake_up()),
+        ])
     periodic_runners = [
-        PeriodicRunner(create_task_runs_uc.apply, 30, run_name="Create task runs from tasks", verbose_exception=True,
-                       method_args=[CreateTaskRunsUCRq()]),
+        create_task_runs_runner,
         PeriodicRunner(transit_status_from_queued_to_interrupted_uc.apply, 30, run_name="QUEUED -> INTERRUPTED",
                        # verbose_exception=True,
                        method_args=[TransitTaskRunStatusUCRq(ttl_seconds=300)]),
         PeriodicRunner(transit_status_from_execution_to_interrupted_uc.apply, 30, run_name="EXECUTION -> INTERRUPTED",
-                       method_args=[TransitTaskRunStatusUCRq(ttl_seconds=300)]),
+                       method_args=[TransitTaskRunStatusUCRq(ttl_seconds=int(settings.default_execution_lease_s))]),
         PeriodicRunner(transit_status_from_interrupted_to_waiting_uc.apply, 30, run_name="INTERRUPTED -> WAITING",
                        method_args=[TransitTaskRunStatusUCRq(ttl_seconds=0)]),
         PeriodicRunner(transit_status_from_temp_error_to_waiting_uc.apply, 30, run_name="TEMP_ERROR -> WAITING",
                        method_args=[TransitTaskRunStatusUCRq(ttl_seconds=30)]),
-        PeriodicRunner(retrieve_and_send_task_runs_uc.apply, 30, run_name="Send task runs to execution",
-                       method_args=[RetrieveAndSendTaskRunsUCRq()]),
+        retrieve_and_send_task_runs_runner,
         PeriodicRunner(transit_task_status_uc.apply, 30, run_name="Transit task status to SUCCEED or ERROR",
                        method_args=[TransitTaskStatusUCRq()]),
         PeriodicRunner(task_status_log_cleaner.clean_logs, 86_400, 30, run_name="Clean task run status logs"),
-        PeriodicRunner(receive_task_run_execution_status_uc.upload_command_responses, 30,
+        PeriodicRunner(receive_task_run_execution_status_uc.upload_command_responses, settings.status_upload_period_s,
                        run_name="Upload received task run statuses"),
         PeriodicRunner(cleanup_task_runs_uc.apply, 86400, 600, run_name="Clean old task run",
                        method_args=[CleanupTaskRunsUCRq()]),
@@ -411,11 +549,20 @@ async def main():
 
     ]
     logger.info(f"service configured as {settings.service_type}")
+    # Сброс кэша нужен и API, и воркерам, поэтому слушатель запускается при любом типе сервиса
+    await pg_notify_cache_invalidator.start()
     if settings.service_type in (ServiceType.WORKER, ServiceType.MONOLITH):
+        # Статусы из журнала загружаются до запуска потребителей, чтобы не обогнать новые ответы тех же запусков
+        if status_spool:
+            await status_spool.start()
+            await receive_task_run_execution_status_uc.replay_spool()
         for startable_obj in startable:
             await startable_obj.start()
         for periodic_runner in periodic_runners:
             periodic_runner.create_periodic_task()
+    elif settings.service_type == ServiceType.API:
+        for startable_obj in api_startable:
+            await startable_obj.start()
     try:
         if settings.service_type in (ServiceType.API, ServiceType.MONOLITH):
             create_first_admin_uc_rs = await create_first_admin_uc.apply(
@@ -433,8 +580,14 @@ async def main():
                 periodic_runner.cancel()
             for startable_obj in startable:
                 await startable_obj.stop()
+            if status_spool:
+                await status_spool.stop()
+        elif settings.service_type == ServiceType.API:
+            for startable_obj in api_startable:
+                await startable_obj.stop()
         if settings.service_type in (ServiceType.API, ServiceType.MONOLITH):
             await fastapi_server.stop()
+        await pg_notify_cache_invalidator.stop()
 
 
 if __name__ == '__main__':
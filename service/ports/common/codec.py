@@ -0,0 +1,241 @@
+"""
+Кодеки сообщений брокера.
+
+Формат тела сообщения передается свойствами AMQP content_type и content_encoding: продюсер кодирует
+сообщения выбранным кодеком и, если тело больше порога, сжимает его; потребитель выбирает декодер
+по свойствам полученного сообщения. Сообщение без content_type считается JSON — так отправляют
+исполнители, не поддерживающие кодеки.
+
+msgpack, zstandard и lz4 — необязательные зависимости: кодек без установленной библиотеки
+нельзя выбрать для отправки, а потребитель его не регистрирует.
+"""
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, List
+
+from pydantic import BaseModel
+
+from service.ports.common.convert_utils import to_bytes
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+CONTENT_TYPE_JSON = 'application/json'
+CONTENT_TYPE_MSGPACK = 'application/msgpack'
+CONTENT_ENCODING_ZSTD = 'zstd'
+CONTENT_ENCODING_LZ4 = 'lz4'
+
+
+class Codec(ABC):
+
+    @property
+    @abstractmethod
+    def content_type(self) -> str:
+        pass
+
+    @abstractmethod
+    def encode(self, item: dict | list | BaseModel) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, body: bytes) -> Any:
+        pass
+
+
+class JSONCodec(Codec):
+    """ JSON с отступами, как сообщения отправлялись до появления кодеков """
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPE_JSON
+
+    def encode(self, item: dict | list | BaseModel) -> bytes:
+        return to_bytes(item)
+
+    def decode(self, body: bytes) -> Any:
+        return json.loads(body)
+
+
+class FastJSONCodec(Codec):
+    """ Компактный JSON: модели сериализует pydantic-core, словари — orjson, если он установлен """
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPE_JSON
+
+    def encode(self, item: dict | list | BaseModel) -> bytes:
+        if isinstance(item, BaseModel):
+            return item.model_dump_json().encode('utf-8')
+        if orjson:
+            return orjson.dumps(item, default=str)
+        return json.dumps(item, default=str, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, body: bytes) -> Any:
+        if orjson:
+            return orjson.loads(body)
+        return json.loads(body)
+
+
+class MsgpackCodec(Codec):
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack codec requires the msgpack package")
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPE_MSGPACK
+
+    def encode(self, item: dict | list | BaseModel) -> bytes:
+        if isinstance(item, BaseModel):
+            item = item.model_dump(mode='json')
+        return msgpack.packb(item, default=str)
+
+    def decode(self, body: bytes) -> Any:
+        return msgpack.unpackb(body, raw=False)
+
+
+class Compressor(ABC):
+
+    @property
+    @abstractmethod
+    def content_encoding(self) -> str:
+        pass
+
+    @abstractmethod
+    def compress(self, body: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def decompress(self, body: bytes) -> bytes:
+        pass
+
+
+class ZstdCompressor(Compressor):
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    @property
+    def content_encoding(self) -> str:
+        return CONTENT_ENCODING_ZSTD
+
+    def compress(self, body: bytes) -> bytes:
+        return self._compressor.compress(body)
+
+    def decompress(self, body: bytes) -> bytes:
+        return self._decompressor.decompress(body)
+
+
+class LZ4Compressor(Compressor):
+
+    def __init__(self):
+        if lz4_frame is None:
+            raise ImportError("lz4 compression requires the lz4 package")
+
+    @property
+    def content_encoding(self) -> str:
+        return CONTENT_ENCODING_LZ4
+
+    def compress(self, body: bytes) -> bytes:
+        return lz4_frame.compress(body)
+
+    def decompress(self, body: bytes) -> bytes:
+        return lz4_frame.decompress(body)
+
+
+CODEC_BY_NAME = {'json': JSONCodec, 'fast_json': FastJSONCodec, 'msgpack': MsgpackCodec}
+COMPRESSOR_BY_NAME = {CONTENT_ENCODING_ZSTD: ZstdCompressor, CONTENT_ENCODING_LZ4: LZ4Compressor}
+
+
+@dataclass
+class EncodedMessage:
+    body: bytes
+    content_type: str
+    content_encoding: Optional[str] = None
+
+
+class MessageEncoder:
+    """ Кодирует сообщение для отправки; тело не меньше compression_threshold_bytes сжимается """
+
+    def __init__(self, codec: Codec, compressor: Optional[Compressor] = None,
+                 compression_threshold_bytes: int = 4096, ):
+        self._codec = codec
+        self._compressor = compressor
+        self._compression_threshold_bytes = compression_threshold_bytes
+
+    @classmethod
+    def from_names(cls, codec_name: str = 'json', compression_name: Optional[str] = None,
+                   compression_threshold_bytes: int = 4096) -> 'MessageEncoder':
+        compressor = COMPRESSOR_BY_NAME[compression_name]() if compression_name else None
+        return cls(CODEC_BY_NAME[codec_name](), compressor, compression_threshold_bytes)
+
+    def encode(self, item: bytes | dict | str | BaseModel) -> EncodedMessage:
+        # bytes и str уже закодированы отправителем и передаются как есть
+        if isinstance(item, (bytes, str)):
+            return EncodedMessage(body=to_bytes(item), content_type=CONTENT_TYPE_JSON)
+        body = self._codec.encode(item)
+        if self._compressor and len(body) >= self._compression_threshold_bytes:
+            return EncodedMessage(body=self._compressor.compress(body),
+                                  content_type=self._codec.content_type,
+                                  content_encoding=self._compressor.content_encoding)
+        return EncodedMessage(body=body, content_type=self._codec.content_type)
+
+
+class MessageDecoder:
+    """ Декодирует сообщение кодеком и декомпрессором, указанными в его свойствах """
+
+    def __init__(self, codecs: List[Codec] = None, compressors: List[Compressor] = None):
+        if codecs is None:
+            codecs = [FastJSONCodec()] + ([MsgpackCodec()] if msgpack else [])
+        if compressors is None:
+            compressors = [compressor_class() for name, compressor_class in COMPRESSOR_BY_NAME.items()
+                           if _is_compressor_available(name)]
+        self._codec_by_content_type: Dict[str, Codec] = {codec.content_type: codec for codec in codecs}
+        self._compressor_by_content_encoding: Dict[str, Compressor] = {
+            compressor.content_encoding: compressor for compressor in compressors
+        }
+
+    def decode(self, body: bytes, content_type: Optional[str] = None,
+               content_encoding: Optional[str] = None) -> Any:
+        if content_encoding:
+            try:
+                compressor = self._compressor_by_content_encoding[content_encoding]
+            except KeyError:
+                raise ValueError(f"unsupported content encoding: {content_encoding}")
+            body = compressor.decompress(body)
+        try:
+            # Параметры типа вроде charset на выбор кодека не влияют
+            codec = self._codec_by_content_type[(content_type or CONTENT_TYPE_JSON).split(';')[0].strip()]
+        except KeyError:
+            raise ValueError(f"unsupported content type: {content_type}")
+        return codec.decode(body)
+
+
+def _is_compressor_available(name: str) -> bool:
+    if name == CONTENT_ENCODING_ZSTD:
+        return zstandard is not None
+    if name == CONTENT_ENCODING_LZ4:
+        return lz4_frame is not None
+    return False
@@ -0,0 +1,3 @@
+class PoisonMessageError(Exception):
+    """ Сообщение не удается обработать, и повторная доставка этого не изменит: его не возвращают в очередь """
+    pass
@@ -15,7 +15,8 @@ class PeriodicRunner:
                  run_name: str = None,
                  verbose_exception: bool = False,
                  method_args: List = None,
-                 method_kwargs: Dict = None):
+                 method_kwargs: Dict = None,
+                 wake_up_delay_s: float = 0):
         self._run_name = run_name or method.__name__
         self._timeout = ChangeableFloatParameter(name=self._run_name,
                                                  value=timeout) if isinstance(timeout, (float, int)) else timeout
@@ -24,6 +25,10 @@ class PeriodicRunner:
         self._method_kwargs = method_kwargs if method_kwargs else {}
         self._before_first_run_timeout = before_first_run_timeout
         self._verbose_exception = verbose_exception
+        # После внеочередного пробуждения запуск откладывается на wake_up_delay_s,
+        # чтобы серия пробуждений привела к одному запуску
+        self._wake_up_delay_s = wake_up_delay_s
+        self._wake_up_event = asyncio.Event()
 
         self._is_coroutine_function = asyncio.iscoroutinefunction(self._method)
 
@@ -36,6 +41,11 @@ class PeriodicRunner:
     def cancel(self):
         self._task.cancel()
 
+    def wake_up(self):
+        """Запускает метод, не дожидаясь окончания таймаута; пробуждения во время выполнения
+        метода схлопываются в один внеочередной запуск"""
+        self._wake_up_event.set()
+
     def create_periodic_task(self) -> Task:
         self._task = asyncio.create_task(self.run_periodically())
         return self._task
@@ -58,4 +68,15 @@ class PeriodicRunner:
                 if self._verbose_exception:
                     logger.exception(e)
             logger.debug(f"will sleep {self._timeout.value} before run {self._run_name}")
-            await asyncio.sleep(self._timeout.value)
+            await self._sleep()
+
+    async def _sleep(self):
+        try:
+            await asyncio.wait_for(self._wake_up_event.wait(), self._timeout.value)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            logger.debug(f"woken up {self._run_name}")
+            if self._wake_up_delay_s > 0:
+                await asyncio.sleep(self._wake_up_delay_s)
+        self._wake_up_event.clear()
@@ -0,0 +1,25 @@
+import enum
+from abc import ABC, abstractmethod
+
+
+class ReferenceCacheName(str, enum.Enum):
+    """Имена кэшей справочных данных, которые сбрасываются вместе"""
+    TASK_GROUP = "task_group"
+    MONITORING_ALGORITHM = "monitoring_algorithm"
+    PAYLOAD = "payload"
+
+
+class Cache(ABC):
+
+    @abstractmethod
+    def invalidate(self):
+        """ Сбрасывает кэш текущего процесса """
+        pass
+
+
+class CacheInvalidator(ABC):
+
+    @abstractmethod
+    async def invalidate(self, cache_name: ReferenceCacheName):
+        """ Сбрасывает кэш справочных данных во всех процессах сервиса """
+        pass
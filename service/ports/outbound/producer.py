@@ -1,20 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import Type, List, Dict
+from typing import Type, List, Dict, Optional
 
 from pydantic import BaseModel
 
-from service.ports.common.convert_utils import to_bytes
-
 
 class DataProducerI(ABC):
 
     async def produce_list(self,
                            items: List[bytes | dict | str | BaseModel],
-                           to: str,
-                           headers: List[dict] = None,
-                           item_params: Dict = None):
-        for index, item in enumerate(items):
-            await self.produce(item, to, headers=headers, item_params=item_params)
+                           to: Optional[str] = None,
+                           headers: dict = None,
+                           item_params: Dict = None) -> List[bool]:
+        return await self.produce_many(items, [to] * len(items), headers=headers, item_params=item_params)
+
+    async def produce_many(self,
+                           items: List[bytes | dict | str | BaseModel],
+                           to: List[Optional[str]],
+                           headers: dict = None,
+                           item_params: dict = None) -> List[bool]:
+        """
+        Отправляет пачку сообщений: items[i] отправляется в to[i].
+        Возвращает признак успешной отправки каждого сообщения в порядке items.
+        По умолчанию сообщения отправляются последовательно через produce
+        """
+        return [await self.produce(item, item_to, headers=headers, item_params=item_params)
+                for item, item_to in zip(items, to)]
 
     @abstractmethod
     async def produce(self, item: bytes | dict | str | BaseModel,
@@ -29,20 +39,20 @@ class DirectDataProducer(DataProducerI):
         self._producer = producer
 
     async def produce(self, item: BaseModel, to: str = None, headers: dict = None, item_params: dict = None, ) -> bool:
-        item_encoded = to_bytes(item)
+        # Сообщения кодирует нижележащий продюсер, чтобы формат тела определял его кодек
         if not to:
             target_to = self._to
         else:
             target_to = to
-        return await self._producer.produce(item_encoded, target_to, headers, item_params)
+        return await self._producer.produce(item, target_to, headers, item_params)
 
-    async def produce_list(self,
+    async def produce_many(self,
                            items: List[bytes | dict | str | BaseModel],
-                           to: str = None,
-                           headers: List[dict] = None,
-                           item_params: List[dict] = None) :
-        for index, item in enumerate(items):
-            await self.produce(item, to, headers=headers, item_params=item_params)
+                           to: List[Optional[str]],
+                           headers: dict = None,
+                           item_params: dict = None) -> List[bool]:
+        target_to = [item_to or self._to for item_to in to]
+        return await self._producer.produce_many(items, target_to, headers, item_params)
 
 
 from abc import abstractmethod
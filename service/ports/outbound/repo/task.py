@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from datetime import datetime
+from typing import List, Dict, Optional
 
 from pydantic import BaseModel
 
+from service.domain.schemas.enums import TaskStatus, TaskRunStatus
+from service.domain.schemas.task import TasksFilter
+from service.ports.outbound.repo.transaction import Transaction
+
 
 class TasksToTransitStatus(BaseModel):
     succeed_ids: List[int]
@@ -25,3 +30,28 @@ class TaskStatisticsProvider(ABC):
     @abstractmethod
     async def provide_groups_statistics(self) -> TaskGroupsStatistics:
         pass
+
+
+class TasksStatusBulkUpdate(BaseModel):
+    tasks_count: int = 0
+    task_runs_ids: List[int] = []
+    task_runs_group_names: List[str] = []
+    task_runs_previous_statuses: List[TaskRunStatus] = []  # Статусы запусков до обновления, по порядку task_runs_ids
+
+
+class TaskStatusBulkUpdater(ABC):
+
+    @abstractmethod
+    async def update_by_filter(self,
+                               tasks_filter: TasksFilter,
+                               from_statuses: List[TaskStatus],
+                               to_status: TaskStatus,
+                               task_run_from_statuses: List[TaskRunStatus],
+                               task_run_to_status: TaskRunStatus,
+                               status_updated_at: datetime,
+                               transaction: Optional[Transaction] = None, ) -> TasksStatusBulkUpdate:
+        """
+        Одним запросом переводит отобранные задачи из from_statuses в to_status с записью в историю статусов задач,
+        а их запуски — из task_run_from_statuses в task_run_to_status
+        """
+        pass
@@ -1,9 +1,26 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Union
 
-from service.domain.schemas.task_run import TaskRun, TaskRunTimeIntervalExecutionBounds
+from service.domain.schemas.task_run import TaskRun, TaskRunTimeIntervalExecutionBounds, TaskRunPK
 from service.domain.schemas.task_run_metrics import TaskRunMetrics, TaskRunAvgMetrics, StatusMetrics, \
-    TasksRunsStatusMetrics
+    TasksRunsStatusMetrics, TaskRunDeadlineMetrics
+from service.ports.outbound.repo.abstract import Repo
+from service.ports.outbound.repo.fields import UpdateFields
+from service.ports.outbound.repo.transaction import Transaction
+
+
+class TaskRunRepo(Repo, ABC):
+    @abstractmethod
+    async def update_execution_states(self,
+                                      fields_by_task_run_pk: Dict[TaskRunPK, UpdateFields],
+                                      transaction: Optional[Transaction] = None) -> None:
+        """
+        Пакетно применяет ответы исполнителей к запускам: status и status_updated_at записываются, только если
+        last_reported_at (отметка последнего примененного ответа) не новее нового status_updated_at,
+        а lease_expires_at только продлевает аренду. Ответ, пришедший позже уже записанного более нового
+        статуса, не откатывает запуск; отметки сервера с отметками исполнителя не сравниваются
+        """
+        pass
 
 
 class WaitingTaskRunProvider(ABC):
@@ -28,6 +45,13 @@ class TaskRunMetricsProvider(ABC):
         pass
 
 
+class TaskRunDeadlineMetricsProvider(ABC):
+    @abstractmethod
+    async def provide_deadline_metrics_by_period(self, period_s: int,
+                                                 group_name: Optional[str] = None) -> TaskRunDeadlineMetrics:
+        pass
+
+
 class RecentTaskRunsProvider(ABC):
 
     @abstractmethod
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class Spool(ABC):
+    """
+    Локальный журнал упреждающей записи: записи переживают перезапуск процесса, пока их не удалят.
+
+    Журнал пишется сегментами. Запись попадает в текущий сегмент до первого переключения корутины append,
+    а seal закрывает сегмент до своего первого переключения: вызывающий код может связать записи
+    с сегментами без блокировок, если пишет в журнал и закрывает сегменты без await между своими шагами
+    """
+
+    @abstractmethod
+    async def append(self, record: bytes):
+        """ Дописывает запись в текущий сегмент; завершается, когда запись сброшена на диск """
+        pass
+
+    @abstractmethod
+    async def seal(self) -> List[str]:
+        """ Закрывает текущий сегмент и возвращает сегменты, закрытые с прошлого вызова; новые записи
+         идут в новый сегмент """
+        pass
+
+    @abstractmethod
+    def get_recovered_segments(self) -> List[str]:
+        """ Сегменты, оставшиеся от прошлого запуска процесса, в порядке записи """
+        pass
+
+    @abstractmethod
+    async def read(self, segment: str) -> List[bytes]:
+        """ Записи сегмента; недописанный при аварии хвост пропускается """
+        pass
+
+    @abstractmethod
+    async def quarantine(self, records: List[bytes]) -> str:
+        """ Сохраняет записи, которые не удается обработать, в отдельный сегмент; такие сегменты не возвращаются
+         get_recovered_segments и не удаляются truncate. Возвращает имя сегмента """
+        pass
+
+    @abstractmethod
+    async def truncate(self, segments: List[str]):
+        """ Удаляет сегменты, записи которых больше не нужны """
+        pass
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+
+class WakeUpNotifier(ABC):
+
+    @abstractmethod
+    async def notify(self, group_keys: Iterable[str]):
+        """ Сообщает процессам сервиса, что в группах задач появилась работа, чтобы не ждать периодического запуска.
+         Ошибка отправки не должна прерывать вызывающий код: периодический запуск остается страховкой """
+        pass
@@ -1,6 +1,6 @@
 import enum
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -48,6 +48,54 @@ class ServiceSettings(BaseSettings):
 
     balancing_algorithm_type: BalancingAlgorithmType = BalancingAlgorithmType.ADAPTIVE_MODEL
 
+    periodic_max_tasks_per_tick: Optional[int] = None
+    retro_task_run_batch_share: float = 0.2
+    # Запуск, ожидающий отправки дольше этого времени, поднимается в начало очереди группы независимо
+    # от крайнего срока: просроченные запуски и запуски без срока не голодают при постоянном отставании
+    waiting_task_run_max_wait_s: Optional[float] = 3600
+    adaptive_timeout_factor: float = 2
+
+    use_circuit_breaker: bool = True
+    circuit_breaker_period_s: int = 300
+    circuit_breaker_failure_rate_threshold: float = 0.5
+    circuit_breaker_open_timeout_s: int = 120
+    circuit_breaker_probe_batch_size: int = 5
+
+    use_reference_cache: bool = True
+    reference_cache_ttl_s: float = 300
+    payload_cache_max_size_bytes: int = 64 * 1024 * 1024
+
+    use_wake_up_notifications: bool = True
+    wake_up_delay_s: float = 0.5
+
+    use_cancel_commands: bool = True
+    default_execution_lease_s: float = 300
+    # Исполнители получают SlimCommand вместо запуска целиком и отвечают с task_run_id
+    use_slim_commands: bool = False
+    # Статусы подтверждаются брокеру после коммита пачки, в которую они попали; prefetch_count потребителя
+    # должен вмещать статусы, приходящие за период выгрузки
+    ack_statuses_after_upload: bool = True
+    status_upload_period_s: float = 30
+    # Пачка статусов выгружается, не дожидаясь периода, как только наберет столько ответов
+    status_upload_batch_size: Optional[int] = 2000
+    # При стольких ответах в накопителе и выгружаемой пачке прием статусов приостанавливается
+    status_max_buffered: Optional[int] = 20000
+    # Потребителей (каналов) очереди статусов; ответы одного запуска обрабатываются не по порядку: статус
+    # запуска не заменяется ответом с более ранним created_at, но история и прогресс пишутся в порядке обработки
+    status_consumers_count: int = 1
+    # Шард-очереди <очередь статусов>.<task_run_id % N>: каждую читает один потребитель, порядок ответов запуска
+    # сохраняется; исполнители выбирают очередь по make_status_queue_name
+    status_queue_shards: int = 1
+    # Каталог локального журнала статусов: статус подтверждается брокеру после записи в журнал, не дожидаясь
+    # коммита пачки; при старте статусы, не выгруженные прошлым запуском, загружаются из журнала
+    status_spool_dir: Optional[str] = None
+    status_spool_segment_max_bytes: int = 64 * 1024 * 1024
+    # Записи журнала, пришедшие во время fsync и за эту задержку, сбрасываются на диск следующим одним fsync
+    status_spool_fsync_delay_s: float = 0
+    # После стольких неудачных выгрузок подряд пачка из журнала откладывается в карантин (<номер>.dead в каталоге
+    # журнала), чтобы не останавливать прием статусов; None — повторять без ограничения
+    status_spool_max_upload_attempts: Optional[int] = 10
+
     def ch_uri_as_params(self) -> Dict[str, Any]:
         uri = URI.from_str(self.ch_uri)
         return {
@@ -9,7 +9,7 @@ from service.adapters.outbound.repo.sa.impls.monitoring_algorithm import SAPerio
     SAMonitoringAlgorithmRepo, SASingleMonitoringAlgorithmRepo
 from service.adapters.outbound.repo.sa.impls.payload import SAPayloadRepo
 from service.adapters.outbound.repo.sa.impls.project import SAProjectRepo
-from service.adapters.outbound.repo.sa.impls.task import SATaskRepo, SATaskProvider
+from service.adapters.outbound.repo.sa.impls.task import SATaskRepo, SATaskProvider, SATaskStatusBulkUpdater
 from service.adapters.outbound.repo.sa.impls.task_group import SATaskGroupRepo
 from service.adapters.outbound.repo.sa.impls.task_group_by_project import SATaskGroupByProjectRepo
 from service.adapters.outbound.repo.sa.impls.task_run import SATaskRunRepo, SAWaitingTaskRunProvider, \
@@ -29,6 +29,8 @@ from service.domain.services.uniqueness_payload_checker import UniquenessPayload
 from service.domain.use_cases.external.auth.create_first_admin import CreateFirstAdminUC
 from service.domain.use_cases.external.auth.create_user import CreateUserUC
 from service.domain.use_cases.external.create_tasks import CreateTasksUC
+from service.domain.use_cases.external.tasks_by_filter import CancelTasksByFilterUC, PauseTasksByFilterUC, \
+    ResumeTasksByFilterUC
 from service.domain.use_cases.external.get_task_group_statistics import GetAllTaskGroupStatisticsUC
 from service.domain.use_cases.external.monitoring_algorithm import CreateMonitoringAlgorithmUC, \
     GetAllMonitoringAlgorithmsUC
@@ -168,6 +170,26 @@ def sa_task_run_metrics_provider(database):
 def sa_task_provider(database):
     return SATaskProvider(database)
 
+
+@pytest.fixture
+def sa_task_status_bulk_updater(database):
+    return SATaskStatusBulkUpdater(database)
+
+
+@pytest.fixture
+def cancel_tasks_by_filter_uc(sa_task_status_bulk_updater, sa_task_run_status_log_repo, sa_transaction_factory):
+    return CancelTasksByFilterUC(sa_task_status_bulk_updater, sa_task_run_status_log_repo, sa_transaction_factory)
+
+
+@pytest.fixture
+def pause_tasks_by_filter_uc(sa_task_status_bulk_updater, sa_task_run_status_log_repo, sa_transaction_factory):
+    return PauseTasksByFilterUC(sa_task_status_bulk_updater, sa_task_run_status_log_repo, sa_transaction_factory)
+
+
+@pytest.fixture
+def resume_tasks_by_filter_uc(sa_task_status_bulk_updater, sa_task_run_status_log_repo, sa_transaction_factory):
+    return ResumeTasksByFilterUC(sa_task_status_bulk_updater, sa_task_run_status_log_repo, sa_transaction_factory)
+
 @pytest.fixture
 def sa_latest_task_run_time_interval_execution_bounds_provider(database):
     return SALatestTaskRunTimeIntervalExecutionBoundsProvider(database)
@@ -242,12 +264,18 @@ def transit_task_status_uc(
         sa_task_provider,
         sa_task_status_log_repo,
         sa_transaction_factory,
+        sa_periodic_monitoring_algorithm_repo,
+        sa_task_run_repo,
+        sa_task_run_time_interval_progress_repo,
 ) -> TransitTaskStatusUC:
     return TransitTaskStatusUC(
         task_repo=sa_task_repo,
         task_provider=sa_task_provider,
         task_status_log_repo=sa_task_status_log_repo,
         transaction_factory=sa_transaction_factory,
+        periodic_monitoring_algorithm_repo=sa_periodic_monitoring_algorithm_repo,
+        task_run_repo=sa_task_run_repo,
+        task_run_time_interval_progress_repo=sa_task_run_time_interval_progress_repo,
     )
 
 
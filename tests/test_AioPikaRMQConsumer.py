@@ -0,0 +1,79 @@
+from typing import List
+
+import pytest
+
+from service.adapters.inbound.consumer.rmq import AioPikaRMQConsumer
+from service.ports.common.codec import MessageDecoder
+from service.ports.common.exceptions import PoisonMessageError
+from service.ports.common.input_converter import InputConverterI
+
+
+class FakeIncomingMessage:
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.content_type = 'application/json'
+        self.content_encoding = None
+        self.settlements: List[str] = []
+
+    async def ack(self):
+        self.settlements.append('ack')
+
+    async def nack(self, requeue: bool = True):
+        self.settlements.append(f'nack requeue={requeue}')
+
+    async def reject(self, requeue: bool = False):
+        self.settlements.append(f'reject requeue={requeue}')
+
+
+class IdentityConverter(InputConverterI):
+
+    def convert(self, raw_message):
+        return raw_message
+
+
+@pytest.mark.asyncio
+async def test_acks_message_after_processing():
+    processed = []
+
+    async def process(message):
+        processed.append(message)
+
+    consumer = AioPikaRMQConsumer(connection=None, prefetch_count=10, message_decoder=MessageDecoder())
+    callback = consumer._acking_after_processing_callback_bridge(process, IdentityConverter())
+    message = FakeIncomingMessage(b'{"a": 1}')
+
+    await callback(message)
+
+    assert processed == [{'a': 1}]
+    assert message.settlements == ['ack']
+
+
+@pytest.mark.asyncio
+async def test_requeues_failed_and_rejects_malformed_messages():
+    async def process(message):
+        raise ConnectionError('database is unavailable')
+
+    consumer = AioPikaRMQConsumer(connection=None, prefetch_count=10, message_decoder=MessageDecoder())
+    callback = consumer._acking_after_processing_callback_bridge(process, IdentityConverter())
+    failed_message, malformed_message = FakeIncomingMessage(b'{"a": 1}'), FakeIncomingMessage(b'{')
+
+    await callback(failed_message)
+    await callback(malformed_message)
+
+    assert failed_message.settlements == ['nack requeue=True']
+    assert malformed_message.settlements == ['reject requeue=False']
+
+
+@pytest.mark.asyncio
+async def test_rejects_poison_message_without_requeue():
+    async def process(message):
+        raise PoisonMessageError('violates constraint')
+
+    consumer = AioPikaRMQConsumer(connection=None, prefetch_count=10, message_decoder=MessageDecoder())
+    callback = consumer._acking_after_processing_callback_bridge(process, IdentityConverter())
+    message = FakeIncomingMessage(b'{"a": 1}')
+
+    await callback(message)
+
+    assert message.settlements == ['reject requeue=False']
@@ -0,0 +1,130 @@
+import asyncio
+from typing import List, Set
+
+import pytest
+
+from service.adapters.outbound.producer.rmq import AioPikaRMQProducer, AioPikaRMQChannelPool
+from service.ports.common.codec import MessageEncoder, FastJSONCodec, CONTENT_TYPE_JSON
+from service.ports.outbound.producer import DirectDataProducer
+
+
+class FakeExchange:
+    """Обменник, который подтверждает публикации с задержкой и отклоняет первые попытки для failing_keys"""
+
+    def __init__(self, failing_keys: Set[str] = None, failures_per_key: int = 1):
+        self._failures_left = {key: failures_per_key for key in (failing_keys or set())}
+        self.published: List[str] = []
+        self.messages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def publish(self, message, routing_key: str):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if self._failures_left.get(routing_key, 0) > 0:
+                self._failures_left[routing_key] -= 1
+                raise ConnectionError(f'nack for {routing_key}')
+            self.published.append(routing_key)
+            self.messages.append(message)
+        finally:
+            self.in_flight -= 1
+
+
+def _make_producer(exchange: FakeExchange, max_retries: int = 3, max_in_flight: int = 4,
+                   message_encoder: MessageEncoder = None) -> AioPikaRMQProducer:
+    producer = AioPikaRMQProducer(connection=None, exchange_name='', exchange_type='direct', exchange_params=None,
+                                  routing_key='default', max_retries=max_retries, retry_timeout=0,
+                                  max_in_flight=max_in_flight, message_encoder=message_encoder)
+    producer._exchange = exchange
+    return producer
+
+
+@pytest.mark.asyncio
+async def test_produce_many_bounds_in_flight_and_retries_only_failed():
+    exchange = FakeExchange(failing_keys={'q3', 'q7'})
+    producer = _make_producer(exchange)
+
+    is_produced = await producer.produce_many([b'{}'] * 10, [f'q{i}' for i in range(10)])
+
+    assert is_produced == [True] * 10
+    assert exchange.max_in_flight == 4
+    assert sorted(exchange.published) == sorted(f'q{i}' for i in range(10))
+    assert exchange.published[-2:] == ['q3', 'q7']
+
+
+@pytest.mark.asyncio
+async def test_produce_many_reports_messages_failed_after_retries():
+    exchange = FakeExchange(failing_keys={'q1'}, failures_per_key=5)
+    producer = _make_producer(exchange, max_retries=2)
+
+    is_produced = await producer.produce_many([b'{}'] * 3, ['q0', 'q1', None])
+
+    assert is_produced == [True, False, True]
+    assert exchange.published == ['q0', 'default']
+
+
+@pytest.mark.asyncio
+async def test_produce_list_sends_batch_through_produce_many():
+    exchange = FakeExchange()
+    producer = DirectDataProducer('default', _make_producer(exchange))
+
+    is_produced = await producer.produce_list([{'a': 1}, {'a': 2}])
+
+    assert is_produced == [True, True]
+    assert exchange.published == ['default', 'default']
+
+
+@pytest.mark.asyncio
+async def test_produce_sets_content_type_of_encoder():
+    exchange = FakeExchange()
+    producer = DirectDataProducer('default', _make_producer(exchange, message_encoder=MessageEncoder(FastJSONCodec())))
+
+    await producer.produce_list([{'a': 1}])
+
+    assert exchange.messages[0].body == b'{"a":1}'
+    assert exchange.messages[0].content_type == CONTENT_TYPE_JSON
+    assert exchange.messages[0].content_encoding is None
+
+
+class FakeChannel:
+
+    def __init__(self):
+        self.is_closed = False
+
+    async def close(self):
+        self.is_closed = True
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.channels: List[FakeChannel] = []
+
+    @property
+    def connection(self):
+        return self
+
+    async def channel(self):
+        channel = FakeChannel()
+        self.channels.append(channel)
+        return channel
+
+
+@pytest.mark.asyncio
+async def test_channel_pool_reuses_channels_and_drops_closed():
+    connection = FakeConnection()
+    channel_pool = AioPikaRMQChannelPool(connection, max_size=2)
+
+    async with channel_pool.acquire() as first_channel:
+        pass
+    async with channel_pool.acquire() as channel:
+        assert channel is first_channel
+        channel.is_closed = True
+    async with channel_pool.acquire() as channel:
+        assert channel is not first_channel
+    assert len(connection.channels) == 2
+
+    await channel_pool.stop()
+    assert all(channel.is_closed for channel in connection.channels)
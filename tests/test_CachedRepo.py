@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from service.adapters.outbound.repo.cached import CachedRepo, LocalCacheInvalidator
+from service.adapters.outbound.repo.sa.notify import PgNotifyCacheInvalidator
+from service.domain.schemas.task_group import TaskGroup, TaskGroupPK
+from service.domain.use_cases.external.task_group import UpdateTaskGroupUC, UpdateTaskGroupUCRq
+from service.ports.outbound.cache import ReferenceCacheName
+from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields
+
+
+@pytest.fixture
+def cached_task_group_repo(sa_task_group_repo):
+    return CachedRepo(sa_task_group_repo, ttl_s=300)
+
+
+async def create_task_group(sa_task_group_repo, name: str = 'test') -> TaskGroup:
+    return await sa_task_group_repo.create(TaskGroup(name=name, title='', description=''))
+
+
+@pytest.mark.asyncio
+async def test_repeated_read_served_from_cache(cached_task_group_repo, sa_task_group_repo):
+    task_group = await create_task_group(sa_task_group_repo)
+    active_filter = FilterFieldsDNF.single('is_active', True)
+
+    assert [g.id for g in await cached_task_group_repo.filter(active_filter)] == [task_group.id]
+    # Изменение в обход кэша не видно до сброса
+    await sa_task_group_repo.update(TaskGroupPK(id=task_group.id), UpdateFields.single('is_active', False))
+    assert [g.id for g in await cached_task_group_repo.filter(active_filter)] == [task_group.id]
+    assert cached_task_group_repo.hits == 1
+    assert cached_task_group_repo.misses == 1
+
+    cached_task_group_repo.invalidate()
+    assert await cached_task_group_repo.filter(active_filter) == []
+
+
+@pytest.mark.asyncio
+async def test_cached_objects_are_not_shared(cached_task_group_repo, sa_task_group_repo):
+    task_group = await create_task_group(sa_task_group_repo)
+
+    first = await cached_task_group_repo.get(TaskGroupPK(id=task_group.id))
+    first.title = 'changed by caller'
+    second = await cached_task_group_repo.get(TaskGroupPK(id=task_group.id))
+
+    assert second.title == ''
+
+
+@pytest.mark.asyncio
+async def test_write_through_cached_repo_invalidates(cached_task_group_repo, sa_task_group_repo):
+    task_group = await create_task_group(sa_task_group_repo)
+    await cached_task_group_repo.get(TaskGroupPK(id=task_group.id))
+    version = cached_task_group_repo.version
+
+    await cached_task_group_repo.update(TaskGroupPK(id=task_group.id), UpdateFields.single('title', 'new'))
+
+    assert cached_task_group_repo.version == version + 1
+    assert (await cached_task_group_repo.get(TaskGroupPK(id=task_group.id))).title == 'new'
+
+
+@pytest.mark.asyncio
+async def test_read_started_before_invalidation_is_not_cached(cached_task_group_repo, sa_task_group_repo):
+    task_group = await create_task_group(sa_task_group_repo)
+    cached_task_group_repo.invalidate()
+    version = cached_task_group_repo.version
+
+    original_get = sa_task_group_repo.get
+
+    async def get_with_concurrent_invalidation(obj_pk, transaction=None):
+        result = await original_get(obj_pk, transaction)
+        cached_task_group_repo.invalidate()
+        return result
+
+    sa_task_group_repo.get = get_with_concurrent_invalidation
+    await cached_task_group_repo.get(TaskGroupPK(id=task_group.id))
+    sa_task_group_repo.get = original_get
+    await cached_task_group_repo.get(TaskGroupPK(id=task_group.id))
+
+    assert cached_task_group_repo.version == version + 1
+    assert cached_task_group_repo.misses == 2
+    assert cached_task_group_repo.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_update_use_case_invalidates_by_name(cached_task_group_repo, sa_task_group_repo):
+    task_group = await create_task_group(sa_task_group_repo)
+    local_cache_invalidator = LocalCacheInvalidator()
+    local_cache_invalidator.register(ReferenceCacheName.TASK_GROUP, cached_task_group_repo)
+    update_task_group_uc = UpdateTaskGroupUC(cached_task_group_repo, local_cache_invalidator)
+    version = cached_task_group_repo.version
+
+    response = await update_task_group_uc.apply(UpdateTaskGroupUCRq(task_group_id=task_group.id, title='new'))
+
+    assert response.success
+    # Сброс при записи через репозиторий и повторный сброс после завершения use case
+    assert cached_task_group_repo.version == version + 2
+
+
+@pytest.mark.asyncio
+async def test_pg_notify_propagates_invalidation_between_processes(database, sa_task_group_repo):
+    task_group = await create_task_group(sa_task_group_repo)
+    api_cached_repo = CachedRepo(sa_task_group_repo)
+    worker_cached_repo = CachedRepo(sa_task_group_repo)
+    api_cache_invalidator = PgNotifyCacheInvalidator(
+        database, LocalCacheInvalidator({ReferenceCacheName.TASK_GROUP: [api_cached_repo]}), channel='test_cache')
+    worker_cache_invalidator = PgNotifyCacheInvalidator(
+        database, LocalCacheInvalidator({ReferenceCacheName.TASK_GROUP: [worker_cached_repo]}), channel='test_cache')
+    await worker_cache_invalidator.start()
+    try:
+        await worker_cached_repo.get(TaskGroupPK(id=task_group.id))
+        worker_version = worker_cached_repo.version
+        await asyncio.sleep(0.5)
+
+        await api_cache_invalidator.invalidate(ReferenceCacheName.TASK_GROUP)
+        for _ in range(50):
+            if worker_cached_repo.version > worker_version:
+                break
+            await asyncio.sleep(0.1)
+
+        assert api_cached_repo.version == 1
+        assert worker_cached_repo.version == worker_version + 1
+    finally:
+        await worker_cache_invalidator.stop()
@@ -0,0 +1,73 @@
+import pytest
+
+from service.domain.schemas.enums import TaskStatus, TaskRunStatus
+from service.domain.schemas.task import TasksFilter, TaskPK
+from service.domain.schemas.task_group import TaskGroup
+from service.domain.schemas.task_run import TaskRunPK
+from service.domain.use_cases.external.tasks_by_filter import TasksByFilterUCRq
+from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields, ConditionOperation
+from tests.utils import create_tasks, create_tasks_runs
+
+
+@pytest.mark.asyncio
+async def test_cancels_group_tasks_and_unfinished_runs(cancel_tasks_by_filter_uc, sa_task_repo, sa_payload_repo,
+                                                       sa_task_group_repo, sa_monitoring_algorithm_repo,
+                                                       sa_task_run_repo, sa_task_run_status_log_repo,
+                                                       sa_task_status_log_repo, ):
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'cancelled', 3, TaskStatus.EXECUTION)
+    other_task_group = await sa_task_group_repo.create(TaskGroup(name='other', title='', description=''))
+    other_tasks = await sa_task_repo.create_all([tasks[0].model_copy(update={'id': None,
+                                                                              'group_id': other_task_group.id})
+                                                 for _ in range(2)])
+    waiting_task_runs = await create_tasks_runs(sa_task_run_repo, tasks, 'cancelled', TaskRunStatus.WAITING)
+    queued_task_runs = await create_tasks_runs(sa_task_run_repo, tasks[:1], 'cancelled', TaskRunStatus.QUEUED)
+    succeed_task_runs = await create_tasks_runs(sa_task_run_repo, tasks[:1], 'cancelled', TaskRunStatus.SUCCEED)
+    other_task_runs = await create_tasks_runs(sa_task_run_repo, other_tasks, 'other', TaskRunStatus.WAITING)
+
+    response = await cancel_tasks_by_filter_uc.apply(
+        TasksByFilterUCRq(tasks_filter=TasksFilter(group_ids=[tasks[0].group_id])))
+
+    assert response.success
+    assert response.tasks_count == 3
+    assert response.task_runs_count == 4
+    for task in tasks:
+        assert (await sa_task_repo.get(TaskPK(id=task.id))).status == TaskStatus.CANCELLED
+    for task_run in waiting_task_runs + queued_task_runs:
+        assert (await sa_task_run_repo.get(TaskRunPK(id=task_run.id))).status == TaskRunStatus.CANCELLED
+    assert (await sa_task_run_repo.get(TaskRunPK(id=succeed_task_runs[0].id))).status == TaskRunStatus.SUCCEED
+    for task_run in other_task_runs:
+        assert (await sa_task_run_repo.get(TaskRunPK(id=task_run.id))).status == TaskRunStatus.WAITING
+    assert await sa_task_status_log_repo.count_by_fields(
+        FilterFieldsDNF.single('status', TaskStatus.CANCELLED)) == 3
+    assert await sa_task_run_status_log_repo.count_by_fields(
+        FilterFieldsDNF.single('status', TaskRunStatus.CANCELLED)) == 4
+
+
+@pytest.mark.asyncio
+async def test_filters_by_status_and_payload(cancel_tasks_by_filter_uc, sa_task_repo, sa_payload_repo,
+                                             sa_task_group_repo, sa_monitoring_algorithm_repo, ):
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'test', 3)
+    await sa_task_repo.update(TaskPK(id=tasks[0].id), UpdateFields.single('status', TaskStatus.ERROR))
+
+    response = await cancel_tasks_by_filter_uc.apply(TasksByFilterUCRq(tasks_filter=TasksFilter(
+        statuses=[TaskStatus.NEW, TaskStatus.ERROR], payload_contains={"username": "test_user"})))
+    assert response.tasks_count == 2
+
+    response = await cancel_tasks_by_filter_uc.apply(TasksByFilterUCRq(tasks_filter=TasksFilter(
+        payload_contains={"username": "unknown"})))
+    assert response.tasks_count == 0
+    assert await sa_task_repo.count_by_fields(FilterFieldsDNF.single('status', TaskStatus.CANCELLED)) == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_filter_is_rejected(cancel_tasks_by_filter_uc, sa_task_repo, sa_payload_repo,
+                                        sa_task_group_repo, sa_monitoring_algorithm_repo, ):
+    await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo, sa_payload_repo, 'test', 2)
+
+    response = await cancel_tasks_by_filter_uc.apply(TasksByFilterUCRq(tasks_filter=TasksFilter()))
+
+    assert not response.success
+    assert await sa_task_repo.count_by_fields(
+        FilterFieldsDNF.single('status', TaskStatus.CANCELLED, ConditionOperation.EQ)) == 0
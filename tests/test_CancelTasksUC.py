@@ -0,0 +1,23 @@
+import pytest
+
+from service.domain.schemas.enums import TaskStatus, TaskRunStatus
+from service.domain.schemas.task import TaskPK
+from service.domain.schemas.task_run import TaskRunPK
+from service.domain.use_cases.external.cancel_tasks import CancelTasksUC, CancelTasksUCRq
+from tests.utils import create_tasks, create_tasks_runs
+
+
+@pytest.mark.asyncio
+async def test_cancels_paused_task_and_its_runs(sa_task_repo, sa_payload_repo, sa_task_group_repo,
+                                                sa_monitoring_algorithm_repo, sa_task_run_repo,
+                                                sa_task_run_status_log_repo, sa_transaction_factory, ):
+    task, = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'paused', 1, TaskStatus.PAUSED)
+    task_run, = await create_tasks_runs(sa_task_run_repo, [task], 'paused', TaskRunStatus.WAITING)
+    uc = CancelTasksUC(sa_task_repo, sa_task_run_repo, sa_task_run_status_log_repo, sa_transaction_factory)
+
+    response = await uc.apply(CancelTasksUCRq(tasks_ids=[task.id]))
+
+    assert response.success
+    assert (await sa_task_repo.get(TaskPK(id=task.id))).status == TaskStatus.CANCELLED
+    assert (await sa_task_run_repo.get(TaskRunPK(id=task_run.id))).status == TaskRunStatus.CANCELLED
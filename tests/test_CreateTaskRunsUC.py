@@ -1,5 +1,6 @@
 from datetime import datetime, timezone, timedelta
 from typing import Dict
+from unittest.mock import AsyncMock
 
 import pytest
 import pytest_asyncio
@@ -12,7 +13,7 @@ from service.domain.schemas.task import Task
 from service.domain.schemas.task_group import TaskGroup, TaskGroupPK
 from service.domain.schemas.task_progress import TimeIntervalTaskProgress
 from service.domain.schemas.task_run import TaskRunTimeIntervalExecutionBounds, TaskRun
-from service.domain.use_cases.internal.create_task_runs import CreateTaskRunsUCRq
+from service.domain.use_cases.internal.create_task_runs import CreateTaskRunsUCRq, TimeIntervalTaskRunBuilder
 from service.ports.outbound.repo.fields import FilterFieldsDNF, ConditionOperation
 
 
@@ -382,3 +383,91 @@ async def test_apply_can_use_real_clickhouse_time_interval_tables(
     assert len(created_task_runs) == 1
     assert created_task_runs[0].execution_bounds.left_bound_at == previous_right_bound_at
     assert await ch_bounds_repo.get_latest_right_bound_by_task_ids([task.id])
+
+
+@pytest.mark.asyncio
+async def test_apply_wakes_up_dispatcher_for_groups_with_created_runs(
+        create_task_runs_uc, create_payload, create_task_v2, create_periodic_monitoring_algorithm, ):
+    wake_up_notifier = AsyncMock()
+    create_task_runs_uc._wake_up_notifier = wake_up_notifier
+    payload = await create_payload()
+    monitoring_algorithm = await create_periodic_monitoring_algorithm()
+    await create_task_v2(payload, monitoring_algorithm, time_interval_max_period=43200,
+                         time_interval_first_left_bound_depth=100_000)
+
+    await create_task_runs_uc.apply(CreateTaskRunsUCRq())
+    wake_up_notifier.notify.assert_awaited_once_with({"test"})
+
+    # Новых запусков нет — уведомлять некого
+    wake_up_notifier.reset_mock()
+    await create_task_runs_uc.apply(CreateTaskRunsUCRq())
+    wake_up_notifier.notify.assert_not_awaited()
+
+
+class TestTimeIntervalTaskRunBuilderLimits:
+    now = datetime(2024, 1, 10, tzinfo=timezone.utc)
+
+    @staticmethod
+    def build(group: TaskGroup, last_right_bound_at: datetime = None):
+        task = Task(id=1, type=TaskType.TIME_INTERVAL, status=TaskStatus.SUCCEED, status_updated_at=datetime.now(timezone.utc),
+                    payload_id=1, monitoring_algorithm_id=1, group_id=1)
+        last_bounds = None
+        if last_right_bound_at:
+            last_bounds = TaskRunTimeIntervalExecutionBounds(
+                task_run_id=1, task_id=task.id,
+                execution_bounds=TimeIntervalBounds(left_bound_at=last_right_bound_at - timedelta(hours=1),
+                                                    right_bound_at=last_right_bound_at))
+        return TimeIntervalTaskRunBuilder().build(task, group, Payload(data={}), TestTimeIntervalTaskRunBuilderLimits.now,
+                                                  last_bounds)
+
+    def test_interval_shorter_than_min_period_is_deferred(self):
+        group = TaskGroup(id=1, name='test', title='', description='', time_interval_min_period=600)
+        assert self.build(group, self.now - timedelta(seconds=300)) == []
+        assert len(self.build(group, self.now - timedelta(seconds=600))) == 1
+
+    def test_min_period_widens_split_pieces(self):
+        group = TaskGroup(id=1, name='test', title='', description='',
+                          time_interval_max_period=60, time_interval_min_period=3600)
+        intervals = self.build(group, self.now - timedelta(hours=10))
+        assert len(intervals) == 10
+        assert all(interval.duration_seconds >= 3600 for interval in intervals)
+
+    def test_max_runs_per_tick_defers_latest_part_of_gap(self):
+        group = TaskGroup(id=1, name='test', title='', description='',
+                          time_interval_max_period=3600, time_interval_max_runs_per_tick=3)
+        last_right_bound_at = self.now - timedelta(hours=10, minutes=30)
+        intervals = self.build(group, last_right_bound_at)
+        assert len(intervals) == 3
+        assert intervals[0].left_bound_at == last_right_bound_at
+        assert intervals[-1].right_bound_at < self.now
+
+        # Следующий проход продолжает с правой границы последнего созданного интервала
+        covered_right_bound_at = last_right_bound_at
+        for _ in range(10):
+            intervals = self.build(group, covered_right_bound_at)
+            if not intervals:
+                break
+            assert intervals[0].left_bound_at == covered_right_bound_at
+            covered_right_bound_at = intervals[-1].right_bound_at
+        assert covered_right_bound_at == self.now
+
+    def test_runs_before_now_are_retro(self):
+        group = TaskGroup(id=1, name='test', title='', description='', time_interval_max_period=3600)
+        task = Task(id=1, type=TaskType.TIME_INTERVAL, status=TaskStatus.NEW, status_updated_at=self.now,
+                    payload_id=1, monitoring_algorithm_id=1, group_id=1)
+        task_runs = TimeIntervalTaskRunBuilder().build_task_runs(task, group, Payload(data={}), self.now,
+                                                                 None)
+        assert len(task_runs) > 1
+        assert [task_run.is_retro for task_run in task_runs] == [True] * (len(task_runs) - 1) + [False]
+
+    def test_deadline_is_right_bound_plus_freshness_sla(self):
+        task = Task(id=1, type=TaskType.TIME_INTERVAL, status=TaskStatus.NEW, status_updated_at=self.now,
+                    payload_id=1, monitoring_algorithm_id=1, group_id=1)
+        group = TaskGroup(id=1, name='test', title='', description='', time_interval_max_period=3600)
+        task_runs = TimeIntervalTaskRunBuilder().build_task_runs(task, group, Payload(data={}), self.now, None)
+        assert all(task_run.deadline_at is None for task_run in task_runs)
+
+        group.time_interval_freshness_sla = 600
+        task_runs = TimeIntervalTaskRunBuilder().build_task_runs(task, group, Payload(data={}), self.now, None)
+        assert [task_run.deadline_at for task_run in task_runs] == [
+            task_run.execution_bounds.right_bound_at + timedelta(seconds=600) for task_run in task_runs]
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from service.adapters.outbound.spool import FileSpool, encode_record
+
+
+@pytest.mark.asyncio
+async def test_seals_segment_and_reads_records(tmp_path):
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+
+    await asyncio.gather(*(spool.append(f'record {i}'.encode()) for i in range(3)))
+    segments = await spool.seal()
+    await spool.append(b'next segment')
+
+    assert len(segments) == 1
+    assert await spool.read(segments[0]) == [b'record 0', b'record 1', b'record 2']
+    assert await spool.seal() != segments
+    await spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_rotates_segments_by_size(tmp_path):
+    spool = FileSpool(str(tmp_path), segment_max_bytes=len(encode_record(b'record 0')) * 2)
+    await spool.start()
+
+    for i in range(5):
+        await spool.append(f'record {i}'.encode())
+    segments = await spool.seal()
+
+    assert len(segments) == 3
+    assert [record for segment in segments for record in await spool.read(segment)] == \
+           [f'record {i}'.encode() for i in range(5)]
+    await spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_recovers_segments_after_restart_and_truncates_them(tmp_path):
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    await spool.append(b'sealed')
+    await spool.seal()
+    await spool.append(b'active')
+    await spool.stop()
+
+    restarted_spool = FileSpool(str(tmp_path))
+    await restarted_spool.start()
+    segments = restarted_spool.get_recovered_segments()
+
+    assert [await restarted_spool.read(segment) for segment in segments] == [[b'sealed'], [b'active']]
+    await restarted_spool.append(b'new')
+    new_segments = await restarted_spool.seal()
+    assert not set(new_segments) & set(segments)
+
+    await restarted_spool.truncate(segments)
+    assert restarted_spool.get_recovered_segments() == []
+    assert sorted(path.name for path in tmp_path.iterdir()) == new_segments
+    await restarted_spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_skips_incomplete_tail(tmp_path):
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    await spool.append(b'complete')
+    segment, = await spool.seal()
+    with open(tmp_path / segment, 'ab') as file:
+        file.write(encode_record(b'incomplete')[:-3])
+
+    assert await spool.read(segment) == [b'complete']
+    await spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_quarantined_records_are_not_recovered(tmp_path):
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    await spool.append(b'sealed')
+    segment, = await spool.seal()
+
+    dead_segment = await spool.quarantine([b'poison 0', b'poison 1'])
+    await spool.truncate([segment])
+    await spool.stop()
+
+    assert dead_segment.endswith('.dead')
+    assert await spool.read(dead_segment) == [b'poison 0', b'poison 1']
+    restarted_spool = FileSpool(str(tmp_path))
+    await restarted_spool.start()
+    assert restarted_spool.get_recovered_segments() == []
+    # Номера сегментов карантина не переиспользуются
+    await restarted_spool.append(b'new')
+    new_segment, = await restarted_spool.seal()
+    assert new_segment.split('.')[0] > dead_segment.split('.')[0]
+    await restarted_spool.stop()
@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from service.domain.schemas.command import Command, CommandResponse
+from service.domain.schemas.enums import TaskRunStatus
+from service.domain.schemas.payload import Payload
+from service.domain.schemas.task_run import TaskRun
+from service.ports.common.codec import MessageEncoder, MessageDecoder, JSONCodec, FastJSONCodec, MsgpackCodec, \
+    Compressor, CONTENT_TYPE_JSON, CONTENT_TYPE_MSGPACK
+
+
+class ReversingCompressor(Compressor):
+    """ Обратимое «сжатие» для проверки выбора декомпрессора без необязательных зависимостей """
+
+    @property
+    def content_encoding(self) -> str:
+        return 'reverse'
+
+    def compress(self, body: bytes) -> bytes:
+        return body[::-1]
+
+    def decompress(self, body: bytes) -> bytes:
+        return body[::-1]
+
+
+def _make_command() -> Command:
+    return Command(task_run=TaskRun(id=1, task_id=1, group_name='group',
+                                    payload=Payload(id=1, data={'channel': 'channel', 'limit': 100}),
+                                    status=TaskRunStatus.QUEUED,
+                                    status_updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc)))
+
+
+@pytest.mark.parametrize('codec', [JSONCodec(), FastJSONCodec()])
+def test_json_codecs_are_compatible(codec):
+    command = _make_command()
+
+    encoded = MessageEncoder(codec).encode(command)
+
+    assert encoded.content_type == CONTENT_TYPE_JSON
+    assert Command.model_validate(MessageDecoder().decode(encoded.body, encoded.content_type)) == command
+
+
+def test_fast_json_is_smaller_than_json():
+    command = _make_command()
+
+    assert len(FastJSONCodec().encode(command)) < len(JSONCodec().encode(command))
+
+
+def test_decodes_legacy_message_without_content_type():
+    body = CommandResponse(command=_make_command(), status=TaskRunStatus.SUCCEED) \
+        .model_dump_json(indent=2).encode('utf-8')
+
+    decoded = MessageDecoder().decode(body, None, None)
+
+    assert CommandResponse.model_validate(decoded).command.task_run.id == 1
+
+
+def test_compresses_only_bodies_above_threshold():
+    encoder = MessageEncoder(FastJSONCodec(), ReversingCompressor(), compression_threshold_bytes=100)
+    decoder = MessageDecoder([FastJSONCodec()], [ReversingCompressor()])
+    small, large = {'a': 1}, {'a': 'x' * 200}
+
+    encoded_small, encoded_large = encoder.encode(small), encoder.encode(large)
+
+    assert encoded_small.content_encoding is None
+    assert encoded_large.content_encoding == 'reverse'
+    assert decoder.decode(encoded_large.body, encoded_large.content_type, encoded_large.content_encoding) == large
+
+
+def test_rejects_unsupported_content_type():
+    with pytest.raises(ValueError):
+        MessageDecoder([FastJSONCodec()], []).decode(b'', CONTENT_TYPE_MSGPACK)
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip('msgpack')
+    command = _make_command()
+
+    encoded = MessageEncoder(MsgpackCodec()).encode(command)
+
+    assert encoded.content_type == CONTENT_TYPE_MSGPACK
+    assert Command.model_validate(MessageDecoder().decode(encoded.body, encoded.content_type)) == command
@@ -5,9 +5,10 @@ import pytest
 import pytest_asyncio
 
 from service.domain.schemas.enums import TaskStatus, TaskType, PriorityType
-from service.domain.schemas.payload import Payload
+from service.domain.schemas.payload import Payload, PayloadPK
+from service.domain.services.payload_provider import PayloadProvider, estimate_payload_size
 from service.domain.schemas.task import Task
-from service.ports.outbound.repo.fields import FilterFieldsDNF
+from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields
 
 
 # ==================== Fixtures ====================
@@ -192,3 +193,76 @@ async def test_provide_integration_scenario(payload_provider, sa_payload_repo):
         assert result[task] == payloads[1]
     for task in tasks[80:100]:
         assert result[task] == payloads[2]
+
+
+# ==================== Кэш ====================
+
+@pytest.mark.asyncio
+async def test_provide_fetches_only_misses(payload_provider, sa_payload_repo, sample_tasks, sample_payloads):
+    """
+    Повторная загрузка берет полезные нагрузки из кэша; из БД загружаются только промахи
+    """
+    await payload_provider.provide(sample_tasks[:2])  # payload 1
+    assert payload_provider.metrics.misses == 1
+
+    requested_payload_ids = []
+    original_filter = sa_payload_repo.filter
+
+    async def tracking_filter(filter_fields_dnf, transaction=None):
+        requested_payload_ids.extend(filter_fields_dnf.conjunctions[0].group[0].value)
+        return await original_filter(filter_fields_dnf, transaction)
+
+    sa_payload_repo.filter = tracking_filter
+    result = await payload_provider.provide(sample_tasks)
+
+    assert requested_payload_ids == [2]
+    assert result[sample_tasks[0]] == sample_payloads[0]
+    assert result[sample_tasks[2]] == sample_payloads[1]
+    metrics = payload_provider.metrics
+    assert (metrics.hits, metrics.misses, metrics.count) == (1, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_cached_payload_served_by_get(payload_provider, sa_payload_repo, sample_tasks, sample_payloads):
+    await payload_provider.provide(sample_tasks)
+
+    assert await payload_provider.get(1) == sample_payloads[0]
+    assert await payload_provider.get(404) is None
+    assert payload_provider.metrics.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_cached_payloads(payload_provider, sa_payload_repo, sample_payloads):
+    await payload_provider.get(1)
+    await sa_payload_repo.update(PayloadPK(id=1), UpdateFields.single('data', {'url': 'changed'}))
+    assert (await payload_provider.get(1)).data == sample_payloads[0].data
+
+    payload_provider.invalidate()
+
+    assert (await payload_provider.get(1)).data == {'url': 'changed'}
+
+
+@pytest.mark.asyncio
+async def test_cache_bounded_by_size(sa_payload_repo, sample_payloads):
+    max_size_bytes = estimate_payload_size(sample_payloads[0]) + estimate_payload_size(sample_payloads[1])
+    payload_provider = PayloadProvider(sa_payload_repo, cache_max_size_bytes=max_size_bytes)
+
+    for payload_id in (1, 2, 3):
+        await payload_provider.get(payload_id)
+    # Давно не использованная полезная нагрузка вытеснена
+    await payload_provider.get(1)
+
+    metrics = payload_provider.metrics
+    assert metrics.size_bytes <= max_size_bytes
+    assert metrics.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_provided_payloads_do_not_share_cached_objects(payload_provider, sample_payloads):
+    loaded = await payload_provider.get(1)
+    loaded.data["url"] = "mutated by first caller"
+    cached = await payload_provider.get(1)
+    cached.data["url"] = "mutated by second caller"
+
+    assert (await payload_provider.get(1)).data == {"url": "https://api.example.com/v1"}
+    assert payload_provider.metrics.hits == 2
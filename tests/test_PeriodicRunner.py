@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from service.ports.common.periodic_runner import PeriodicRunner
+
+
+class CallCounter:
+    def __init__(self, duration_s: float = 0):
+        self.count = 0
+        self._duration_s = duration_s
+
+    async def call(self):
+        self.count += 1
+        await asyncio.sleep(self._duration_s)
+
+
+@pytest.mark.asyncio
+async def test_wake_up_runs_before_timeout():
+    counter = CallCounter()
+    runner = PeriodicRunner(counter.call, 60, run_name="test")
+    runner.create_periodic_task()
+    await asyncio.sleep(0.05)
+    assert counter.count == 1
+
+    runner.wake_up()
+    await asyncio.sleep(0.05)
+
+    assert counter.count == 2
+    runner.cancel()
+
+
+@pytest.mark.asyncio
+async def test_wake_up_burst_is_coalesced():
+    counter = CallCounter(duration_s=0.1)
+    runner = PeriodicRunner(counter.call, 60, run_name="test", wake_up_delay_s=0.05)
+    runner.create_periodic_task()
+    await asyncio.sleep(0.01)
+
+    # Пробуждения во время выполнения и во время задержки схлопываются в один запуск
+    for _ in range(10):
+        runner.wake_up()
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.4)
+
+    assert counter.count == 2
+    runner.cancel()
@@ -0,0 +1,90 @@
+from typing import List, Set
+
+import pytest
+
+from service.domain.schemas.enums import TaskType, PriorityType
+from service.domain.schemas.task_group import TaskGroup
+from service.domain.schemas.task_run import make_queue_name, make_control_queue_name
+from service.domain.services.queue_topology import QueueTopology
+from service.ports.outbound.producer import QueueCreator
+
+
+class FakeQueueCreator(QueueCreator):
+
+    def __init__(self, existing_queue_names: Set[str] = None):
+        self.existing_queue_names = set(existing_queue_names or set())
+        self.checked: List[str] = []
+        self.created: List[str] = []
+
+    async def is_queue_exists(self, name: str) -> bool:
+        self.checked.append(name)
+        return name in self.existing_queue_names
+
+    async def create_queue(self, name: str) -> bool:
+        self.created.append(name)
+        self.existing_queue_names.add(name)
+        return True
+
+
+def _group_queue_names(group_name: str) -> Set[str]:
+    return {make_queue_name(group_name, task_type, priority) for task_type in TaskType for priority in PriorityType} \
+        | {make_control_queue_name(group_name)}
+
+
+@pytest.mark.asyncio
+async def test_declares_group_queues_once_at_start(sa_task_group_repo):
+    await sa_task_group_repo.create(TaskGroup(name='first', title='', description=''))
+    queue_creator = FakeQueueCreator(existing_queue_names={'first.TIME_INTERVAL.MEDIUM'})
+    queue_topology = QueueTopology(sa_task_group_repo, queue_creator)
+
+    await queue_topology.start()
+
+    assert set(queue_creator.checked) == _group_queue_names('first')
+    assert set(queue_creator.created) == _group_queue_names('first') - {'first.TIME_INTERVAL.MEDIUM'}
+    assert queue_topology.is_declared('first.PAGINATION.HIGH')
+
+    queue_creator.checked.clear()
+    await queue_topology.ensure_declared(['first.PAGINATION.HIGH', 'first.TIME_INTERVAL.LOW'])
+    assert queue_creator.checked == []
+
+
+@pytest.mark.asyncio
+async def test_declares_new_group_queues_after_invalidation(sa_task_group_repo):
+    await sa_task_group_repo.create(TaskGroup(name='first', title='', description=''))
+    queue_creator = FakeQueueCreator()
+    queue_topology = QueueTopology(sa_task_group_repo, queue_creator)
+    await queue_topology.start()
+    queue_creator.checked.clear()
+
+    await sa_task_group_repo.create(TaskGroup(name='second', title='', description=''))
+    queue_topology.invalidate()
+    await queue_topology.ensure_declared()
+
+    assert set(queue_creator.checked) == _group_queue_names('second')
+
+
+@pytest.mark.asyncio
+async def test_declares_unknown_queue_on_demand(sa_task_group_repo):
+    queue_creator = FakeQueueCreator()
+    queue_topology = QueueTopology(sa_task_group_repo, queue_creator)
+    await queue_topology.start()
+
+    await queue_topology.ensure_declared(['unknown.UNDEFINED.MEDIUM'])
+
+    assert queue_creator.created == ['unknown.UNDEFINED.MEDIUM']
+    assert queue_topology.is_declared('unknown.UNDEFINED.MEDIUM')
+
+
+@pytest.mark.asyncio
+async def test_declares_passed_queue_when_topology_is_stale(sa_task_group_repo):
+    await sa_task_group_repo.create(TaskGroup(name='first', title='', description=''))
+    queue_creator = FakeQueueCreator()
+    queue_topology = QueueTopology(sa_task_group_repo, queue_creator)
+    await queue_topology.start()
+    queue_topology.invalidate()
+
+    # Топология сброшена, а переданная очередь не относится ни к одной группе из БД
+    await queue_topology.ensure_declared(['unknown.UNDEFINED.MEDIUM'])
+
+    assert 'unknown.UNDEFINED.MEDIUM' in queue_creator.created
+    assert queue_topology.is_declared('unknown.UNDEFINED.MEDIUM')
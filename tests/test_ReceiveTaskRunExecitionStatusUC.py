@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from typing import Optional
 
 import pytest
@@ -16,6 +16,7 @@ from service.domain.schemas.task_run import TaskRun, TaskRunPK
 from service.domain.use_cases.internal.receive_task_run_execution_status import (
     ReceiveTaskRunExecutionStatusUC,
     ReceiveTaskRunExecutionStatusUCRq,
+    CANCEL_ACKNOWLEDGED_DESCRIPTION,
 )
 from tests.utils import make_utc_datetime
 
@@ -561,3 +562,622 @@ async def test_response_always_success_true(
 
     assert response.success is True
     assert response.request is request
+
+
+# ---------------------------------------------------------------------------
+# 11. Cancel acknowledgement and late statuses of cancelled runs
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_cancel_acknowledgement_keeps_task_run_cancelled(
+        receive_task_run_execution_status_uc,
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=110, status=TaskRunStatus.CANCELLED))
+
+    command_response = _make_command_response(command=_make_command(task_run, CommandType.CANCEL),
+                                              status=TaskRunStatus.EXECUTION)
+    await receive_task_run_execution_status_uc.apply(
+        ReceiveTaskRunExecutionStatusUCRq(command_response=command_response))
+
+    assert (await sa_task_run_repo.get(TaskRunPK(id=110))).status == TaskRunStatus.CANCELLED
+    from service.ports.outbound.repo.fields import FilterFieldsDNF
+    status_log, = await sa_task_run_status_log_repo.filter(FilterFieldsDNF.single("task_run_id", 110))
+    assert status_log.status == TaskRunStatus.CANCELLED
+    assert status_log.description == CANCEL_ACKNOWLEDGED_DESCRIPTION
+
+
+@pytest.mark.asyncio
+async def test_late_execute_status_does_not_resume_cancelled_task_run(
+        receive_task_run_execution_status_uc,
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    cancelled_task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=120,
+                                                                      status=TaskRunStatus.CANCELLED))
+    queued_task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=121, status=TaskRunStatus.QUEUED))
+    receive_task_run_execution_status_uc._instant_upload = False
+
+    for task_run in (cancelled_task_run, queued_task_run):
+        command_response = _make_command_response(command=_make_command(task_run), status=TaskRunStatus.EXECUTION)
+        await receive_task_run_execution_status_uc.apply(
+            ReceiveTaskRunExecutionStatusUCRq(command_response=command_response))
+    await receive_task_run_execution_status_uc.upload_command_responses()
+
+    assert (await sa_task_run_repo.get(TaskRunPK(id=120))).status == TaskRunStatus.CANCELLED
+    assert (await sa_task_run_repo.get(TaskRunPK(id=121))).status == TaskRunStatus.EXECUTION
+    from service.ports.outbound.repo.fields import FilterFieldsDNF
+    assert await sa_task_run_status_log_repo.count_by_fields(FilterFieldsDNF.single("task_run_id", 120)) == 1
+
+
+# ---------------------------------------------------------------------------
+# 12. Execution lease
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_execution_status_and_heartbeat_extend_lease_by_group(
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        sa_time_interval_task_progress_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_task_group_repo,
+        sa_transaction_factory,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    from service.domain.schemas.task_group import TaskGroupPK
+    from service.ports.outbound.repo.fields import FilterFieldsDNF, UpdateFields
+    await sa_task_group_repo.update(TaskGroupPK(id=default_task_group.id), UpdateFields.single('execution_lease_s', 60))
+    receive_uc = ReceiveTaskRunExecutionStatusUC(sa_task_run_repo, sa_task_run_status_log_repo,
+                                                 sa_time_interval_task_progress_repo,
+                                                 sa_task_run_time_interval_progress_repo,
+                                                 sa_transaction_factory,
+                                                 task_group_repo=sa_task_group_repo, )
+    task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=130, status=TaskRunStatus.QUEUED))
+    started_at = make_utc_datetime(2024, 6, 15, 12, 0, 0)
+    heartbeat_at = make_utc_datetime(2024, 6, 15, 12, 0, 50)
+
+    await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=_make_command_response(
+        _make_command(task_run), TaskRunStatus.EXECUTION, created_at=started_at)))
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=130))
+    assert updated_task_run.lease_expires_at == started_at + timedelta(seconds=60)
+
+    heartbeat = _make_command_response(_make_command(task_run), TaskRunStatus.EXECUTION, created_at=heartbeat_at)
+    heartbeat.is_heartbeat = True
+    await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=heartbeat))
+
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=130))
+    assert updated_task_run.status == TaskRunStatus.EXECUTION
+    assert updated_task_run.status_updated_at == started_at
+    assert updated_task_run.lease_expires_at == heartbeat_at + timedelta(seconds=60)
+    assert await sa_task_run_status_log_repo.count_by_fields(FilterFieldsDNF.single("task_run_id", 130)) == 1
+
+
+# ---------------------------------------------------------------------------
+# Slim commands — response correlated by task_run_id
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_slim_response_is_correlated_by_task_run_id(
+        receive_task_run_execution_status_uc,
+        sa_task_run_repo,
+        sa_time_interval_task_progress_repo,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    from service.ports.outbound.repo.fields import FilterFieldsDNF
+    await sa_task_run_repo.create(_make_task_run(task_run_id=140, status=TaskRunStatus.QUEUED))
+    command_response = CommandResponse(task_run_id=140,
+                                       status=TaskRunStatus.SUCCEED,
+                                       result=TimeIntervalExecutionResults(right_bound_at=make_utc_datetime(2024, 6, 15),
+                                                                           left_bound_at=make_utc_datetime(2024, 5, 1),
+                                                                           collected_data_amount=10,
+                                                                           saved_data_amount=10, ),
+                                       created_at=make_utc_datetime(2024, 6, 15, 12, 0, 0))
+    unknown_command_response = CommandResponse(task_run_id=999, status=TaskRunStatus.SUCCEED)
+    # Полный ответ для запуска, которого нет в БД, тоже пропускается
+    unknown_full_command_response = _make_command_response(_make_command(_make_task_run(task_run_id=998)),
+                                                           TaskRunStatus.SUCCEED)
+
+    await receive_task_run_execution_status_uc.apply(ReceiveTaskRunExecutionStatusUCRq(
+        command_response=command_response))
+    await receive_task_run_execution_status_uc.apply(ReceiveTaskRunExecutionStatusUCRq(
+        command_response=unknown_command_response))
+    await receive_task_run_execution_status_uc.apply(ReceiveTaskRunExecutionStatusUCRq(
+        command_response=unknown_full_command_response))
+
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=140))
+    assert updated_task_run.status == TaskRunStatus.SUCCEED
+    progress_records = await sa_time_interval_task_progress_repo.filter(FilterFieldsDNF.single("task_id", 1))
+    assert [progress.collected_data_amount for progress in progress_records] == [10]
+
+
+# ---------------------------------------------------------------------------
+# Deferred acknowledgement — apply waits for the upload commit
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_wait_upload_completes_apply_after_commit(
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        sa_time_interval_task_progress_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_transaction_factory,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    import asyncio
+    receive_uc = ReceiveTaskRunExecutionStatusUC(sa_task_run_repo, sa_task_run_status_log_repo,
+                                                 sa_time_interval_task_progress_repo,
+                                                 sa_task_run_time_interval_progress_repo,
+                                                 sa_transaction_factory,
+                                                 instant_upload=False,
+                                                 wait_upload=True, )
+    task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=150, status=TaskRunStatus.QUEUED))
+    applies = [asyncio.create_task(receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(
+        command_response=_make_command_response(_make_command(task_run), status,
+                                                created_at=make_utc_datetime(2024, 6, 15, 12, minute)))))
+        for minute, status in enumerate((TaskRunStatus.EXECUTION, TaskRunStatus.SUCCEED))]
+    await asyncio.sleep(0.01)
+    assert not any(apply.done() for apply in applies)
+
+    await receive_uc.upload_command_responses()
+
+    assert all(response.success for response in await asyncio.gather(*applies))
+    assert (await sa_task_run_repo.get(TaskRunPK(id=150))).status == TaskRunStatus.SUCCEED
+
+
+@pytest.mark.asyncio
+async def test_wait_upload_raises_upload_error():
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+    task_run_repo = AsyncMock()
+    task_run_repo.update_execution_states.side_effect = ConnectionError('database is unavailable')
+    transaction_factory = MagicMock()
+    transaction_factory.create.return_value.__aenter__ = AsyncMock()
+    transaction_factory.create.return_value.__aexit__ = AsyncMock(return_value=False)
+    receive_uc = ReceiveTaskRunExecutionStatusUC(task_run_repo, AsyncMock(), AsyncMock(), AsyncMock(),
+                                                 transaction_factory, instant_upload=False, wait_upload=True, )
+    apply = asyncio.create_task(receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(
+        command_response=_make_command_response(_make_command(_make_task_run()), TaskRunStatus.SUCCEED))))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConnectionError):
+        await receive_uc.upload_command_responses()
+    with pytest.raises(ConnectionError):
+        await apply
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_responses_keep_latest_status(
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        sa_time_interval_task_progress_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_transaction_factory,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    from service.ports.outbound.repo.fields import FilterFieldsDNF
+    receive_uc = ReceiveTaskRunExecutionStatusUC(sa_task_run_repo, sa_task_run_status_log_repo,
+                                                 sa_time_interval_task_progress_repo,
+                                                 sa_task_run_time_interval_progress_repo,
+                                                 sa_transaction_factory,
+                                                 instant_upload=False, )
+    task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=160, status=TaskRunStatus.QUEUED))
+    succeed_at = make_utc_datetime(2024, 6, 15, 12, 5)
+    # Ответы пришли через разных потребителей: SUCCEED раньше EXECUTION
+    for status, created_at in ((TaskRunStatus.SUCCEED, succeed_at),
+                               (TaskRunStatus.EXECUTION, make_utc_datetime(2024, 6, 15, 12, 0))):
+        await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=_make_command_response(
+            _make_command(task_run), status, created_at=created_at)))
+
+    await receive_uc.upload_command_responses()
+
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=160))
+    assert updated_task_run.status == TaskRunStatus.SUCCEED
+    assert updated_task_run.status_updated_at == succeed_at
+    assert await sa_task_run_status_log_repo.count_by_fields(FilterFieldsDNF.single("task_run_id", 160)) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_response_from_later_batch_does_not_revert_status(
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        sa_time_interval_task_progress_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_transaction_factory,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    from service.ports.outbound.repo.fields import FilterFieldsDNF
+    receive_uc = ReceiveTaskRunExecutionStatusUC(sa_task_run_repo, sa_task_run_status_log_repo,
+                                                 sa_time_interval_task_progress_repo,
+                                                 sa_task_run_time_interval_progress_repo,
+                                                 sa_transaction_factory,
+                                                 instant_upload=False, )
+    task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=165, status=TaskRunStatus.QUEUED))
+    succeed_at = make_utc_datetime(2024, 6, 15, 12, 5)
+    execution_at = make_utc_datetime(2024, 6, 15, 12, 0)
+    # Пачки разных потребителей: SUCCEED закоммичен раньше, чем пришел EXECUTION
+    await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=_make_command_response(
+        _make_command(task_run), TaskRunStatus.SUCCEED, created_at=succeed_at)))
+    await receive_uc.upload_command_responses()
+    await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=_make_command_response(
+        _make_command(task_run), TaskRunStatus.EXECUTION, created_at=execution_at)))
+    await receive_uc.upload_command_responses()
+
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=165))
+    assert updated_task_run.status == TaskRunStatus.SUCCEED
+    assert updated_task_run.status_updated_at == succeed_at
+    assert await sa_task_run_status_log_repo.count_by_fields(FilterFieldsDNF.single("task_run_id", 165)) == 2
+
+
+@pytest.mark.asyncio
+async def test_response_stamped_before_dispatch_is_applied(
+        receive_task_run_execution_status_uc,
+        sa_task_run_repo,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    queued_at = make_utc_datetime(2024, 6, 15, 12, 0, 0)
+    task_run = _make_task_run(task_run_id=167, status=TaskRunStatus.QUEUED)
+    task_run.status_updated_at = queued_at
+    task_run = await sa_task_run_repo.create(task_run)
+    # Часы исполнителя отстают от часов сервера, отметившего отправку
+    executed_at = queued_at - timedelta(seconds=1)
+
+    await receive_task_run_execution_status_uc.apply(ReceiveTaskRunExecutionStatusUCRq(
+        command_response=_make_command_response(_make_command(task_run), TaskRunStatus.EXECUTION,
+                                                created_at=executed_at)))
+
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=167))
+    assert updated_task_run.status == TaskRunStatus.EXECUTION
+    assert updated_task_run.last_reported_at == executed_at
+
+
+@pytest.mark.asyncio
+async def test_lease_is_only_extended_across_batches(
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        sa_time_interval_task_progress_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_transaction_factory,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    receive_uc = ReceiveTaskRunExecutionStatusUC(sa_task_run_repo, sa_task_run_status_log_repo,
+                                                 sa_time_interval_task_progress_repo,
+                                                 sa_task_run_time_interval_progress_repo,
+                                                 sa_transaction_factory,
+                                                 instant_upload=False,
+                                                 default_execution_lease_s=60, )
+    task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=166, status=TaskRunStatus.QUEUED))
+    for minute in (10, 0):
+        heartbeat = _make_command_response(_make_command(task_run), TaskRunStatus.EXECUTION,
+                                           created_at=make_utc_datetime(2024, 6, 15, 12, minute))
+        heartbeat.is_heartbeat = True
+        await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=heartbeat))
+        await receive_uc.upload_command_responses()
+
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=166))
+    assert updated_task_run.lease_expires_at == make_utc_datetime(2024, 6, 15, 12, 11)
+
+
+# ---------------------------------------------------------------------------
+# Bounded double-buffered upload
+# ---------------------------------------------------------------------------
+
+
+def _make_mocked_receive_uc(**kwargs):
+    from unittest.mock import AsyncMock, MagicMock
+    task_run_repo = AsyncMock()
+    # Все запрошенные запуски есть в БД
+    task_run_repo.filter.side_effect = lambda filter_fields: [
+        _make_task_run(task_run_id=task_run_id) for task_run_id in filter_fields.conjunctions[0].group[0].value]
+    transaction_factory = MagicMock()
+    transaction_factory.create.return_value.__aenter__ = AsyncMock()
+    transaction_factory.create.return_value.__aexit__ = AsyncMock(return_value=False)
+    return ReceiveTaskRunExecutionStatusUC(task_run_repo, AsyncMock(), AsyncMock(), AsyncMock(),
+                                           transaction_factory, instant_upload=False, **kwargs)
+
+
+def _make_mocked_request(task_run_id: int) -> ReceiveTaskRunExecutionStatusUCRq:
+    return ReceiveTaskRunExecutionStatusUCRq(command_response=_make_command_response(
+        _make_command(_make_task_run(task_run_id=task_run_id)), TaskRunStatus.SUCCEED))
+
+
+@pytest.mark.asyncio
+async def test_uploads_when_batch_is_full():
+    import asyncio
+    receive_uc = _make_mocked_receive_uc(upload_batch_size=3)
+
+    for task_run_id in range(3):
+        await receive_uc.apply(_make_mocked_request(task_run_id))
+    await asyncio.sleep(0.01)
+    await receive_uc.apply(_make_mocked_request(3))
+
+    metrics = receive_uc.metrics
+    assert metrics.uploads_count == 1
+    assert metrics.last_upload_size == 3
+    assert metrics.buffered == 1
+
+
+@pytest.mark.asyncio
+async def test_pauses_intake_at_max_buffered_and_continues_during_upload():
+    import asyncio
+    receive_uc = _make_mocked_receive_uc(max_buffered=2)
+    upload_started, upload_released = asyncio.Event(), asyncio.Event()
+
+    async def slow_update_execution_states(*args, **kwargs):
+        upload_started.set()
+        await upload_released.wait()
+
+    receive_uc._task_run_repo.update_execution_states.side_effect = slow_update_execution_states
+    await receive_uc.apply(_make_mocked_request(1))
+    await receive_uc.apply(_make_mocked_request(2))
+    blocked_apply = asyncio.create_task(receive_uc.apply(_make_mocked_request(3)))
+    await upload_started.wait()
+
+    # Пачка из двух ответов выгружается, место занято до ее коммита
+    assert not blocked_apply.done()
+    assert receive_uc.metrics.uploading == 2
+    assert receive_uc.metrics.backpressure_waits_count == 1
+
+    upload_released.set()
+    await blocked_apply
+    assert receive_uc.metrics.buffered == 1
+    assert receive_uc.metrics.uploads_count == 1
+
+
+def _fail_update_of(*failing_task_runs_ids: int):
+    async def update_execution_states(update_fields_by_task_run_pk, transaction):
+        if any(task_run_pk.id in failing_task_runs_ids for task_run_pk in update_fields_by_task_run_pk):
+            raise ValueError('violates constraint')
+
+    return update_execution_states
+
+
+@pytest.mark.asyncio
+async def test_rejects_only_responses_that_fail_apart_from_batch():
+    import asyncio
+    from service.ports.common.exceptions import PoisonMessageError
+    receive_uc = _make_mocked_receive_uc(wait_upload=True)
+    receive_uc._task_run_repo.update_execution_states.side_effect = _fail_update_of(2)
+    applies = [asyncio.create_task(receive_uc.apply(_make_mocked_request(task_run_id))) for task_run_id in range(5)]
+    await asyncio.sleep(0)
+
+    rejected = await receive_uc.upload_command_responses()
+
+    results = await asyncio.gather(*applies, return_exceptions=True)
+    assert [command_response.task_run_id for command_response, _ in rejected] == [2]
+    assert isinstance(results[2], PoisonMessageError)
+    assert all(result.success for index, result in enumerate(results) if index != 2)
+    committed_ids = {task_run_pk.id
+                     for call in receive_uc._task_run_repo.update_execution_states.call_args_list
+                     for task_run_pk in call.args[0]
+                     if 2 not in {task_run_pk.id for task_run_pk in call.args[0]}}
+    assert committed_ids == {0, 1, 3, 4}
+    assert receive_uc.metrics.rejected_count == 1
+
+
+@pytest.mark.asyncio
+async def test_raises_batch_error_when_no_part_can_be_uploaded():
+    import asyncio
+    receive_uc = _make_mocked_receive_uc(wait_upload=True)
+    receive_uc._task_run_repo.update_execution_states.side_effect = ConnectionError('database is unavailable')
+    applies = [asyncio.create_task(receive_uc.apply(_make_mocked_request(task_run_id))) for task_run_id in range(64)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConnectionError):
+        await receive_uc.upload_command_responses()
+
+    results = await asyncio.gather(*applies, return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+    # Пачка + не больше 2 * bit_length(64) частей
+    assert receive_uc._task_run_repo.update_execution_states.call_count <= 1 + 2 * 7
+    assert receive_uc.metrics.rejected_count == 0
+
+
+# ---------------------------------------------------------------------------
+# Coalescing responses of one task run
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_coalesces_heartbeats_and_adjacent_progresses(
+        sa_task_run_repo,
+        sa_task_run_status_log_repo,
+        sa_time_interval_task_progress_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_transaction_factory,
+        default_task_group,
+        default_monitoring_algorithm,
+        default_payload,
+        default_task,
+):
+    from service.ports.outbound.repo.fields import FilterFieldsDNF
+    receive_uc = ReceiveTaskRunExecutionStatusUC(sa_task_run_repo, sa_task_run_status_log_repo,
+                                                 sa_time_interval_task_progress_repo,
+                                                 sa_task_run_time_interval_progress_repo,
+                                                 sa_transaction_factory,
+                                                 instant_upload=False, )
+    task_run = await sa_task_run_repo.create(_make_task_run(task_run_id=170, status=TaskRunStatus.QUEUED))
+    for minute in range(3):
+        heartbeat = _make_command_response(_make_command(task_run), TaskRunStatus.EXECUTION,
+                                           created_at=make_utc_datetime(2024, 6, 15, 12, minute))
+        heartbeat.is_heartbeat = True
+        await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=heartbeat))
+    # Прогресс двумя смежными интервалами и одним отдельным
+    for minute, (left_day, right_day) in enumerate(((1, 10), (10, 20), (25, 28)), start=5):
+        result = TimeIntervalExecutionResults(left_bound_at=make_utc_datetime(2024, 5, left_day),
+                                              right_bound_at=make_utc_datetime(2024, 5, right_day),
+                                              collected_data_amount=10,
+                                              saved_data_amount=5, )
+        await receive_uc.apply(ReceiveTaskRunExecutionStatusUCRq(command_response=_make_command_response(
+            _make_command(task_run), TaskRunStatus.EXECUTION, result=result,
+            created_at=make_utc_datetime(2024, 6, 15, 12, minute))))
+    assert receive_uc.metrics.buffered == 4
+    assert receive_uc.metrics.coalesced_count == 2
+
+    await receive_uc.upload_command_responses()
+
+    progresses = sorted(await sa_time_interval_task_progress_repo.filter(FilterFieldsDNF.single("task_id", 1)),
+                        key=lambda progress: progress.right_bound_at)
+    assert [(progress.left_bound_at, progress.right_bound_at, progress.collected_data_amount)
+            for progress in progresses] == [(make_utc_datetime(2024, 5, 1), make_utc_datetime(2024, 5, 20), 20),
+                                            (make_utc_datetime(2024, 5, 25), make_utc_datetime(2024, 5, 28), 10)]
+    task_run_progresses = await sa_task_run_time_interval_progress_repo.filter(
+        FilterFieldsDNF.single("task_run_id", 170))
+    assert len(task_run_progresses) == 2
+    assert await sa_task_run_status_log_repo.count_by_fields(FilterFieldsDNF.single("task_run_id", 170)) == 3
+    updated_task_run = await sa_task_run_repo.get(TaskRunPK(id=170))
+    assert updated_task_run.status_updated_at == make_utc_datetime(2024, 6, 15, 12, 7)
+
+
+# ---------------------------------------------------------------------------
+# Local spool of received responses
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_spool_keeps_responses_until_upload_commit(tmp_path):
+    from service.adapters.outbound.spool import FileSpool
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    receive_uc = _make_mocked_receive_uc(spool=spool)
+    receive_uc._task_run_repo.update_execution_states.side_effect = ConnectionError('database is unavailable')
+
+    for task_run_id in range(2):
+        await receive_uc.apply(_make_mocked_request(task_run_id))
+    with pytest.raises(ConnectionError):
+        await receive_uc.upload_command_responses()
+
+    # Пачка вернулась в накопитель, сегмент остался на диске
+    assert receive_uc.metrics.buffered == 2
+    assert len(list(tmp_path.iterdir())) == 1
+
+    receive_uc._task_run_repo.update_execution_states.side_effect = None
+    await receive_uc.apply(_make_mocked_request(2))
+    await receive_uc.upload_command_responses()
+
+    assert receive_uc.metrics.last_upload_size == 3
+    assert list(tmp_path.iterdir()) == []
+    await spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_replays_spooled_responses_after_restart(tmp_path):
+    from service.adapters.outbound.spool import FileSpool
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    crashed_uc = _make_mocked_receive_uc(spool=spool)
+    for task_run_id in range(3):
+        await crashed_uc.apply(_make_mocked_request(task_run_id))
+    await spool.stop()
+
+    restarted_spool = FileSpool(str(tmp_path))
+    await restarted_spool.start()
+    receive_uc = _make_mocked_receive_uc(spool=restarted_spool)
+    await receive_uc.replay_spool()
+
+    update_fields_by_task_run_pk, _ = receive_uc._task_run_repo.update_execution_states.call_args.args
+    assert sorted(task_run_pk.id for task_run_pk in update_fields_by_task_run_pk) == [0, 1, 2]
+    assert receive_uc.metrics.last_upload_size == 3
+    assert list(tmp_path.iterdir()) == []
+    await restarted_spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_spool_quarantines_rejected_responses(tmp_path):
+    from service.adapters.outbound.spool import FileSpool
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    receive_uc = _make_mocked_receive_uc(spool=spool)
+    receive_uc._task_run_repo.update_execution_states.side_effect = _fail_update_of(1)
+
+    for task_run_id in range(3):
+        await receive_uc.apply(_make_mocked_request(task_run_id))
+    await receive_uc.upload_command_responses()
+
+    dead_segment, = [path.name for path in tmp_path.iterdir()]
+    assert dead_segment.endswith('.dead')
+    assert [CommandResponse.model_validate_json(record).task_run_id
+            for record in await spool.read(dead_segment)] == [1]
+    assert receive_uc.metrics.quarantined_count == 1
+    await spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_spool_quarantines_batch_after_max_upload_attempts(tmp_path):
+    from service.adapters.outbound.spool import FileSpool
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    receive_uc = _make_mocked_receive_uc(spool=spool, max_upload_attempts=2)
+    receive_uc._task_run_repo.update_execution_states.side_effect = ConnectionError('violates constraint')
+
+    await receive_uc.apply(_make_mocked_request(0))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await receive_uc.upload_command_responses()
+
+    # Пачка ушла в карантин, накопитель освободился
+    assert receive_uc.metrics.buffered == 0
+    assert receive_uc.metrics.quarantined_count == 1
+    assert [path.suffix for path in tmp_path.iterdir()] == ['.dead']
+
+    receive_uc._task_run_repo.update_execution_states.side_effect = None
+    await receive_uc.apply(_make_mocked_request(1))
+    await receive_uc.upload_command_responses()
+
+    assert receive_uc.metrics.last_upload_size == 1
+    assert [path.suffix for path in tmp_path.iterdir()] == ['.dead']
+    await spool.stop()
+
+
+@pytest.mark.asyncio
+async def test_replay_quarantines_undecodable_records(tmp_path):
+    from service.adapters.outbound.spool import FileSpool
+    spool = FileSpool(str(tmp_path))
+    await spool.start()
+    crashed_uc = _make_mocked_receive_uc(spool=spool)
+    await crashed_uc.apply(_make_mocked_request(0))
+    await spool.append(b'{"task_run_id": "not a number"}')
+    await spool.stop()
+
+    restarted_spool = FileSpool(str(tmp_path))
+    await restarted_spool.start()
+    receive_uc = _make_mocked_receive_uc(spool=restarted_spool)
+    await receive_uc.replay_spool()
+
+    assert receive_uc.metrics.last_upload_size == 1
+    dead_segment, = [path.name for path in tmp_path.iterdir()]
+    assert await restarted_spool.read(dead_segment) == [b'{"task_run_id": "not a number"}']
+    await restarted_spool.stop()
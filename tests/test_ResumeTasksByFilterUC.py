@@ -0,0 +1,54 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from service.domain.schemas.enums import TaskStatus, TaskRunStatus
+from service.domain.schemas.task import TasksFilter, TaskPK
+from service.domain.schemas.task_run import TaskRunPK
+from service.domain.use_cases.external.tasks_by_filter import TasksByFilterUCRq
+from tests.utils import create_tasks, create_tasks_runs
+
+
+@pytest.mark.asyncio
+async def test_pause_keeps_sent_runs_and_resume_restores_cancelled(pause_tasks_by_filter_uc,
+                                                                   resume_tasks_by_filter_uc,
+                                                                   sa_task_repo, sa_payload_repo,
+                                                                   sa_task_group_repo, sa_monitoring_algorithm_repo,
+                                                                   sa_task_run_repo, ):
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'test', 2, TaskStatus.EXECUTION)
+    waiting_task_run, = await create_tasks_runs(sa_task_run_repo, tasks[:1], 'test', TaskRunStatus.WAITING)
+    execution_task_run, = await create_tasks_runs(sa_task_run_repo, tasks[1:], 'test', TaskRunStatus.EXECUTION)
+    tasks_filter = TasksFilter(tasks_ids=[task.id for task in tasks])
+
+    response = await pause_tasks_by_filter_uc.apply(TasksByFilterUCRq(tasks_filter=tasks_filter))
+
+    assert response.tasks_count == 2
+    assert response.task_runs_count == 1
+    assert (await sa_task_repo.get(TaskPK(id=tasks[0].id))).status == TaskStatus.PAUSED
+    assert (await sa_task_run_repo.get(TaskRunPK(id=waiting_task_run.id))).status == TaskRunStatus.CANCELLED
+    assert (await sa_task_run_repo.get(TaskRunPK(id=execution_task_run.id))).status == TaskRunStatus.EXECUTION
+
+    wake_up_notifier = AsyncMock()
+    resume_tasks_by_filter_uc._wake_up_notifier = wake_up_notifier
+    response = await resume_tasks_by_filter_uc.apply(TasksByFilterUCRq(tasks_filter=tasks_filter))
+
+    assert response.tasks_count == 2
+    assert response.task_runs_count == 1
+    assert (await sa_task_repo.get(TaskPK(id=tasks[0].id))).status == TaskStatus.EXECUTION
+    assert (await sa_task_run_repo.get(TaskRunPK(id=waiting_task_run.id))).status == TaskRunStatus.WAITING
+    wake_up_notifier.notify.assert_awaited_once_with(['test'])
+
+
+@pytest.mark.asyncio
+async def test_resume_ignores_active_tasks(resume_tasks_by_filter_uc, sa_task_repo, sa_payload_repo,
+                                           sa_task_group_repo, sa_monitoring_algorithm_repo, ):
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'test', 2, TaskStatus.SUCCEED)
+
+    response = await resume_tasks_by_filter_uc.apply(
+        TasksByFilterUCRq(tasks_filter=TasksFilter(group_ids=[tasks[0].group_id])))
+
+    assert response.success
+    assert response.tasks_count == 0
+    assert (await sa_task_repo.get(TaskPK(id=tasks[0].id))).status == TaskStatus.SUCCEED
@@ -4,11 +4,15 @@ from typing import Callable, Awaitable
 import pytest
 import pytest_asyncio
 
-from service.domain.schemas.enums import PriorityType, TaskType, TaskStatus, MonitoringAlgorithmType
+from service.domain.schemas.enums import PriorityType, TaskType, TaskStatus, MonitoringAlgorithmType, TaskRunStatus
 from service.domain.schemas.monitoring_algorithm import MonitoringAlgorithm, PeriodicMonitoringAlgorithm
 from service.domain.schemas.payload import Payload
 from service.domain.schemas.task import Task
 from service.domain.schemas.task_group import TaskGroup
+from service.adapters.outbound.repo.sa import models
+from service.adapters.outbound.repo.sa.impls.monitoring_algorithm import calculate_periodic_jitter_s, \
+    SAPeriodicMonitoringAlgorithmRepo
+from tests.utils import create_tasks, create_tasks_runs
 
 
 @pytest.fixture()
@@ -17,10 +21,12 @@ def create_task(sa_monitoring_algorithm_repo,
                 sa_payload_repo,
                 sa_task_repo,
                 sa_task_group_repo,):
-    async def _create_task(task_id: int, status: TaskStatus, status_updated_at: datetime, timeout: float = 10):
+    async def _create_task(task_id: int, status: TaskStatus, status_updated_at: datetime, timeout: float = 10,
+                           timeout_noize: float = 0):
         monitoring_algorithm = MonitoringAlgorithm(id=task_id + 1_000, type=MonitoringAlgorithmType.PERIODIC)
         periodic_monitoring_algorithm = PeriodicMonitoringAlgorithm(id=monitoring_algorithm.id,
-                                                                    timeout=timeout)
+                                                                    timeout=timeout,
+                                                                    timeout_noize=timeout_noize)
         payload = Payload(id=task_id + 1_000, data={"username": "test_username"})
         task_group = await sa_task_group_repo.create(TaskGroup(name="api_monitoring", title="", description=""))
         task = Task(
@@ -39,7 +45,7 @@ def create_task(sa_monitoring_algorithm_repo,
         await sa_task_repo.create(task)
         return task
 
-    _create_task: Callable[[int, TaskStatus, datetime, float], Awaitable[Task]]
+    _create_task: Callable[[int, TaskStatus, datetime, float, float], Awaitable[Task]]
     return _create_task
 
 
@@ -142,3 +148,84 @@ async def test_provide_tasks_not_ready_to_execute(sa_periodic_monitoring_algorit
                                                   execution_task_periodic_ma_not_ready_to_execute):
     tasks = await sa_periodic_monitoring_algorithm_repo.provide_tasks_to_execute()
     assert not tasks
+
+
+def test_calculate_periodic_jitter_s():
+    timeout_noize = 60
+    jitters = [calculate_periodic_jitter_s(task_id, timeout_noize) for task_id in range(1, 1001)]
+    assert all(-timeout_noize <= jitter < timeout_noize for jitter in jitters)
+    assert jitters == [calculate_periodic_jitter_s(task_id, timeout_noize) for task_id in range(1, 1001)]
+    # Смещения распределены по всему диапазону, а не собраны в одной точке
+    assert min(jitters) < -timeout_noize / 2
+    assert max(jitters) > timeout_noize / 2
+    assert calculate_periodic_jitter_s(1, 0) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('offset_s, is_ready', [(1, True), (-1, False)])
+async def test_provide_tasks_to_execute_with_jitter(sa_periodic_monitoring_algorithm_repo, create_task,
+                                                    offset_s, is_ready):
+    task_id, timeout, timeout_noize = 5, 300, 100
+    jitter_s = calculate_periodic_jitter_s(task_id, timeout_noize)
+    status_updated_at = datetime.now(timezone.utc) - timedelta(seconds=timeout + jitter_s + offset_s)
+    await create_task(task_id, TaskStatus.SUCCEED, status_updated_at, timeout, timeout_noize)
+
+    tasks = await sa_periodic_monitoring_algorithm_repo.provide_tasks_to_execute()
+    assert bool(tasks) is is_ready
+
+
+@pytest.mark.asyncio
+async def test_provide_tasks_to_execute_smoothing(database, sa_task_repo, sa_task_group_repo,
+                                                  sa_monitoring_algorithm_repo, sa_payload_repo,
+                                                  sa_periodic_monitoring_algorithm_repo):
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'test', 10)
+    await sa_periodic_monitoring_algorithm_repo.create(
+        PeriodicMonitoringAlgorithm(id=tasks[0].monitoring_algorithm_id, timeout=3600))
+    smoothing_repo = SAPeriodicMonitoringAlgorithmRepo(database, models.PeriodicMonitoringAlgorithm,
+                                                       max_tasks_per_tick=3)
+
+    tasks_to_execute = await smoothing_repo.provide_tasks_to_execute()
+    assert len(tasks_to_execute) == 3
+    assert [task.id for task in tasks_to_execute] == sorted(task.id for task in tasks)[:3]
+    assert len(await sa_periodic_monitoring_algorithm_repo.provide_tasks_to_execute()) == 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('task_run_status, is_ready', [
+    (TaskRunStatus.WAITING, False),
+    (TaskRunStatus.QUEUED, False),
+    (TaskRunStatus.EXECUTION, False),
+    (TaskRunStatus.INTERRUPTED, False),
+    (TaskRunStatus.TEMP_ERROR, False),
+    (TaskRunStatus.SUCCEED, True),
+])
+async def test_provide_tasks_to_execute_skips_tasks_with_active_run(sa_periodic_monitoring_algorithm_repo,
+                                                                    sa_task_run_repo,
+                                                                    succeed_task_periodic_ma_ready_to_execute,
+                                                                    task_run_status, is_ready):
+    await create_tasks_runs(sa_task_run_repo, [succeed_task_periodic_ma_ready_to_execute], 'api_monitoring',
+                            task_run_status)
+
+    tasks = await sa_periodic_monitoring_algorithm_repo.provide_tasks_to_execute()
+    assert bool(tasks) is is_ready
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('adaptive_timeout_min, adaptive_timeout_max, is_ready', [
+    (None, None, True),
+    (60, 3600, False),
+])
+async def test_provide_tasks_to_execute_applies_adaptive_timeout_only_for_adaptive_algorithm(
+        sa_periodic_monitoring_algorithm_repo, sa_task_repo, succeed_task_periodic_ma_ready_to_execute,
+        adaptive_timeout_min, adaptive_timeout_max, is_ready):
+    from service.ports.outbound.repo.fields import UpdateFields
+    task = succeed_task_periodic_ma_ready_to_execute
+    await sa_task_repo.update(task, UpdateFields.single('adaptive_timeout', 3600.0))
+    await sa_periodic_monitoring_algorithm_repo.update(
+        PeriodicMonitoringAlgorithm(id=task.monitoring_algorithm_id, timeout=30),
+        UpdateFields.multiple({'adaptive_timeout_min': adaptive_timeout_min,
+                               'adaptive_timeout_max': adaptive_timeout_max}))
+
+    tasks = await sa_periodic_monitoring_algorithm_repo.provide_tasks_to_execute()
+    assert bool(tasks) is is_ready
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from service.adapters.outbound.repo.sa.notify import SAPgWakeUpNotifier, PgNotificationListener
+
+
+@pytest.mark.asyncio
+async def test_listener_receives_notification_per_group(database):
+    received = []
+    listener = PgNotificationListener(database, 'test_wake_up', received.append)
+    notifier = SAPgWakeUpNotifier(database, 'test_wake_up')
+    await listener.start()
+    try:
+        await asyncio.sleep(0.5)
+        await notifier.notify(['b', 'a', 'b'])
+        for _ in range(50):
+            if len(received) >= 2:
+                break
+            await asyncio.sleep(0.1)
+    finally:
+        await listener.stop()
+
+    assert received == ['a', 'b']
+
+
+@pytest.mark.asyncio
+async def test_notify_without_groups_is_noop(database):
+    await SAPgWakeUpNotifier(database, 'test_wake_up').notify([])
@@ -4,12 +4,12 @@ from typing import List
 import pytest
 
 from service.adapters.outbound.repo.sa.impls.monitoring_algorithm import MAX_DATETIME
-from service.domain.schemas.enums import TaskStatus, TaskType, MonitoringAlgorithmType
+from service.domain.schemas.enums import TaskStatus, TaskType, MonitoringAlgorithmType, TaskRunStatus
 from service.domain.schemas.monitoring_algorithm import SingleMonitoringAlgorithm, MonitoringAlgorithm
 from service.domain.schemas.payload import Payload
 from service.domain.schemas.task import Task
 from service.domain.schemas.task_group import TaskGroup
-from tests.utils import make_utc_datetime
+from tests.utils import make_utc_datetime, create_tasks_runs
 
 
 # ---------------------------------------------------------------------------
@@ -383,3 +383,26 @@ class TestTaskExecutionScenarios:
         task = await _make_task(2, loaded_at, TaskStatus.SUCCEED, make_utc_datetime(2024, 1, 1, 0, 1, 0))  # id=2
         now = make_utc_datetime(2024, 1, 1, 0, 2, 0)
         assert repo._is_task_ready_to_execute(task, algorithm, now) is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('task_run_status, is_ready', [
+    (TaskRunStatus.WAITING, False),
+    (TaskRunStatus.QUEUED, False),
+    (TaskRunStatus.EXECUTION, False),
+    (TaskRunStatus.INTERRUPTED, False),
+    (TaskRunStatus.TEMP_ERROR, False),
+    (TaskRunStatus.SUCCEED, True),
+])
+async def test_provide_tasks_to_execute_skips_tasks_with_active_run(_make_task, _make_algorithm,
+                                                                    sa_single_monitoring_algorithm_repo,
+                                                                    sa_task_run_repo,
+                                                                    task_run_status, is_ready):
+    algorithm = await _make_algorithm(timeouts=[])
+    await sa_single_monitoring_algorithm_repo.create(algorithm)
+    loaded_at = datetime.now(timezone.utc)
+    task = await _make_task(1, loaded_at, TaskStatus.NEW, loaded_at)
+    await create_tasks_runs(sa_task_run_repo, [task], 'test', task_run_status)
+
+    tasks = await sa_single_monitoring_algorithm_repo.provide_tasks_to_execute()
+    assert [task.id for task in tasks] == ([task.id] if is_ready else [])
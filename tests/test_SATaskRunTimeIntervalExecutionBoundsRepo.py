@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+import pytest
+
+from service.domain.schemas.enums import TaskRunStatus
+from service.domain.schemas.execution_bounds import TimeIntervalBounds
+from service.domain.schemas.task_run import TaskRunTimeIntervalExecutionBounds
+from tests.utils import create_tasks, create_tasks_runs, make_utc_datetime
+
+
+def make_bounds(task_run, left_bound_at, right_bound_at):
+    return TaskRunTimeIntervalExecutionBounds(task_run_id=task_run.id, task_id=task_run.task_id,
+                                              execution_bounds=TimeIntervalBounds(left_bound_at=left_bound_at,
+                                                                                  right_bound_at=right_bound_at))
+
+
+@pytest.mark.asyncio
+async def test_create_all_keeps_latest_bounds_per_task(sa_task_run_time_interval_execution_bounds_repo,
+                                                       sa_latest_task_run_time_interval_execution_bounds_provider,
+                                                       sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                                                       sa_payload_repo, sa_task_run_repo):
+    group_name = 'test'
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, group_name, 2)
+    first_task, second_task = tasks
+    task_runs = await create_tasks_runs(sa_task_run_repo, [first_task, first_task, first_task, second_task],
+                                        group_name, TaskRunStatus.WAITING)
+    start = make_utc_datetime(2024, 1, 1)
+
+    created = await sa_task_run_time_interval_execution_bounds_repo.create_all([
+        make_bounds(task_runs[0], start, start + timedelta(days=1)),
+        make_bounds(task_runs[1], start + timedelta(days=1), start + timedelta(days=2)),
+        make_bounds(task_runs[3], start, start + timedelta(days=5)),
+    ])
+    assert len(created) == 3
+
+    latest_right_bound_by_task_id = await sa_task_run_time_interval_execution_bounds_repo \
+        .get_latest_right_bound_by_task_ids([first_task.id, second_task.id])
+    assert latest_right_bound_by_task_id == {first_task.id: start + timedelta(days=2),
+                                             second_task.id: start + timedelta(days=5)}
+
+    # Более ранние границы не откатывают последнюю правую границу задачи
+    await sa_task_run_time_interval_execution_bounds_repo.create(
+        make_bounds(task_runs[2], start - timedelta(days=2), start - timedelta(days=1)))
+    latest_bounds_by_task_id = await sa_latest_task_run_time_interval_execution_bounds_provider \
+        .provide_latest_bounds_by_task_ids([first_task.id])
+    assert list(latest_bounds_by_task_id) == [first_task.id]
+    assert latest_bounds_by_task_id[first_task.id].task_run_id == task_runs[1].id
+    assert latest_bounds_by_task_id[first_task.id].execution_bounds.right_bound_at == start + timedelta(days=2)
@@ -1,6 +1,10 @@
+from datetime import datetime, timezone, timedelta
+
 import pytest
 
+from service.adapters.outbound.repo.sa.impls.task_run import SATaskRunDeadlineMetricsProvider, SAWaitingTaskRunProvider
 from service.domain.schemas.enums import TaskRunStatus
+from service.ports.outbound.repo.fields import UpdateFields
 from tests.utils import create_tasks, create_tasks_runs
 
 
@@ -23,3 +27,110 @@ async def test_provide(sa_waiting_task_run_provider, sa_task_repo, sa_payload_re
     tasks_amount_increased = tasks_amount + 5
     waiting_task_runs = await sa_waiting_task_run_provider.provide({group_name: tasks_amount_increased})
     assert len(waiting_task_runs) == tasks_amount
+
+
+async def create_retro_tasks_runs(sa_task_run_repo, tasks, group_name):
+    task_runs = await create_tasks_runs(sa_task_run_repo, tasks, group_name, TaskRunStatus.WAITING)
+    await sa_task_run_repo.update_all({task_run: UpdateFields.single('is_retro', True) for task_run in task_runs})
+
+
+@pytest.mark.asyncio
+async def test_provide_reserves_retro_share(sa_waiting_task_run_provider, sa_task_repo, sa_payload_repo,
+                                            sa_task_group_repo, sa_monitoring_algorithm_repo, sa_task_run_repo, ):
+    group_name = 'test'
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, group_name, 10)
+    await create_tasks_runs(sa_task_run_repo, tasks, group_name, TaskRunStatus.WAITING)
+    await create_retro_tasks_runs(sa_task_run_repo, tasks, group_name)
+
+    waiting_task_runs = await sa_waiting_task_run_provider.provide({group_name: 10})
+    assert len(waiting_task_runs) == 10
+    assert len([task_run for task_run in waiting_task_runs if task_run.is_retro]) == 2
+
+
+@pytest.mark.asyncio
+async def test_provide_gives_unused_lane_budget_to_other_lane(sa_waiting_task_run_provider, sa_task_repo,
+                                                              sa_payload_repo, sa_task_group_repo,
+                                                              sa_monitoring_algorithm_repo, sa_task_run_repo, ):
+    group_name = 'test'
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, group_name, 10)
+    await create_tasks_runs(sa_task_run_repo, tasks[:3], group_name, TaskRunStatus.WAITING)
+    await create_retro_tasks_runs(sa_task_run_repo, tasks, group_name)
+
+    waiting_task_runs = await sa_waiting_task_run_provider.provide({group_name: 10})
+    assert len(waiting_task_runs) == 10
+    assert len([task_run for task_run in waiting_task_runs if task_run.is_retro]) == 7
+
+
+async def set_deadlines(sa_task_run_repo, task_runs, deadlines):
+    await sa_task_run_repo.update_all({task_run: UpdateFields.single('deadline_at', deadline_at)
+                                       for task_run, deadline_at in zip(task_runs, deadlines)})
+
+
+@pytest.mark.asyncio
+async def test_provide_orders_by_deadline_and_demotes_missed(sa_waiting_task_run_provider, sa_task_repo,
+                                                             sa_payload_repo, sa_task_group_repo,
+                                                             sa_monitoring_algorithm_repo, sa_task_run_repo, ):
+    group_name = 'test'
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, group_name, 4)
+    task_runs = await create_tasks_runs(sa_task_run_repo, tasks, group_name, TaskRunStatus.WAITING)
+    now = datetime.now(timezone.utc)
+    missed, late, soon, no_deadline = task_runs
+    await set_deadlines(sa_task_run_repo, [missed, late, soon],
+                        [now - timedelta(hours=1), now + timedelta(hours=2), now + timedelta(hours=1)])
+
+    waiting_task_runs = await sa_waiting_task_run_provider.provide({group_name: 4})
+
+    assert [task_run.id for task_run in waiting_task_runs] == [soon.id, late.id, no_deadline.id, missed.id]
+
+
+@pytest.mark.asyncio
+async def test_provide_promotes_runs_waiting_longer_than_max_wait(database, sa_task_repo, sa_payload_repo,
+                                                                  sa_task_group_repo, sa_monitoring_algorithm_repo,
+                                                                  sa_task_run_repo, ):
+    group_name = 'test'
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, group_name, 4)
+    task_runs = await create_tasks_runs(sa_task_run_repo, tasks, group_name, TaskRunStatus.WAITING)
+    now = datetime.now(timezone.utc)
+    starving_missed, starving_no_deadline, missed, soon = task_runs
+    await set_deadlines(sa_task_run_repo, [starving_missed, missed, soon],
+                        [now - timedelta(hours=3), now - timedelta(hours=1), now + timedelta(hours=1)])
+    await sa_task_run_repo.update_all({
+        starving_missed: UpdateFields.single('status_updated_at', now - timedelta(hours=4)),
+        starving_no_deadline: UpdateFields.single('status_updated_at', now - timedelta(hours=5)),
+        missed: UpdateFields.single('status_updated_at', now - timedelta(minutes=5)),
+        soon: UpdateFields.single('status_updated_at', now),
+    })
+    waiting_task_run_provider = SAWaitingTaskRunProvider(database, sa_task_run_repo, max_wait_s=3600)
+
+    waiting_task_runs = await waiting_task_run_provider.provide({group_name: 4})
+
+    assert [task_run.id for task_run in waiting_task_runs] == [starving_no_deadline.id, starving_missed.id,
+                                                               soon.id, missed.id]
+
+
+@pytest.mark.asyncio
+async def test_deadline_metrics(database, sa_task_repo, sa_payload_repo, sa_task_group_repo,
+                                sa_monitoring_algorithm_repo, sa_task_run_repo, ):
+    group_name = 'test'
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, group_name, 4)
+    now = datetime.now(timezone.utc)
+    succeed_task_runs = await create_tasks_runs(sa_task_run_repo, tasks[:3], group_name, TaskRunStatus.SUCCEED)
+    await sa_task_run_repo.update_all({task_run: UpdateFields.single('status_updated_at', now)
+                                       for task_run in succeed_task_runs})
+    await set_deadlines(sa_task_run_repo, succeed_task_runs,
+                        [now + timedelta(seconds=60), now - timedelta(seconds=10), now - timedelta(seconds=30)])
+    waiting_task_runs = await create_tasks_runs(sa_task_run_repo, tasks[3:], group_name, TaskRunStatus.WAITING)
+    await set_deadlines(sa_task_run_repo, waiting_task_runs, [now - timedelta(seconds=1)])
+
+    metrics = await SATaskRunDeadlineMetricsProvider(database).provide_deadline_metrics_by_period(3600)
+
+    group_metrics = metrics.grouped_deadline_metrics_by_name[group_name]
+    assert group_metrics.succeed == 3
+    assert group_metrics.missed == 2
+    assert group_metrics.avg_lateness_s == pytest.approx(20)
+    assert group_metrics.overdue_waiting == 1
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from service.domain.schemas.enums import CommandType, TaskRunStatus, TaskStatus
+from service.domain.schemas.task import TasksFilter
+from service.domain.schemas.task_run import TaskRun
+from service.domain.use_cases.external.tasks_by_filter import CancelTasksByFilterUC, TasksByFilterUCRq
+from service.domain.use_cases.internal.send_cancel_commands import SendCancelCommandsUC, SendCancelCommandsUCRq
+from tests.utils import create_tasks, create_tasks_runs
+
+
+def _make_send_cancel_commands_uc(is_queue_declared: bool = True) -> SendCancelCommandsUC:
+    queue_topology = AsyncMock()
+    queue_topology.is_declared = Mock(return_value=is_queue_declared)
+    task_runs_producer = AsyncMock()
+    task_runs_producer.produce_many.side_effect = lambda items, to, **kwargs: [True] * len(items)
+    return SendCancelCommandsUC(task_runs_producer, queue_topology)
+
+
+@pytest.mark.asyncio
+async def test_sends_cancel_command_to_group_control_queue():
+    send_cancel_commands_uc = _make_send_cancel_commands_uc()
+    task_run = TaskRun(id=1, task_id=1, group_name='test', status=TaskRunStatus.CANCELLED,
+                       status_updated_at=datetime.now(timezone.utc))
+
+    response = await send_cancel_commands_uc.apply(SendCancelCommandsUCRq(task_runs=[task_run]))
+
+    assert response.sent_count == 1
+    (command, ), (queue_name, ) = send_cancel_commands_uc._task_runs_producer.produce_many.await_args.args
+    assert command.type == CommandType.CANCEL
+    assert command.task_run.id == 1
+    assert queue_name == 'test.control'
+
+
+@pytest.mark.asyncio
+async def test_skips_undeclared_queue_and_producer_errors():
+    send_cancel_commands_uc = _make_send_cancel_commands_uc(is_queue_declared=False)
+    task_run = TaskRun(id=1, task_id=1, group_name='test', status=TaskRunStatus.CANCELLED,
+                       status_updated_at=datetime.now(timezone.utc))
+
+    response = await send_cancel_commands_uc.apply(SendCancelCommandsUCRq(task_runs=[task_run]))
+    assert response.sent_count == 0
+
+    send_cancel_commands_uc._queue_topology.is_declared.return_value = True
+    send_cancel_commands_uc._task_runs_producer.produce_many.side_effect = ConnectionError('closed')
+    response = await send_cancel_commands_uc.apply(SendCancelCommandsUCRq(task_runs=[task_run]))
+    assert response.success
+    assert response.sent_count == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_by_filter_sends_commands_only_for_in_flight_task_runs(sa_task_status_bulk_updater,
+                                                                            sa_task_run_status_log_repo,
+                                                                            sa_transaction_factory,
+                                                                            sa_task_repo, sa_payload_repo,
+                                                                            sa_task_group_repo,
+                                                                            sa_monitoring_algorithm_repo,
+                                                                            sa_task_run_repo, ):
+    send_cancel_commands_uc = AsyncMock()
+    cancel_tasks_by_filter_uc = CancelTasksByFilterUC(sa_task_status_bulk_updater, sa_task_run_status_log_repo,
+                                                      sa_transaction_factory, sa_task_run_repo,
+                                                      send_cancel_commands_uc)
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'test', 3, TaskStatus.EXECUTION)
+    await create_tasks_runs(sa_task_run_repo, tasks[:1], 'test', TaskRunStatus.WAITING)
+    queued_task_run, = await create_tasks_runs(sa_task_run_repo, tasks[1:2], 'test', TaskRunStatus.QUEUED)
+    execution_task_run, = await create_tasks_runs(sa_task_run_repo, tasks[2:], 'test', TaskRunStatus.EXECUTION)
+
+    response = await cancel_tasks_by_filter_uc.apply(
+        TasksByFilterUCRq(tasks_filter=TasksFilter(group_ids=[tasks[0].group_id])))
+
+    assert response.task_runs_count == 3
+    request, = send_cancel_commands_uc.apply.await_args.args
+    assert {task_run.id for task_run in request.task_runs} == {queued_task_run.id, execution_task_run.id}
+    assert all(task_run.status == TaskRunStatus.CANCELLED for task_run in request.task_runs)
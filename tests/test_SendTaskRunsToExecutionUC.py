@@ -0,0 +1,88 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+
+from service.domain.schemas.command import COMMAND_ENVELOPE_HEADER, COMMAND_FORMAT_HEADER, COMMAND_FORMAT_SLIM
+from service.domain.schemas.enums import TaskRunStatus, PriorityType, TaskType
+from service.domain.schemas.payload import Payload
+from service.domain.schemas.task_group import TaskGroup
+from service.domain.schemas.task_run import TaskRun
+from service.domain.services.queue_topology import QueueTopology
+from service.domain.use_cases.internal.send_task_runs_to_execution import SendTaskRunsToExecutionUC, \
+    SendTaskRunsToExecutionUCRq
+from service.ports.common.convert_utils import to_bytes
+from service.ports.outbound.producer import DataProducerI
+from tests.test_QueueTopology import FakeQueueCreator
+
+
+class FakeProducer(DataProducerI):
+
+    def __init__(self):
+        self.produced: List[tuple] = []
+
+    async def produce(self, item, to: str, headers: dict = None, item_params: dict = None) -> bool:
+        self.produced.append((json.loads(to_bytes(item)), to, headers))
+        return True
+
+
+def _make_task_runs(group_name: str, count: int, priority: PriorityType = PriorityType.MEDIUM) -> List[TaskRun]:
+    return [TaskRun(id=i, task_id=i, group_name=group_name, priority=priority, type=TaskType.UNDEFINED,
+                    status=TaskRunStatus.QUEUED, status_updated_at=datetime.now(timezone.utc))
+            for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_sends_commands_in_envelopes_per_queue(sa_task_group_repo):
+    await sa_task_group_repo.create(TaskGroup(name='enveloped', title='', description='', command_envelope_size=2))
+    await sa_task_group_repo.create(TaskGroup(name='single', title='', description=''))
+    producer = FakeProducer()
+    uc = SendTaskRunsToExecutionUC(producer, QueueTopology(sa_task_group_repo, FakeQueueCreator()),
+                                   task_group_repo=sa_task_group_repo)
+    task_runs = (_make_task_runs('enveloped', 3)
+                 + _make_task_runs('enveloped', 1, PriorityType.HIGH)
+                 + _make_task_runs('single', 2))
+
+    response = await uc.apply(SendTaskRunsToExecutionUCRq(task_runs=task_runs))
+
+    assert response.success
+    single = [(body, to) for body, to, headers in producer.produced if not headers]
+    assert single == [({'type': 'EXECUTE', 'task_run': task_run.model_dump(mode='json')}, task_run.queue_name)
+                      for task_run in task_runs[-2:]]
+    enveloped = sorted((to, headers[COMMAND_ENVELOPE_HEADER], [command['task_run']['id']
+                                                                for command in body['commands']])
+                       for body, to, headers in producer.produced if headers)
+    assert enveloped == [('enveloped.UNDEFINED.HIGH', '1', [0]),
+                         ('enveloped.UNDEFINED.MEDIUM', '1', [2]),
+                         ('enveloped.UNDEFINED.MEDIUM', '2', [0, 1])]
+
+
+@pytest.mark.asyncio
+async def test_sends_single_commands_without_task_group_repo(sa_task_group_repo):
+    await sa_task_group_repo.create(TaskGroup(name='enveloped', title='', description='', command_envelope_size=10))
+    producer = FakeProducer()
+    uc = SendTaskRunsToExecutionUC(producer, QueueTopology(sa_task_group_repo, FakeQueueCreator()))
+
+    await uc.apply(SendTaskRunsToExecutionUCRq(task_runs=_make_task_runs('enveloped', 3)))
+
+    assert len(producer.produced) == 3
+    assert all(not headers and body['type'] == 'EXECUTE' for body, to, headers in producer.produced)
+
+
+@pytest.mark.asyncio
+async def test_sends_slim_commands(sa_task_group_repo):
+    await sa_task_group_repo.create(TaskGroup(name='slim', title='', description=''))
+    producer = FakeProducer()
+    uc = SendTaskRunsToExecutionUC(producer, QueueTopology(sa_task_group_repo, FakeQueueCreator()),
+                                   slim_commands=True)
+    task_run = _make_task_runs('slim', 1)[0]
+    task_run.payload = Payload(id=1, data={'channel': 'channel'})
+    task_run.execution_arguments = {'depth': 2}
+
+    await uc.apply(SendTaskRunsToExecutionUCRq(task_runs=[task_run]))
+
+    (body, to, headers), = producer.produced
+    assert body == {'type': 'EXECUTE', 'task_run_id': 0, 'payload_data': {'channel': 'channel'},
+                    'execution_arguments': {'depth': 2}, 'execution_bounds': None}
+    assert headers == {COMMAND_FORMAT_HEADER: COMMAND_FORMAT_SLIM}
@@ -0,0 +1,118 @@
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Union
+
+import pytest
+
+from service.domain.schemas.task_run_metrics import TaskRunMetrics, TaskRunGroupedMetrics, TaskRunAvgMetrics, \
+    TasksRunsStatusMetrics
+from service.domain.services.circuit_breaker import TaskGroupCircuitBreaker, CircuitBreakerState
+from service.ports.outbound.repo.task_run import TaskRunMetricsProvider
+
+
+class StubTaskRunMetricsProvider(TaskRunMetricsProvider):
+    def __init__(self):
+        self.metrics_by_group: Dict[str, TaskRunGroupedMetrics] = {}
+
+    def set(self, group_name: str, succeed: int = 0, temp_error: int = 0, interrupted: int = 0):
+        self.metrics_by_group[group_name] = TaskRunGroupedMetrics(group_name=group_name, period_s=1,
+                                                                  succeed=succeed, temp_error=temp_error,
+                                                                  interrupted=interrupted)
+
+    async def provide_by_period(self, period_s: int,
+                                group_name: Union[Optional[str], List[str]] = None) -> TaskRunMetrics:
+        return TaskRunMetrics(grouped_metrics_by_name={name: metrics
+                                                       for name, metrics in self.metrics_by_group.items()
+                                                       if name in group_name})
+
+    async def provide_avg_by_period(self, period_s: int,
+                                    group_name: Union[Optional[str], List[str]] = None) -> TaskRunAvgMetrics:
+        raise NotImplementedError
+
+    async def provide_tasks_runs_status_metrics(self, tasks_ids: List[int]) -> TasksRunsStatusMetrics:
+        raise NotImplementedError
+
+
+@pytest.fixture
+def metrics_provider():
+    return StubTaskRunMetricsProvider()
+
+
+@pytest.fixture
+def circuit_breaker(metrics_provider):
+    return TaskGroupCircuitBreaker(metrics_provider, period_s=300, failure_rate_threshold=0.5,
+                                   min_finished_count=10, open_timeout_s=60,
+                                   probe_batch_size=3, probe_min_finished_count=3)
+
+
+def shift_changed_at(circuit_breaker: TaskGroupCircuitBreaker, group_name: str, seconds: int):
+    group_state = circuit_breaker.state_by_group[group_name]
+    group_state.changed_at = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+@pytest.mark.asyncio
+async def test_closed_passes_batch_size(circuit_breaker, metrics_provider):
+    metrics_provider.set('a', succeed=90, temp_error=10)
+
+    assert await circuit_breaker.apply({'a': 100}) == {'a': 100}
+    assert circuit_breaker.state_by_group['a'].state == CircuitBreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_not_enough_finished_runs_keeps_closed(circuit_breaker, metrics_provider):
+    metrics_provider.set('a', temp_error=5)
+
+    assert await circuit_breaker.apply({'a': 100}) == {'a': 100}
+    assert circuit_breaker.state_by_group['a'].state == CircuitBreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_trips_only_failing_group(circuit_breaker, metrics_provider):
+    metrics_provider.set('a', succeed=5, temp_error=10, interrupted=5)
+    metrics_provider.set('b', succeed=20)
+
+    assert await circuit_breaker.apply({'a': 100, 'b': 100}) == {'b': 100}
+    assert circuit_breaker.state_by_group['a'].state == CircuitBreakerState.OPEN
+    assert circuit_breaker.state_by_group['b'].state == CircuitBreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_holds_dispatch_until_timeout(circuit_breaker, metrics_provider):
+    metrics_provider.set('a', temp_error=20)
+    await circuit_breaker.apply({'a': 100})
+
+    metrics_provider.set('a', succeed=20)
+    assert await circuit_breaker.apply({'a': 100}) == {}
+
+    shift_changed_at(circuit_breaker, 'a', 61)
+    assert await circuit_breaker.apply({'a': 100}) == {'a': 3}
+    assert circuit_breaker.state_by_group['a'].state == CircuitBreakerState.HALF_OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_closes_on_successful_probes(circuit_breaker, metrics_provider):
+    metrics_provider.set('a', temp_error=20)
+    await circuit_breaker.apply({'a': 100})
+    shift_changed_at(circuit_breaker, 'a', 61)
+    metrics_provider.set('a')
+    await circuit_breaker.apply({'a': 100})
+
+    metrics_provider.set('a', succeed=2)
+    assert await circuit_breaker.apply({'a': 100}) == {'a': 3}
+    assert circuit_breaker.state_by_group['a'].state == CircuitBreakerState.HALF_OPEN
+
+    metrics_provider.set('a', succeed=3)
+    assert await circuit_breaker.apply({'a': 100}) == {'a': 100}
+    assert circuit_breaker.state_by_group['a'].state == CircuitBreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_reopens_on_failed_probes(circuit_breaker, metrics_provider):
+    metrics_provider.set('a', temp_error=20)
+    await circuit_breaker.apply({'a': 100})
+    shift_changed_at(circuit_breaker, 'a', 61)
+    metrics_provider.set('a')
+    await circuit_breaker.apply({'a': 100})
+
+    metrics_provider.set('a', succeed=1, interrupted=2)
+    assert await circuit_breaker.apply({'a': 100}) == {}
+    assert circuit_breaker.state_by_group['a'].state == CircuitBreakerState.OPEN
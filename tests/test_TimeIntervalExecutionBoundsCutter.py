@@ -1,4 +1,5 @@
-from datetime import datetime, timezone
+import random
+from datetime import datetime, timezone, timedelta
 
 import pytest
 
@@ -426,4 +427,48 @@ class TestCut:
         # Left bound preserved
         assert result.left_bound_at == datetime(2024, 1, 1, 0, 0, 0)
         assert result.right_bound_at == datetime(2024, 1, 1, 8, 0, 0)
-        
\ No newline at end of file
+        
+
+# ---------------------------------------------------------------------------
+# TimeIntervalExecutionBoundsCutter - совпадение с линейным поиском
+# ---------------------------------------------------------------------------
+
+
+def linear_cut(intervals, execution_bounds: TimeIntervalBounds) -> TimeIntervalBounds:
+    """Эталонный линейный проход по интервалам, отсортированным по убыванию."""
+    for interval in intervals:
+        if interval.has_interval(execution_bounds.left_bound_at, execution_bounds.right_bound_at):
+            return TimeIntervalBounds(left_bound_at=execution_bounds.right_bound_at,
+                                      right_bound_at=execution_bounds.right_bound_at)
+        if interval.is_interval_lower(execution_bounds.left_bound_at, execution_bounds.right_bound_at):
+            continue
+        return TimeIntervalBounds(left_bound_at=execution_bounds.left_bound_at,
+                                  right_bound_at=interval.left_bound_at)
+    return execution_bounds
+
+
+class TestCutMatchesLinearScan:
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_cut_matches_linear_scan(self, seed):
+        rnd = random.Random(seed)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        progresses = []
+        for _ in range(rnd.randint(1, 50)):
+            left_bound_at = start + timedelta(minutes=rnd.randint(0, 10_000))
+            progresses.append(TimeIntervalTaskProgress(
+                task_id=1,
+                left_bound_at=left_bound_at,
+                right_bound_at=left_bound_at + timedelta(minutes=rnd.randint(0, 300)),
+                collected_data_amount=1,
+                saved_data_amount=1,
+            ))
+        cutter = TimeIntervalExecutionBoundsCutter(progresses)
+
+        for _ in range(100):
+            left_bound_at = start + timedelta(minutes=rnd.randint(-500, 11_000))
+            right_bound_at = left_bound_at + timedelta(minutes=rnd.randint(0, 3_000))
+            expected = linear_cut(cutter.intervals, TimeIntervalBounds(left_bound_at=left_bound_at,
+                                                                       right_bound_at=right_bound_at))
+            result = cutter.cut(TimeIntervalBounds(left_bound_at=left_bound_at, right_bound_at=right_bound_at))
+            assert (result.left_bound_at, result.right_bound_at) == (expected.left_bound_at, expected.right_bound_at)
@@ -0,0 +1,44 @@
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from service.domain.schemas.enums import TaskRunStatus, TaskStatus
+from service.domain.schemas.task_run import TaskRunPK
+from service.domain.use_cases.internal.transit_task_run_status.abstract import TransitTaskRunStatusUCRq
+from service.domain.use_cases.internal.transit_task_run_status.impls import TransitStatusFromExecutionToInterruptedUC
+from service.ports.outbound.repo.fields import UpdateFields
+from tests.utils import create_tasks, create_tasks_runs
+
+
+@pytest.mark.asyncio
+async def test_interrupts_only_expired_leases(sa_task_repo, sa_payload_repo, sa_task_group_repo,
+                                             sa_monitoring_algorithm_repo, sa_task_run_repo,
+                                             sa_task_run_status_log_repo, sa_transaction_factory, ):
+    transit_uc = TransitStatusFromExecutionToInterruptedUC(sa_task_run_repo, sa_task_run_status_log_repo,
+                                                           sa_transaction_factory)
+    tasks = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo,
+                               sa_payload_repo, 'test', 4, TaskStatus.EXECUTION)
+    task_runs = await create_tasks_runs(sa_task_run_repo, tasks, 'test', TaskRunStatus.EXECUTION)
+    now = datetime.now(timezone.utc)
+    long_ago = now - timedelta(hours=1)
+    expired_lease, active_lease, stale_without_lease, fresh_without_lease = task_runs
+    await sa_task_run_repo.update_all({
+        # Аренда истекла, хотя статус обновлен недавно
+        TaskRunPK(id=expired_lease.id): UpdateFields.multiple({'status_updated_at': now,
+                                                               'lease_expires_at': now - timedelta(seconds=1)}),
+        # Долгий запуск с продленной арендой не прерывается
+        TaskRunPK(id=active_lease.id): UpdateFields.multiple({'status_updated_at': long_ago,
+                                                              'lease_expires_at': now + timedelta(minutes=5)}),
+        TaskRunPK(id=stale_without_lease.id): UpdateFields.single('status_updated_at', long_ago),
+        TaskRunPK(id=fresh_without_lease.id): UpdateFields.single('status_updated_at', now),
+    })
+
+    response = await transit_uc.apply(TransitTaskRunStatusUCRq(ttl_seconds=300))
+
+    assert response.count == 2
+    statuses = {task_run.id: (await sa_task_run_repo.get(TaskRunPK(id=task_run.id))).status
+                for task_run in task_runs}
+    assert statuses == {expired_lease.id: TaskRunStatus.INTERRUPTED,
+                        active_lease.id: TaskRunStatus.EXECUTION,
+                        stale_without_lease.id: TaskRunStatus.INTERRUPTED,
+                        fresh_without_lease.id: TaskRunStatus.EXECUTION, }
@@ -7,7 +7,8 @@ from freezegun import freeze_time
 from service.domain.schemas.enums import TaskRunStatus
 from service.domain.schemas.task_run import TaskRun, TaskRunPK, TaskRunStatusLog
 from service.domain.use_cases.internal.transit_task_run_status.abstract import TransitTaskRunStatusUCRq
-from service.domain.use_cases.internal.transit_task_run_status.impls import TransitStatusFromQueuedToInterruptedUC
+from service.domain.use_cases.internal.transit_task_run_status.impls import TransitStatusFromQueuedToInterruptedUC, \
+    TransitStatusFromInterruptedToWaitingUC
 from service.ports.outbound.repo.fields import FilterFieldsDNF, ConditionOperation, UpdateFields
 from tests.utils import make_utc_datetime
 
@@ -479,3 +480,47 @@ async def test_very_long_ttl(
     filter_arg: FilterFieldsDNF = mock_task_run_repo.filter.call_args[0][0]
     threshold_field = filter_arg.conjunctions[0].group[1]
     assert threshold_field.value == FROZEN_NOW - timedelta(seconds=86400)
+
+
+# ---------------------------------------------------------------------------
+# Wake-up notifications
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+@freeze_time(FROZEN_NOW)
+async def test_transit_to_interrupted_does_not_wake_up_dispatcher(
+        mock_task_run_repo,
+        mock_task_run_status_log_repo,
+        mock_transaction_factory,
+):
+    wake_up_notifier = AsyncMock()
+    uc = TransitStatusFromQueuedToInterruptedUC(mock_task_run_repo, mock_task_run_status_log_repo,
+                                                mock_transaction_factory, wake_up_notifier)
+    mock_task_run_repo.filter.return_value = [
+        _make_task_run(10, TaskRunStatus.QUEUED, FROZEN_NOW - timedelta(minutes=6)),
+    ]
+
+    await uc.apply(TransitTaskRunStatusUCRq(ttl_seconds=300))
+
+    wake_up_notifier.notify.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@freeze_time(FROZEN_NOW)
+async def test_transit_to_waiting_wakes_up_dispatcher_per_group(
+        mock_task_run_repo,
+        mock_task_run_status_log_repo,
+        mock_transaction_factory,
+):
+    wake_up_notifier = AsyncMock()
+    uc = TransitStatusFromInterruptedToWaitingUC(mock_task_run_repo, mock_task_run_status_log_repo,
+                                                 mock_transaction_factory, wake_up_notifier)
+    task_runs = [_make_task_run(i, TaskRunStatus.INTERRUPTED, FROZEN_NOW) for i in range(3)]
+    task_runs[2].group_name = "other"
+    mock_task_run_repo.filter.return_value = task_runs
+
+    await uc.apply(TransitTaskRunStatusUCRq(ttl_seconds=0))
+
+    wake_up_notifier.notify.assert_awaited_once()
+    assert sorted(wake_up_notifier.notify.call_args[0][0]) == ["other", "test", "test"]
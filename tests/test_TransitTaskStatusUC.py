@@ -10,10 +10,10 @@ from service.domain.schemas.monitoring_algorithm import PeriodicMonitoringAlgori
 from service.domain.schemas.payload import Payload
 from service.domain.schemas.task import Task, TaskPK
 from service.domain.schemas.task_group import TaskGroup
-from service.domain.schemas.task_run import TaskRun
+from service.domain.schemas.task_run import TaskRun, TaskRunTimeIntervalProgress
 from service.domain.use_cases.external.monitoring_algorithm import CreateMonitoringAlgorithmUCRq
 from service.domain.use_cases.internal.transit_task_status import (
-    TransitTaskStatusUCRq,
+    TransitTaskStatusUCRq, calculate_adaptive_timeout,
 )
 
 
@@ -462,3 +462,78 @@ async def test_response_contains_request_and_success(transit_task_status_uc):
 
     assert response.success is True
     assert response.request is request
+
+
+# ---------------------------------------------------------------------------
+# Adaptive timeout
+# ---------------------------------------------------------------------------
+
+
+def test_calculate_adaptive_timeout():
+    assert calculate_adaptive_timeout(3600, 0, 600, 86400, 2) == 7200
+    assert calculate_adaptive_timeout(3600, 10, 600, 86400, 2) == 1800
+    assert calculate_adaptive_timeout(60000, 0, 600, 86400, 2) == 86400
+    assert calculate_adaptive_timeout(1000, 10, 600, 86400, 2) == 600
+
+
+async def _create_adaptive_monitoring_algorithm_id(create_monitoring_algorithm_uc) -> int:
+    algorithm = PeriodicMonitoringAlgorithm(timeout=3600.0, adaptive_timeout_min=1200.0, adaptive_timeout_max=10800.0)
+    response = await create_monitoring_algorithm_uc.apply(CreateMonitoringAlgorithmUCRq(algorithm=algorithm))
+    return response.created_algorithm.id
+
+
+async def _create_succeed_task_run_with_progress(sa_task_run_repo, sa_task_run_time_interval_progress_repo,
+                                                 task_id: int, collected_data_amount: int):
+    task_run = await _create_task_run(sa_task_run_repo, task_id, TaskRunStatus.SUCCEED)
+    await sa_task_run_time_interval_progress_repo.create(
+        TaskRunTimeIntervalProgress(task_run_id=task_run.id, right_bound_at=datetime.now(timezone.utc),
+                                    collected_data_amount=collected_data_amount, saved_data_amount=0))
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout_stretches_without_data_and_shrinks_with_data(
+        transit_task_status_uc,
+        create_monitoring_algorithm_uc,
+        sa_task_repo,
+        sa_task_run_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_payload_repo,
+        sa_task_group_repo,
+):
+    algorithm_id = await _create_adaptive_monitoring_algorithm_id(create_monitoring_algorithm_uc)
+    empty_task = await _create_task(sa_task_group_repo, sa_task_repo, sa_payload_repo, algorithm_id,
+                                    group_name='empty')
+    busy_task = await _create_task(sa_task_group_repo, sa_task_repo, sa_payload_repo, algorithm_id,
+                                   group_name='busy')
+    await _create_succeed_task_run_with_progress(sa_task_run_repo, sa_task_run_time_interval_progress_repo,
+                                                 empty_task.id, 0)
+    await _create_succeed_task_run_with_progress(sa_task_run_repo, sa_task_run_time_interval_progress_repo,
+                                                 busy_task.id, 15)
+
+    response = await transit_task_status_uc.apply(TransitTaskStatusUCRq())
+
+    assert response.succeed_count == 2
+    assert (await sa_task_repo.get(TaskPK(id=empty_task.id))).adaptive_timeout == 7200
+    updated_busy_task = await sa_task_repo.get(TaskPK(id=busy_task.id))
+    assert updated_busy_task.status == TaskStatus.SUCCEED
+    assert updated_busy_task.adaptive_timeout == 1800
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout_is_not_set_for_non_adaptive_algorithm(
+        transit_task_status_uc,
+        sa_task_repo,
+        sa_task_run_repo,
+        sa_task_run_time_interval_progress_repo,
+        sa_payload_repo,
+        monitoring_algorithm_id,
+        sa_task_group_repo,
+):
+    task = await _create_task(sa_task_group_repo, sa_task_repo, sa_payload_repo, monitoring_algorithm_id)
+    await _create_succeed_task_run_with_progress(sa_task_run_repo, sa_task_run_time_interval_progress_repo,
+                                                 task.id, 0)
+
+    response = await transit_task_status_uc.apply(TransitTaskStatusUCRq())
+
+    assert response.succeed_count == 1
+    assert (await sa_task_repo.get(TaskPK(id=task.id))).adaptive_timeout is None
@@ -0,0 +1,28 @@
+import pytest
+
+from service.domain.schemas.enums import PriorityType
+from service.domain.schemas.monitoring_algorithm import PeriodicMonitoringAlgorithm
+from service.domain.schemas.task import TaskPK
+from service.domain.use_cases.external.update_task import UpdateTaskUC, UpdateTaskUCRq
+from service.ports.outbound.repo.fields import UpdateFields
+from tests.utils import create_tasks
+
+
+@pytest.mark.asyncio
+async def test_changing_monitoring_algorithm_resets_adaptive_timeout(sa_task_repo, sa_task_group_repo,
+                                                                     sa_monitoring_algorithm_repo, sa_payload_repo):
+    task, = await create_tasks(sa_task_repo, sa_task_group_repo, sa_monitoring_algorithm_repo, sa_payload_repo,
+                               'test', 1)
+    await sa_task_repo.update(task, UpdateFields.single('adaptive_timeout', 120.0))
+    algorithm = await sa_monitoring_algorithm_repo.create(PeriodicMonitoringAlgorithm(timeout=60.0))
+    uc = UpdateTaskUC(sa_task_repo)
+
+    response = await uc.apply(UpdateTaskUCRq(task_id=task.id, priority=PriorityType.HIGH))
+    assert response.task.adaptive_timeout == 120.0
+
+    response = await uc.apply(UpdateTaskUCRq(task_id=task.id, monitoring_algorithm_id=algorithm.id))
+
+    assert response.success
+    updated_task = await sa_task_repo.get(TaskPK(id=task.id))
+    assert updated_task.monitoring_algorithm_id == algorithm.id
+    assert updated_task.adaptive_timeout is None
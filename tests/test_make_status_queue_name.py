@@ -0,0 +1,12 @@
+from service.domain.schemas.command import make_status_queue_name
+
+
+def test_unsharded_status_queue():
+    assert make_status_queue_name('potok.status', 42, 1) == 'potok.status'
+
+
+def test_sharded_status_queue_is_stable_per_task_run():
+    queue_names = {make_status_queue_name('potok.status', task_run_id, 4) for task_run_id in range(100)}
+
+    assert queue_names == {f'potok.status.{shard}' for shard in range(4)}
+    assert make_status_queue_name('potok.status', 42, 4) == make_status_queue_name('potok.status', 42, 4)